@@ -0,0 +1,90 @@
+"""
+Server-side conversation memory for the Movi agent.
+
+Each conversation is a LangGraph thread whose state is checkpointed to a
+SQLite file, so a client only posts the newest message of a turn. Threads that
+have been idle for longer than MOVI_THREAD_TTL_SECONDS are evicted by a
+background task started from the FastAPI lifespan.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+# A blank MOVI_CHECKPOINT_DB means the default too; an empty path would make
+# aiosqlite open a temporary database and lose every thread on restart.
+CHECKPOINT_DB = os.getenv("MOVI_CHECKPOINT_DB") or str(PROJECT_ROOT / "movi_checkpoints.db")
+THREAD_TTL_SECONDS = float(os.getenv("MOVI_THREAD_TTL_SECONDS", str(24 * 60 * 60)))
+EVICTION_INTERVAL_SECONDS = float(os.getenv("MOVI_EVICTION_INTERVAL_SECONDS", "600"))
+
+
+class TTLSqliteSaver(AsyncSqliteSaver):
+    """
+    AsyncSqliteSaver that records when each thread was last written to, so
+    idle conversations can be dropped instead of growing the file forever.
+    """
+
+    async def setup(self) -> None:
+        if self.is_setup:
+            return
+        await super().setup()
+        async with self.lock:
+            await self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+            )
+            await self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_thread_activity_last_seen ON thread_activity (last_seen)"
+            )
+            await self.conn.commit()
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        async with self.lock:
+            await self.conn.execute(
+                "INSERT INTO thread_activity (thread_id, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_seen = excluded.last_seen",
+                (str(config["configurable"]["thread_id"]), time.time()),
+            )
+            await self.conn.commit()
+        return next_config
+
+    async def aevict_expired(self, ttl_seconds: float = THREAD_TTL_SECONDS) -> int:
+        """Deletes every thread idle for longer than `ttl_seconds`. Returns the number of evicted threads."""
+        await self.setup()
+        cutoff = time.time() - ttl_seconds
+        async with self.lock:
+            async with self.conn.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_seen < ?", (cutoff,)
+            ) as cursor:
+                expired = [row[0] for row in await cursor.fetchall()]
+        for thread_id in expired:
+            await self.adelete_thread(thread_id)
+        if expired:
+            async with self.lock:
+                await self.conn.executemany(
+                    "DELETE FROM thread_activity WHERE thread_id = ?", [(thread_id,) for thread_id in expired]
+                )
+                await self.conn.commit()
+        return len(expired)
+
+
+@asynccontextmanager
+async def open_checkpointer(db_path: str = CHECKPOINT_DB) -> AsyncIterator[TTLSqliteSaver]:
+    async with aiosqlite.connect(db_path) as conn:
+        checkpointer = TTLSqliteSaver(conn)
+        await checkpointer.setup()
+        yield checkpointer
+
+
+async def run_eviction_loop(checkpointer: TTLSqliteSaver, interval_seconds: float = EVICTION_INTERVAL_SECONDS):
+    while True:
+        evicted = await checkpointer.aevict_expired()
+        if evicted:
+            print(f"---EVICTED {evicted} IDLE CONVERSATION THREAD(S)---")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,96 @@
+"""
+Context management for long agent sessions.
+
+The checkpointed thread keeps every message, but the model only sees:
+  * the system prompt,
+  * a rolling summary of older turns,
+  * the last MOVI_CONTEXT_KEEP_TURNS turns verbatim (a turn starts at a user message),
+with image payloads stripped from turns the model has already answered.
+"""
+import os
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+KEEP_TURNS = int(os.getenv("MOVI_CONTEXT_KEEP_TURNS", "6"))
+# Older turns are folded into the summary in batches, so the summarizer runs
+# once every few turns instead of on every request.
+SUMMARY_BATCH_TURNS = int(os.getenv("MOVI_CONTEXT_SUMMARY_BATCH_TURNS", "4"))
+# Rough vision cost of one image at "auto" detail; only used for reporting.
+IMAGE_TOKEN_ESTIMATE = 765
+
+IMAGE_PLACEHOLDER = "[image omitted: already answered earlier in the conversation]"
+
+
+def turn_starts(messages: List[BaseMessage]) -> List[int]:
+    """Indexes of the messages that open a turn (every user message)."""
+    return [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+
+
+def window_start(messages: List[BaseMessage], keep_turns: int = KEEP_TURNS) -> int:
+    """Index of the first message that belongs to the last `keep_turns` turns."""
+    starts = turn_starts(messages)
+    if len(starts) <= keep_turns:
+        return 0
+    return starts[-keep_turns]
+
+
+def pending_summary_range(messages: List[BaseMessage], summarized: int) -> Optional[Tuple[int, int]]:
+    """
+    The [start, end) slice of whole turns that has fallen out of the window
+    but is not in the summary yet, once it is at least SUMMARY_BATCH_TURNS long.
+    """
+    end = window_start(messages)
+    if end <= summarized:
+        return None
+    unsummarized_turns = [i for i in turn_starts(messages) if summarized <= i < end]
+    if len(unsummarized_turns) < SUMMARY_BATCH_TURNS:
+        return None
+    return summarized, end
+
+
+def strip_answered_images(messages: List[BaseMessage], answered_until: Optional[int] = None) -> List[BaseMessage]:
+    """
+    Replaces image parts with a placeholder in every message before
+    `answered_until`, which defaults to the start of the current turn.
+    """
+    if answered_until is None:
+        starts = turn_starts(messages)
+        answered_until = starts[-1] if starts else 0
+    stripped = []
+    for i, message in enumerate(messages):
+        if i < answered_until and isinstance(message, HumanMessage) and isinstance(message.content, list):
+            content = [
+                {"type": "text", "text": IMAGE_PLACEHOLDER} if part.get("type") == "image_url" else part
+                for part in message.content
+            ]
+            message = message.model_copy(update={"content": content})
+        stripped.append(message)
+    return stripped
+
+
+def build_model_context(system_prompt: str, messages: List[BaseMessage], summary: Optional[str], summarized: int) -> List[BaseMessage]:
+    """The trimmed message list actually sent to the model."""
+    context = [SystemMessage(content=system_prompt)]
+    if summary:
+        context.append(SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+    return context + strip_answered_images(messages[summarized:])
+
+
+def count_tokens(messages: List[BaseMessage]) -> int:
+    return count_tokens_approximately(messages, tokens_per_image=IMAGE_TOKEN_ESTIMATE)
+
+
+def summary_prompt(previous_summary: Optional[str], messages: List[BaseMessage]) -> List[BaseMessage]:
+    transcript = "\n".join(
+        f"{message.type}: {message.text}" for message in strip_answered_images(messages, answered_until=len(messages))
+    )
+    return [
+        SystemMessage(content=(
+            "You condense transport-operations conversations. Merge the previous summary and the new "
+            "transcript into one short summary. Keep exact trip, route, path, stop, vehicle and driver "
+            "names, decisions taken and anything still pending confirmation."
+        )),
+        HumanMessage(content=f"Previous summary: {previous_summary or 'none'}\n\nNew transcript:\n{transcript}"),
+    ]
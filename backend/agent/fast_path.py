@@ -0,0 +1,226 @@
+"""
+Deterministic fast path for simple lookups.
+
+Messages like "status of Bulk - 00:01" or "list unassigned vehicles" map
+one-to-one onto a read-only tool. They are matched here against an in-memory
+index of trip, route, path and vehicle names and answered by running the tool
+directly, without a model call. Every word of the message has to be one the
+intent knows (or filler), and a negation or qualifier such as "not", "except"
+or "late" always goes to the model, since the tool cannot honour it. Anything
+else falls through to the model unchanged.
+"""
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from database.models import DailyTrip, Path, Route, Vehicle
+from database.versions import table_versions
+
+FAST_PATH_ENABLED = os.getenv("MOVI_FAST_PATH", "true").lower() != "false"
+# Writes made through this process add their new names straight away (see
+# database/versions.py); the TTL rebuild catches writes from other processes,
+# renames and deletes.
+INDEX_TTL_SECONDS = float(os.getenv("MOVI_FAST_PATH_INDEX_TTL_SECONDS", "30"))
+INDEX_TABLES = ("daily_trips", "routes", "paths", "vehicles")
+
+# Words that carry no intent on their own.
+FILLER_WORDS = {
+    "a", "an", "the", "of", "for", "on", "in", "at", "is", "are", "me", "my", "our", "we",
+    "please", "pls", "show", "list", "get", "give", "tell", "what", "whats", "what's", "which",
+    "can", "could", "you", "do", "have", "there", "any", "all", "current", "currently",
+    "right", "now", "today", "today's", "about", "to", "that", "whose", "and",
+}
+
+# Words that negate or narrow a request in ways no fast-path tool can apply;
+# any of them (or a word ending in "n't") sends the message to the model.
+QUALIFIER_WORDS = {
+    "not", "no", "none", "never", "without", "except", "excluding", "but", "other", "than",
+    "only", "late", "delayed", "early", "cancelled", "canceled", "completed", "before", "after",
+    "yesterday", "tomorrow", "since", "until", "between", "more", "less", "most", "least",
+}
+
+@dataclass(frozen=True)
+class Intent:
+    tool: str
+    # Which indexed name the tool takes as its argument, if any.
+    entity_kind: Optional[str]
+    argument: Optional[str]
+    # Each group must be hit by at least one word of the message.
+    required: Tuple[FrozenSet[str], ...]
+    vocabulary: FrozenSet[str] = field(default_factory=frozenset)
+
+VEHICLE_WORDS = frozenset({"vehicle", "vehicles", "cab", "cabs", "bus", "buses", "car", "cars"})
+
+INTENTS = [
+    Intent(
+        tool="get_trip_status", entity_kind="trip", argument="trip_display_name",
+        required=(frozenset({"status", "booking", "bookings", "booked", "state"}),),
+        vocabulary=frozenset({"trip", "status", "booking", "bookings", "booked", "state", "how", "percentage", "percent"}),
+    ),
+    Intent(
+        tool="list_stops_for_path", entity_kind="path", argument="path_name",
+        required=(frozenset({"stop", "stops"}),),
+        vocabulary=frozenset({"stop", "stops", "path", "along", "ordered", "order", "names"}),
+    ),
+    Intent(
+        tool="get_unassigned_vehicles", entity_kind=None, argument=None,
+        required=(frozenset({"unassigned", "free", "available", "idle", "spare"}), VEHICLE_WORDS),
+        vocabulary=VEHICLE_WORDS | {"unassigned", "free", "available", "idle", "spare", "still"},
+    ),
+    Intent(
+        tool="get_all_trips", entity_kind=None, argument=None,
+        required=(frozenset({"trip", "trips"}),),
+        vocabulary=frozenset({"trip", "trips", "every", "names"}),
+    ),
+]
+
+# A name starts and ends at a run of these characters, never inside one.
+NAME_TOKEN = re.compile(r"[\w-]+")
+NAME_CHAR = re.compile(r"[\w-]")
+
+# (kind, primary key, name column) for each kind of indexed name.
+NAME_SOURCES = (
+    ("trip", DailyTrip.trip_id, DailyTrip.display_name),
+    ("route", Route.route_id, Route.display_name),
+    ("path", Path.path_id, Path.name),
+    ("vehicle", Vehicle.vehicle_id, Vehicle.license_plate),
+)
+
+@dataclass
+class NameIndex:
+    # Lower-cased name -> {kind: name as stored}.
+    names: Dict[str, Dict[str, str]]
+    loaded_at: float
+    versions: Dict[str, int]
+    # Highest primary key read so far, per kind; rows above it are new.
+    last_ids: Dict[str, int] = field(default_factory=dict)
+    # First token of each name -> the names starting with it.
+    by_first_token: Dict[str, List[str]] = field(default_factory=dict)
+    # The few names that do not start with a token, matched by regex.
+    untokenized: List[str] = field(default_factory=list)
+
+    def add(self, kind: str, name: str):
+        key = name.lower()
+        if key not in self.names:
+            first = NAME_TOKEN.match(key)
+            if first:
+                self.by_first_token.setdefault(first.group(), []).append(key)
+            else:
+                self.untokenized.append(key)
+        self.names.setdefault(key, {})[kind] = name
+
+    def find_mentions(self, text: str) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Finds indexed names in `text`, longest first so "Path-1 - 00:01" wins
+        over "Path-1". Returns the mentions and the text with them cut out.
+        Only the names starting with one of the message's tokens are tried,
+        so the cost depends on the message, not on the size of the index.
+        """
+        found = []
+        for token in NAME_TOKEN.finditer(text):
+            for name in self.by_first_token.get(token.group(), ()):
+                end = token.start() + len(name)
+                if text.startswith(name, token.start()) and not NAME_CHAR.match(text, end):
+                    found.append((token.start(), end, name))
+        for name in self.untokenized:
+            pattern = r"(?<![\w-])" + re.escape(name) + r"(?![\w-])"
+            found += [(m.start(), m.end(), name) for m in re.finditer(pattern, text)]
+        found.sort(key=lambda match: (match[0] - match[1], match[0]))
+        taken: List[Tuple[int, int]] = []
+        mentions, seen = [], set()
+        for start, end, name in found:
+            if any(start < taken_end and taken_start < end for taken_start, taken_end in taken):
+                continue
+            taken.append((start, end))
+            if name not in seen:
+                seen.add(name)
+                mentions.append(self.names[name])
+        for start, end in sorted(taken, reverse=True):
+            text = text[:start] + " " + text[end:]
+        return mentions, text
+
+_index: Optional[NameIndex] = None
+_index_lock = threading.Lock()
+
+def _read_new_names(index: NameIndex, db):
+    """Adds the names of rows whose primary key is above the highest one read so far."""
+    for kind, key, column in NAME_SOURCES:
+        last_id = index.last_ids.get(kind, 0)
+        for row_id, name in db.query(key, column).filter(key > last_id):
+            if name:
+                index.add(kind, name)
+            last_id = max(last_id, row_id)
+        index.last_ids[kind] = last_id
+
+def load_name_index(db) -> NameIndex:
+    index = NameIndex(names={}, loaded_at=time.monotonic(), versions=table_versions(INDEX_TABLES))
+    _read_new_names(index, db)
+    return index
+
+def get_name_index() -> NameIndex:
+    """
+    Returns the cached name index. After a write through this process only
+    the rows added since the last read are fetched; the whole index is
+    rebuilt once it is older than the TTL, which also drops renamed and
+    deleted names.
+    """
+    global _index
+    with _index_lock:
+        expired = _index is None or time.monotonic() - _index.loaded_at > INDEX_TTL_SECONDS
+        versions = table_versions(INDEX_TABLES)
+        if expired or versions != _index.versions:
+            from database.connection import SessionLocal
+            db = SessionLocal()
+            try:
+                if expired:
+                    _index = load_name_index(db)
+                else:
+                    _index.versions = versions
+                    _read_new_names(_index, db)
+            finally:
+                db.close()
+    return _index
+
+def match_message(message: str) -> Optional[dict]:
+    """match_intent() against the cached index; blocking, so run it off the event loop."""
+    return match_intent(message, get_name_index())
+
+def _words(text: str) -> List[str]:
+    text = re.sub(r"\bnot\s+(yet\s+)?assigned\b", "unassigned", text)
+    return re.findall(r"[a-z0-9']+", text)
+
+def _is_qualified(words: List[str]) -> bool:
+    return any(word in QUALIFIER_WORDS or word.endswith("n't") for word in words)
+
+def match_intent(message: str, index: NameIndex) -> Optional[dict]:
+    """
+    Returns a tool call for the first intent `message` matches exactly,
+    otherwise None so the caller falls back to the model.
+    """
+    text = " ".join(message.lower().split()).rstrip("?.! ")
+    if not text:
+        return None
+    mentions, remainder = index.find_mentions(text)
+    words = _words(remainder)
+    if _is_qualified(words):
+        return None
+    for intent in INTENTS:
+        if intent.entity_kind is None:
+            if mentions:
+                continue
+            arguments = {}
+        else:
+            # Exactly one name, and it has to be the kind the tool takes;
+            # a second name (say, a vehicle plate) means a richer request.
+            if len(mentions) != 1 or intent.entity_kind not in mentions[0]:
+                continue
+            arguments = {intent.argument: mentions[0][intent.entity_kind]}
+        word_set = set(words)
+        if not all(group & word_set for group in intent.required):
+            continue
+        if all(word in intent.vocabulary or word in FILLER_WORDS for word in words):
+            return {"name": intent.tool, "args": arguments}
+    return None
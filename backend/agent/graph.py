@@ -1,31 +1,84 @@
+import asyncio
+import os
+import time
+import uuid
+from functools import lru_cache
 from typing import TypedDict, Annotated, List, Optional
-from langchain_core.messages import BaseMessage, SystemMessage
+
+import httpx
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from dotenv import load_dotenv
 
+from database.versions import table_versions
+
+from .fast_path import FAST_PATH_ENABLED, match_message
+from .session import tool_session, without_run_session
+from .response_cache import RESPONSE_CACHE_ENABLED, TOOL_TABLES, cache_key, cacheable_tables, response_cache
+from .context import build_model_context, count_tokens, pending_summary_range, summary_prompt
 from .tools import (
     get_unassigned_vehicles, get_trip_status, remove_vehicle_from_trip,
-    check_trip_consequences, list_stops_for_path, find_routes_for_path,
+    list_stops_for_path, find_routes_for_path, find_paths_for_stop,
     assign_vehicle_to_trip, create_new_stop, create_new_path,
-    update_route_status, get_deployment_details, create_new_trip,
-    check_route_deactivation_consequences,
-    get_all_trips
+    update_route_status, get_deployment_details, create_new_trip, generate_trips_for_day,
+    get_all_trips, collect_consequences
 )
 
 load_dotenv()
 
 tools = [
     get_unassigned_vehicles, get_trip_status, remove_vehicle_from_trip,
-    list_stops_for_path, find_routes_for_path, assign_vehicle_to_trip,
+    list_stops_for_path, find_routes_for_path, find_paths_for_stop, assign_vehicle_to_trip,
     create_new_stop, create_new_path, update_route_status, get_deployment_details,
-    create_new_trip,
+    create_new_trip, generate_trips_for_day,
     get_all_trips
 ]
-tool_node = ToolNode(tools)
+tools_by_name = {t.name: t for t in tools}
 
 HIGH_IMPACT_TOOLS = {"remove_vehicle_from_trip", "update_route_status"}
+# Read-only tools: when the model asks for several of these in one step they
+# run concurrently. Every other tool writes and is run on its own, in order.
+PARALLEL_SAFE_TOOLS = {
+    "get_unassigned_vehicles", "get_trip_status", "list_stops_for_path",
+    "find_routes_for_path", "find_paths_for_stop", "get_deployment_details", "get_all_trips",
+}
+
+# --- SHARED MODEL CLIENT ---
+# MOVI_LLM_BASE_URL points the client at any OpenAI-compatible server, e.g. the
+# local stub in benchmarks/stub_openai.py, so latency can be measured offline.
+LLM_MODEL = os.getenv("MOVI_LLM_MODEL", "gpt-4o")
+LLM_BASE_URL = os.getenv("MOVI_LLM_BASE_URL") or None
+LLM_MAX_CONNECTIONS = int(os.getenv("MOVI_LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("MOVI_LLM_KEEPALIVE_SECONDS", "60"))
+
+@lru_cache(maxsize=1)
+def get_model_with_tools():
+    """
+    Builds the tool-bound chat model once per process. Every graph run shares
+    it, so tool schemas are serialized once and HTTP connections are pooled
+    and kept alive between agent steps.
+    """
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+    )
+    model = ChatOpenAI(
+        model=LLM_MODEL,
+        temperature=0,
+        streaming=True,
+        base_url=LLM_BASE_URL,
+        http_client=httpx.Client(limits=limits),
+        http_async_client=httpx.AsyncClient(limits=limits),
+    )
+    return model.bind_tools(tools)
+
+@lru_cache(maxsize=1)
+def get_summary_model():
+    """Plain (tool-less) chat model used to condense older turns."""
+    return ChatOpenAI(model=os.getenv("MOVI_SUMMARY_MODEL", LLM_MODEL), temperature=0, base_url=LLM_BASE_URL)
 
 # --- SIMPLIFIED AGENT STATE ---
 # We no longer need a separate 'image' field. The image will be part of the message content.
@@ -33,93 +86,260 @@ class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], lambda x, y: x + y]
     tool_calls: Optional[list] = None
     consequence_info: Optional[str] = None
+    # Rolling summary of messages[:summarized_messages]; see agent/context.py.
+    summary: Optional[str] = None
+    summarized_messages: int = 0
+    # Data versions seen when the turn started; stamps a cached answer.
+    cache_versions: Optional[dict] = None
+
+SYSTEM_PROMPT = (
+    "You are 'Movi', an AI assistant for transport managers... "
+    "CRITICAL INSTRUCTION: When identifying entities..., you MUST use the exact, full name... "
+    "ADDITIONAL INSTRUCTION: If an image is provided with a message, it is the primary context. "
+    "Use the visual information in the image to identify what the user is referring to."
+)
+
+async def manage_context(state: AgentState):
+    """
+    Folds turns that have dropped out of the verbatim window into the rolling
+    summary. The full history stays in the checkpoint; only the model's view shrinks.
+    """
+    messages = state["messages"]
+    summarized = state.get("summarized_messages") or 0
+    pending = pending_summary_range(messages, summarized)
+    if not pending:
+        return {}
+    start, end = pending
+    print(f"---SUMMARIZING MESSAGES {start}-{end}---")
+    try:
+        response = await get_summary_model().ainvoke(summary_prompt(state.get("summary"), messages[start:end]))
+    except Exception as e:
+        # Keep the turns verbatim and retry on the next request.
+        print(f"Summarization failed, keeping full context: {e}")
+        return {}
+    return {"summary": response.text, "summarized_messages": end}
 
-def call_model(state: AgentState):
+async def call_model(state: AgentState):
     """
     The primary node that calls the LLM. It's now much simpler because the
     multimodal message is pre-formatted before the graph starts.
+    Awaits the model so a slow LLM round-trip never blocks the event loop.
     """
     print("---CALLING MODEL---")
-    
-    system_prompt = (
-        "You are 'Movi', an AI assistant for transport managers... "
-        "CRITICAL INSTRUCTION: When identifying entities..., you MUST use the exact, full name... "
-        "ADDITIONAL INSTRUCTION: If an image is provided with a message, it is the primary context. "
-        "Use the visual information in the image to identify what the user is referring to."
+
+    full_context = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
+    messages_for_llm = build_model_context(
+        SYSTEM_PROMPT, state["messages"], state.get("summary"), state.get("summarized_messages") or 0
     )
-    
-    messages_for_llm = [SystemMessage(content=system_prompt)] + state["messages"]
+    print(f"CONTEXT: {count_tokens(full_context)} tokens before trimming, {count_tokens(messages_for_llm)} after "
+          f"({len(full_context)} -> {len(messages_for_llm)} messages)")
 
-    model = ChatOpenAI(model="gpt-4o", temperature=0, streaming=True)
-    model_with_tools = model.bind_tools(tools)
-    
-    response = model_with_tools.invoke(messages_for_llm)
+    model_with_tools = get_model_with_tools()
+
+    response = await model_with_tools.ainvoke(messages_for_llm)
     
     return {"messages": [response], "tool_calls": response.tool_calls}
 
 
-def check_consequences(state: AgentState):
+def check_cache(state: AgentState, config: RunnableConfig):
+    """
+    Answers a repeated read-only question from the response cache. On a miss
+    it records the current data versions, which later stamp the fresh answer.
+    """
+    if not RESPONSE_CACHE_ENABLED or not state["messages"]:
+        return {}
+    key = cache_key(state["messages"][-1], config["configurable"].get("current_page"))
+    if key is None:
+        return {}
+    versions = table_versions(set().union(*TOOL_TABLES.values()))
+    answer = response_cache.get(key)
+    if answer is None:
+        return {"cache_versions": versions}
+    print("---RESPONSE CACHE HIT---")
+    return {"messages": [AIMessage(content=answer)], "tool_calls": []}
+
+def cache_response(state: AgentState, config: RunnableConfig):
+    """Stores the final answer of a turn that only read data named in the question."""
+    if not RESPONSE_CACHE_ENABLED or not state.get("cache_versions"):
+        return {}
+    messages = state["messages"]
+    question_index = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=None)
+    if question_index is None:
+        return {}
+    key = cache_key(messages[question_index], config["configurable"].get("current_page"))
+    if key is None:
+        return {}
+    tables = cacheable_tables(key[0], messages[question_index + 1:])
+    if tables:
+        response_cache.put(key, messages[-1].content, tables, state["cache_versions"])
+    return {}
+
+async def fast_path(state: AgentState, config: RunnableConfig):
+    """
+    Answers simple lookups ("status of Bulk - 00:01", "list unassigned
+    vehicles") by running the matching read-only tool directly, skipping the
+    model. The tool call and its result are recorded like a model turn so the
+    thread stays valid for later model calls.
+    """
+    last_message = state["messages"][-1] if state["messages"] else None
+    # Screenshots and non-text content always need the model.
+    if not FAST_PATH_ENABLED or not isinstance(last_message, HumanMessage) or not isinstance(last_message.content, str):
+        return {}
+    match = await asyncio.to_thread(match_message, last_message.content)
+    if not match:
+        return {}
+    print(f"---FAST PATH: {match['name']}({match['args']})---")
+    tool_call = {"name": match["name"], "args": match["args"], "id": f"fast_path_{uuid.uuid4().hex}", "type": "tool_call"}
+    result = await _run_tool_call(tool_call, config)
+    return {
+        "messages": [AIMessage(content="", tool_calls=[tool_call]), result, AIMessage(content=result.content)],
+        "tool_calls": [],
+    }
+
+def _evaluate_consequences(tool_calls: list, config: RunnableConfig) -> List[str]:
+    with tool_session(config) as db:
+        return collect_consequences(tool_calls, db)
+
+async def check_consequences(state: AgentState, config: RunnableConfig):
+    """
+    Checks every high-impact call of the step in one DB session and, if any
+    would hurt bookings or active trips, stops with one combined confirmation.
+    """
     print("---CHECKING CONSEQUENCES---")
     if not state.get("tool_calls"):
         return {}
-    tool_call = state["tool_calls"][-1]
-    tool_name = tool_call['name']
-    tool_args = tool_call['args']
-    from database.connection import SessionLocal
-    db = SessionLocal()
-    consequence_result = {}
-    if tool_name == "remove_vehicle_from_trip":
-        consequence_result = check_trip_consequences(tool_args["trip_display_name"], db)
-    elif tool_name == "update_route_status" and tool_args.get("new_status") == "deactivated":
-        consequence_result = check_route_deactivation_consequences(tool_args["route_display_name"], db)
-    db.close()
-    if consequence_result.get("has_consequences"):
-        return {"consequence_info": consequence_result["details"]}
+    high_impact_calls = [call for call in state["tool_calls"] if call['name'] in HIGH_IMPACT_TOOLS]
+    # The lookups are blocking SQLAlchemy calls, so run them off the event loop.
+    details = await asyncio.to_thread(_evaluate_consequences, high_impact_calls, config)
+    if details:
+        consequence_info = "; ".join(details)
+        # The confirmation prompt is emitted from the node (not the router) so
+        # it lands in the graph state and in streamed events. Every pending
+        # tool call gets a "not executed" result first, keeping the persisted
+        # thread valid for the next turn.
+        pending_results = [
+            ToolMessage(content="Not executed: waiting for the user to confirm.", tool_call_id=call["id"], name=call["name"])
+            for call in state["tool_calls"]
+        ]
+        confirmation_message = AIMessage(
+            content=(
+                f"I can do that, but please be aware: {consequence_info}. "
+                "This may cancel bookings and affect trip sheets. Do you want to proceed?"
+            )
+        )
+        return {"messages": pending_results + [confirmation_message], "consequence_info": consequence_info}
     else:
         return {"consequence_info": None}
 
+async def _run_tool_call(tool_call: dict, config: RunnableConfig) -> ToolMessage:
+    tool = tools_by_name.get(tool_call["name"])
+    if tool is None:
+        return ToolMessage(
+            content=f"Error: {tool_call['name']} is not a valid tool, try one of [{', '.join(tools_by_name)}].",
+            tool_call_id=tool_call["id"], name=tool_call["name"], status="error",
+        )
+    try:
+        return await tool.ainvoke(tool_call, config)
+    except Exception as e:
+        return ToolMessage(
+            content=f"Error: {e!r}\n Please fix your mistakes.",
+            tool_call_id=tool_call["id"], name=tool_call["name"], status="error",
+        )
+
+def plan_tool_batches(tool_calls: list) -> List[list]:
+    """
+    Splits one step's tool calls into batches that keep the model's order:
+    consecutive read-only calls share a batch, each mutating call gets its own.
+    """
+    batches: List[list] = []
+    for tool_call in tool_calls:
+        if tool_call["name"] in PARALLEL_SAFE_TOOLS and batches and batches[-1][0]["name"] in PARALLEL_SAFE_TOOLS:
+            batches[-1].append(tool_call)
+        else:
+            batches.append([tool_call])
+    return batches
+
+async def execute_tools(state: AgentState, config: RunnableConfig):
+    """
+    Runs the tool calls of the last model message, concurrently where it is
+    safe. Calls run on their own share the run's session; concurrent calls
+    each get their own, since a session cannot be used from two threads.
+    """
+    tool_calls = state["messages"][-1].tool_calls
+    started = time.perf_counter()
+    results = []
+    batches = plan_tool_batches(tool_calls)
+    for batch in batches:
+        batch_config = config if len(batch) == 1 else without_run_session(config)
+        results.extend(await asyncio.gather(*(_run_tool_call(tool_call, batch_config) for tool_call in batch)))
+    print(f"TOOLS: {len(tool_calls)} call(s) in {len(batches)} batch(es), {(time.perf_counter() - started) * 1000:.1f}ms")
+    return {"messages": results}
+
 def should_continue(state: AgentState) -> str:
     print("---ROUTING---")
     if not state.get("tool_calls"):
         print("ROUTE: The LLM responded, ending.")
         return "end"
-    tool_name = state["tool_calls"][-1]['name']
-    if tool_name in HIGH_IMPACT_TOOLS:
-        print(f"ROUTE: High-impact tool '{tool_name}' detected. Checking consequences.")
+    tool_names = [call['name'] for call in state["tool_calls"]]
+    high_impact = [name for name in tool_names if name in HIGH_IMPACT_TOOLS]
+    if high_impact:
+        print(f"ROUTE: High-impact tool(s) {high_impact} detected. Checking consequences.")
         return "check_consequences"
     else:
-        print(f"ROUTE: Safe tool '{tool_name}' detected. Executing.")
+        print(f"ROUTE: Safe tool(s) {tool_names} detected. Executing.")
         return "continue"
 
+def after_check_cache(state: AgentState) -> str:
+    if isinstance(state["messages"][-1], AIMessage):
+        print("ROUTE: Answered from the response cache, ending.")
+        return "end"
+    return "continue"
+
+def after_fast_path(state: AgentState) -> str:
+    if isinstance(state["messages"][-1], AIMessage):
+        print("ROUTE: Answered on the fast path, ending.")
+        return "end"
+    return "continue"
+
 def after_consequence_check(state: AgentState) -> str:
-    from langchain_core.messages import AIMessage
     print("---ROUTING AFTER CONSEQUENCE CHECK---")
     if state.get("consequence_info"):
         print("ROUTE: Consequences found. Asking for confirmation.")
-        confirmation_message = AIMessage(
-            content=(
-                f"I can do that, but please be aware: {state['consequence_info']}. "
-                "This may cancel bookings and affect trip sheets. Do you want to proceed?"
-            )
-        )
-        state['messages'].append(confirmation_message)
-        state['tool_calls'] = None
-        state['consequence_info'] = None
         return "end"
     else:
         print("ROUTE: No consequences. Proceeding with tool execution.")
         return "continue"
 
-def create_movi_agent_graph():
+def create_movi_agent_graph(checkpointer=None):
+    """
+    Builds the agent graph. With a `checkpointer`, each invocation must pass a
+    `thread_id` in its config and only the new messages of the turn; earlier
+    messages are restored from the checkpoint.
+    """
     workflow = StateGraph(AgentState)
+    workflow.add_node("check_cache", check_cache)
+    workflow.add_node("fast_path", fast_path)
+    workflow.add_node("manage_context", manage_context)
     workflow.add_node("agent", call_model)
-    workflow.add_node("action", tool_node)
+    workflow.add_node("action", execute_tools)
     workflow.add_node("check_consequences", check_consequences)
-    workflow.set_entry_point("agent")
+    workflow.add_node("cache_response", cache_response)
+    workflow.set_entry_point("check_cache")
+    workflow.add_conditional_edges(
+        "check_cache",
+        after_check_cache,
+        {"continue": "fast_path", "end": END},
+    )
+    workflow.add_conditional_edges(
+        "fast_path",
+        after_fast_path,
+        {"continue": "manage_context", "end": END},
+    )
+    workflow.add_edge("manage_context", "agent")
     workflow.add_conditional_edges(
         "agent",
         should_continue,
-        {"continue": "action", "check_consequences": "check_consequences", "end": END},
+        {"continue": "action", "check_consequences": "check_consequences", "end": "cache_response"},
     )
     workflow.add_conditional_edges(
         "check_consequences",
@@ -127,5 +347,6 @@ def create_movi_agent_graph():
         {"continue": "action", "end": END},
     )
     workflow.add_edge("action", "agent")
-    app = workflow.compile()
+    workflow.add_edge("cache_response", END)
+    app = workflow.compile(checkpointer=checkpointer)
     return app
\ No newline at end of file
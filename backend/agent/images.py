@@ -0,0 +1,84 @@
+"""
+Preprocessing for images attached to agent requests.
+
+Uploads arrive as base64 data URLs, usually full-resolution dashboard
+screenshots. Before they reach the model they are downsized to
+MOVI_IMAGE_MAX_SIDE pixels and re-encoded as JPEG. The processed version is
+cached under the SHA-256 of the original bytes, so repeated screenshots of the
+same page are only processed once.
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+IMAGE_MAX_SIDE = int(os.getenv("MOVI_IMAGE_MAX_SIDE", "1024"))
+IMAGE_JPEG_QUALITY = int(os.getenv("MOVI_IMAGE_JPEG_QUALITY", "80"))
+IMAGE_CACHE_SIZE = int(os.getenv("MOVI_IMAGE_CACHE_SIZE", "64"))
+IMAGE_WORKERS = int(os.getenv("MOVI_IMAGE_WORKERS", "2"))
+
+# Pillow releases the GIL while decoding, resizing and encoding, so a small
+# thread pool keeps the CPU-heavy work off the event loop without the cost of
+# shipping image bytes to worker processes.
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="movi-image")
+_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def decode_data_url(data_url: str) -> bytes:
+    """Returns the raw bytes of a base64 `data:` URL. Raises ValueError if it is not one."""
+    header, _, payload = data_url.partition(",")
+    if not header.startswith("data:") or not header.endswith(";base64"):
+        raise ValueError("Image must be a base64 data URL.")
+    try:
+        return base64.b64decode(payload, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Image data is not valid base64: {e}")
+
+
+def downsize_image(raw: bytes, max_side: int = IMAGE_MAX_SIDE, quality: int = IMAGE_JPEG_QUALITY) -> str:
+    """
+    Decodes, downsizes and re-encodes an image. Returns a JPEG data URL.
+    Pillow decodes lazily, so a truncated or corrupt upload may only fail
+    while resizing or saving; the whole sequence raises ValueError then.
+    """
+    try:
+        image = Image.open(io.BytesIO(raw))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=quality, optimize=True)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Could not read image: {e}")
+    return "data:image/jpeg;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+
+
+async def preprocess_image(image_url: str) -> str:
+    """
+    Returns the model-ready version of an uploaded image. Remote (non data:)
+    URLs are passed through untouched. Raises ValueError for unreadable uploads.
+    """
+    if not image_url.startswith("data:"):
+        return image_url
+    raw = decode_data_url(image_url)
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in _cache:
+        _cache.move_to_end(digest)
+        return _cache[digest]
+    processed = await asyncio.get_running_loop().run_in_executor(_executor, downsize_image, raw)
+    _cache[digest] = processed
+    while len(_cache) > IMAGE_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return processed
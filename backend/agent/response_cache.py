@@ -0,0 +1,162 @@
+"""
+Response cache for repeated read-only questions.
+
+An answer is cached under the normalized question and the page it was asked
+from, together with the data versions (see database/versions.py) of the tables
+its tools read. Entries are dropped as soon as one of those tables changes,
+so an answer is never served after assign_vehicle_to_trip, update_route_status
+or a write from the UI touched its data.
+
+The versions only move on commits made by this process. Writes from another
+uvicorn worker, from seed.py or from a migration go unnoticed, so every entry
+also expires MOVI_RESPONSE_CACHE_TTL_SECONDS after it was stored. That is the
+longest a multi-process deployment can serve a stale answer; run a single
+worker for invalidation to be immediate.
+
+Only self-contained answers are stored: the turn must have used read-only
+tools, with every argument spelled out in the question itself, so the answer
+cannot depend on earlier turns of the conversation.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from database.versions import on_tables_changed, table_versions
+
+RESPONSE_CACHE_ENABLED = os.getenv("MOVI_RESPONSE_CACHE", "true").lower() != "false"
+RESPONSE_CACHE_SIZE = int(os.getenv("MOVI_RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("MOVI_RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# The tables each read-only tool reads. Answers that used any other tool are
+# never cached.
+TOOL_TABLES = {
+    "get_unassigned_vehicles": {"vehicles", "deployments"},
+    "get_trip_status": {"daily_trips", "deployments", "vehicles", "drivers"},
+    "list_stops_for_path": {"paths", "path_stops", "stops"},
+    "find_routes_for_path": {"paths", "routes"},
+    "find_paths_for_stop": {"stops", "path_stops", "paths"},
+    "get_deployment_details": {"daily_trips", "deployments", "vehicles", "drivers"},
+    "get_all_trips": {"daily_trips"},
+}
+
+CacheKey = Tuple[str, str]
+
+@dataclass(frozen=True)
+class CachedResponse:
+    answer: str
+    tables: FrozenSet[str]
+    versions: Dict[str, int]
+    expires_at: float
+
+def normalize_question(text: str) -> str:
+    return " ".join(text.lower().split()).rstrip("?.! ")
+
+def cache_key(message: BaseMessage, current_page: Optional[str]) -> Optional[CacheKey]:
+    """Text-only user messages are cacheable; anything with an image is not."""
+    if not isinstance(message, HumanMessage) or not isinstance(message.content, str):
+        return None
+    question = normalize_question(message.content)
+    if not question:
+        return None
+    return question, current_page or "unknown"
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._keys_by_table: Dict[str, Set[CacheKey]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            # Versions are compared as well as evicted on change: a write that
+            # committed while the answer was being built leaves it stale on arrival.
+            if (entry is not None and time.monotonic() < entry.expires_at
+                    and table_versions(entry.tables) == entry.versions):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, answer: str, tables: Set[str], versions: Dict[str, int]):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedResponse(answer, frozenset(tables), {table: versions.get(table, 0) for table in tables},
+                                                time.monotonic() + self.ttl_seconds)
+            for table in tables:
+                self._keys_by_table[table].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tables(self, tables: Set[str]):
+        with self._lock:
+            keys = set().union(*(self._keys_by_table.get(table, set()) for table in tables))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry.tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+on_tables_changed(response_cache.invalidate_tables)
+
+def cacheable_tables(question: str, turn: List[BaseMessage]) -> Optional[Set[str]]:
+    """
+    Returns the tables a finished turn's answer depends on, or None if the
+    answer must not be cached. `turn` is every message after the question.
+    """
+    tool_calls = [call for message in turn if isinstance(message, AIMessage) for call in message.tool_calls]
+    if not tool_calls:
+        return None
+    if any(isinstance(message, ToolMessage) and message.status == "error" for message in turn):
+        return None
+    tables = set()
+    for call in tool_calls:
+        if call["name"] not in TOOL_TABLES:
+            return None
+        # An argument missing from the question came from earlier turns.
+        for value in call["args"].values():
+            if not isinstance(value, str) or not re.search(r"(?<![\w-])" + re.escape(value.lower()) + r"(?![\w-])", question):
+                return None
+        tables |= TOOL_TABLES[call["name"]]
+    return tables
@@ -0,0 +1,67 @@
+"""
+Database session scope for one agent run.
+
+run_session_scope() creates one session for the whole run and hands it to
+the tools through the run config; the tools reach it with tool_session(),
+which ends the transaction after each call. The session is bound to the
+engine, not to a checked-out connection, so it takes a pooled connection
+only while a transaction is open and gives it back at every commit.
+
+That is a trade-off. A run still checks out one connection per tool call,
+as many as a session per call would, because holding one across the
+model's turns would let slow LLM calls starve the pool (and block the event
+loop waiting for a free connection). What the scope buys is one session
+per run that is always closed, even when a tool or the model raised.
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from sqlalchemy.orm import Session
+
+from database.connection import SessionLocal
+
+SESSION_CONFIG_KEY = "db_session"
+
+@contextmanager
+def run_session_scope(config: dict) -> Iterator[dict]:
+    """
+    Yields a copy of `config` carrying the run's session. Creating it checks
+    out no connection; the session is closed on exit, even when a tool or the
+    model raised, which returns a connection left in an open transaction.
+    """
+    db = SessionLocal()
+    try:
+        yield {**config, "configurable": {**config.get("configurable", {}), SESSION_CONFIG_KEY: db}}
+    finally:
+        db.close()
+
+def without_run_session(config: RunnableConfig) -> RunnableConfig:
+    """
+    Strips the shared session from `config`. Sessions are not thread-safe, so
+    tool calls that run concurrently each fall back to a session of their own.
+    """
+    configurable = {key: value for key, value in config.get("configurable", {}).items() if key != SESSION_CONFIG_KEY}
+    return {**config, "configurable": configurable}
+
+@contextmanager
+def tool_session(config: Optional[RunnableConfig]) -> Iterator[Session]:
+    """
+    Yields the run's shared session if there is one, otherwise a short-lived
+    session that is closed afterwards. Either way the transaction is rolled
+    back if the caller raises.
+    """
+    shared = ((config or {}).get("configurable") or {}).get(SESSION_CONFIG_KEY)
+    db = shared if shared is not None else SessionLocal()
+    try:
+        yield db
+        if shared is not None:
+            # Reads leave a transaction open too; end it, which also hands
+            # the connection back to the pool until the next call.
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if shared is None:
+            db.close()
@@ -1,255 +1,267 @@
 from langchain.tools import tool
+from langchain_core.runnables import RunnableConfig
 from sqlalchemy.orm import Session
-from typing import List
-from database.models import Vehicle, DailyTrip, Deployment, Stop, Path, Route, Driver, StatusEnum
-from database.connection import SessionLocal
+from datetime import datetime
+from typing import List, Optional
+from database.models import Vehicle, DailyTrip, Deployment, Stop, Path, PathStop, Route, Driver, StatusEnum
+from database.queries import (
+    day_window, get_trip_summary_by_name, not_deployed_in_window, paths_containing_stop_query, stops_for_path_name_query,
+)
+from database.bulk import update_status_by_id
+from database.trip_generation import daily_trips_insert
+from .session import tool_session
 
 @tool
-def get_unassigned_vehicles() -> str:
-    """Returns a list of license plates for vehicles that are not currently assigned to any trip."""
-    db: Session = SessionLocal()
-    assigned_vehicle_ids = [d.vehicle_id for d in db.query(Deployment).all()]
-    unassigned_vehicles = db.query(Vehicle).filter(Vehicle.vehicle_id.notin_(assigned_vehicle_ids)).all()
-    db.close()
-    if not unassigned_vehicles:
-        return "All vehicles are currently assigned."
-    return f"Unassigned vehicles: {[v.license_plate for v in unassigned_vehicles]}"
+def get_unassigned_vehicles(config: RunnableConfig, day: Optional[str] = None) -> str:
+    """Returns a list of license plates for vehicles not assigned to any trip on a service day (YYYY-MM-DD), today by default."""
+    try:
+        service_day = datetime.strptime(day, "%Y-%m-%d") if day else datetime.now()
+    except ValueError:
+        return f"Error: '{day}' is not a date in YYYY-MM-DD format."
+    with tool_session(config) as db:
+        unassigned_vehicles = db.query(Vehicle.license_plate).filter(
+            not_deployed_in_window(Deployment.vehicle_id, Vehicle.vehicle_id, *day_window(service_day))
+        ).all()
+        if not unassigned_vehicles:
+            return "All vehicles are assigned on that day."
+        return f"Unassigned vehicles: {[v.license_plate for v in unassigned_vehicles]}"
 
 @tool
-def get_trip_status(trip_display_name: str) -> str:
+def get_trip_status(trip_display_name: str, config: RunnableConfig) -> str:
     """Gets the status, booking percentage, and deployment details for a specific trip by its display name."""
-    db: Session = SessionLocal()
-    trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if not trip:
-        db.close()
-        return f"Trip '{trip_display_name}' not found."
-    
-    deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
-    if deployment:
-        vehicle = db.query(Vehicle).get(deployment.vehicle_id)
-        driver = db.query(Driver).get(deployment.driver_id)
-        deployment_info = f"Assigned vehicle: {vehicle.license_plate}, Driver: {driver.name}."
-    else:
-        deployment_info = "No vehicle or driver assigned."
-    db.close()
-    return (
-        f"Status of trip '{trip.display_name}':\n"
-        f"- Live Status: {trip.live_status}\n"
-        f"- Booking: {trip.booking_status_percentage}%\n"
-        f"- {deployment_info}"
-    )
+    with tool_session(config) as db:
+        trip = get_trip_summary_by_name(db, trip_display_name)
+        if not trip:
+            return f"Trip '{trip_display_name}' not found."
+        if trip.deployment_id:
+            deployment_info = f"Assigned vehicle: {trip.vehicle_license_plate}, Driver: {trip.driver_name}."
+        else:
+            deployment_info = "No vehicle or driver assigned."
+        return (
+            f"Status of trip '{trip.display_name}':\n"
+            f"- Live Status: {trip.live_status}\n"
+            f"- Booking: {trip.booking_status_percentage}%\n"
+            f"- {deployment_info}"
+        )
 
 @tool
-def remove_vehicle_from_trip(trip_display_name: str) -> str:
+def remove_vehicle_from_trip(trip_display_name: str, config: RunnableConfig) -> str:
     """Removes the assigned vehicle and driver from a specific trip."""
-    db: Session = SessionLocal()
-    trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if not trip:
-        db.close()
-        return f"Trip '{trip_display_name}' not found."
-    
-    deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
-    if not deployment:
-        db.close()
-        return f"Trip '{trip_display_name}' has no vehicle assigned to it."
-    db.delete(deployment)
-    db.commit()
-    db.close()
-    return f"Successfully removed vehicle from trip '{trip_display_name}'. Bookings may be affected."
-
-def check_trip_consequences(trip_display_name: str, db: Session) -> dict:
-    trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if not trip or trip.booking_status_percentage == 0:
-        return {"has_consequences": False}
-    return {
-        "has_consequences": True,
-        "details": f"The trip '{trip_display_name}' is already {trip.booking_status_percentage}% booked by employees."
-    }
+    with tool_session(config) as db:
+        trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
+        if not trip:
+            return f"Trip '{trip_display_name}' not found."
+
+        deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
+        if not deployment:
+            return f"Trip '{trip_display_name}' has no vehicle assigned to it."
+        db.delete(deployment)
+        db.commit()
+        return f"Successfully removed vehicle from trip '{trip_display_name}'. Bookings may be affected."
 
 @tool
-def list_stops_for_path(path_name: str) -> str:
+def list_stops_for_path(path_name: str, config: RunnableConfig) -> str:
     """Returns an ordered list of stop names for a given path name."""
-    db: Session = SessionLocal()
-    path = db.query(Path).filter(Path.name == path_name).first()
-    if not path:
-        db.close()
-        return f"Path '{path_name}' not found."
-    stop_ids = [int(sid) for sid in path.ordered_stop_ids.split(',')]
-    stops = db.query(Stop).filter(Stop.stop_id.in_(stop_ids)).all()
-    stop_map = {stop.stop_id: stop.name for stop in stops}
-    ordered_stop_names = [stop_map[sid] for sid in stop_ids if sid in stop_map]
-    db.close()
-    return f"Stops for '{path_name}': {', '.join(ordered_stop_names)}"
+    with tool_session(config) as db:
+        stops = db.scalars(stops_for_path_name_query(path_name).with_only_columns(Stop.name)).all()
+        if not stops and not db.query(Path.path_id).filter(Path.name == path_name).first():
+            return f"Path '{path_name}' not found."
+        return f"Stops for '{path_name}': {', '.join(stops)}"
 
 @tool
-def find_routes_for_path(path_name: str) -> str:
+def find_paths_for_stop(stop_name: str, config: RunnableConfig) -> str:
+    """Finds all paths that pass through a specific stop name."""
+    with tool_session(config) as db:
+        stop = db.query(Stop.stop_id).filter(Stop.name == stop_name).first()
+        if not stop:
+            return f"Stop '{stop_name}' not found."
+        paths = db.scalars(paths_containing_stop_query(stop.stop_id).with_only_columns(Path.name)).all()
+        if not paths:
+            return f"No paths pass through '{stop_name}'."
+        return f"Paths through '{stop_name}': {paths}"
+
+@tool
+def find_routes_for_path(path_name: str, config: RunnableConfig) -> str:
     """Finds all routes that are based on a specific path name."""
-    db: Session = SessionLocal()
-    path = db.query(Path).filter(Path.name == path_name).first()
-    if not path:
-        db.close()
-        return f"Path '{path_name}' not found."
-    routes = db.query(Route).filter(Route.path_id == path.path_id).all()
-    if not routes:
-        db.close()
-        return f"No routes found for path '{path_name}'."
-    db.close()
-    return f"Routes using '{path_name}': {[r.display_name for r in routes]}"
+    with tool_session(config) as db:
+        path = db.query(Path).filter(Path.name == path_name).first()
+        if not path:
+            return f"Path '{path_name}' not found."
+        routes = db.query(Route).filter(Route.path_id == path.path_id).all()
+        if not routes:
+            return f"No routes found for path '{path_name}'."
+        return f"Routes using '{path_name}': {[r.display_name for r in routes]}"
 
 @tool
-def assign_vehicle_to_trip(vehicle_license_plate: str, driver_name: str, trip_display_name: str) -> str:
+def assign_vehicle_to_trip(vehicle_license_plate: str, driver_name: str, trip_display_name: str, config: RunnableConfig) -> str:
     """Assigns a vehicle and a driver to a specific daily trip."""
-    db: Session = SessionLocal()
-    trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if not trip:
-        db.close()
-        return f"Error: Trip '{trip_display_name}' not found."
-    vehicle = db.query(Vehicle).filter(Vehicle.license_plate == vehicle_license_plate).first()
-    if not vehicle:
-        db.close()
-        return f"Error: Vehicle '{vehicle_license_plate}' not found."
-    driver = db.query(Driver).filter(Driver.name == driver_name).first()
-    if not driver:
-        db.close()
-        return f"Error: Driver '{driver_name}' not found."
-    existing_deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
-    if existing_deployment:
-        db.close()
-        return f"Error: Trip '{trip_display_name}' already has a vehicle assigned. Please remove it first."
-    new_deployment = Deployment(trip_id=trip.trip_id, vehicle_id=vehicle.vehicle_id, driver_id=driver.driver_id)
-    db.add(new_deployment)
-    db.commit()
-    db.close()
-    return f"Successfully assigned vehicle {vehicle_license_plate} and driver {driver_name} to trip '{trip_display_name}'."
+    with tool_session(config) as db:
+        trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
+        if not trip:
+            return f"Error: Trip '{trip_display_name}' not found."
+        vehicle = db.query(Vehicle).filter(Vehicle.license_plate == vehicle_license_plate).first()
+        if not vehicle:
+            return f"Error: Vehicle '{vehicle_license_plate}' not found."
+        driver = db.query(Driver).filter(Driver.name == driver_name).first()
+        if not driver:
+            return f"Error: Driver '{driver_name}' not found."
+        existing_deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
+        if existing_deployment:
+            return f"Error: Trip '{trip_display_name}' already has a vehicle assigned. Please remove it first."
+        new_deployment = Deployment(trip_id=trip.trip_id, vehicle_id=vehicle.vehicle_id, driver_id=driver.driver_id)
+        db.add(new_deployment)
+        db.commit()
+        return f"Successfully assigned vehicle {vehicle_license_plate} and driver {driver_name} to trip '{trip_display_name}'."
 
 @tool
-def create_new_stop(stop_name: str, latitude: float, longitude: float) -> str:
+def create_new_stop(stop_name: str, latitude: float, longitude: float, config: RunnableConfig) -> str:
     """Creates a new stop in the database."""
-    db: Session = SessionLocal()
-    existing_stop = db.query(Stop).filter(Stop.name == stop_name).first()
-    if existing_stop:
-        db.close()
-        return f"Error: A stop with the name '{stop_name}' already exists."
-    new_stop = Stop(name=stop_name, latitude=latitude, longitude=longitude)
-    db.add(new_stop)
-    db.commit()
-    db.close()
-    return f"Successfully created new stop: '{stop_name}'."
+    with tool_session(config) as db:
+        existing_stop = db.query(Stop).filter(Stop.name == stop_name).first()
+        if existing_stop:
+            return f"Error: A stop with the name '{stop_name}' already exists."
+        new_stop = Stop(name=stop_name, latitude=latitude, longitude=longitude)
+        db.add(new_stop)
+        db.commit()
+        return f"Successfully created new stop: '{stop_name}'."
 
 @tool
-def create_new_path(path_name: str, stop_names: List[str]) -> str:
+def create_new_path(path_name: str, stop_names: List[str], config: RunnableConfig) -> str:
     """Creates a new path using an ordered list of existing stop names."""
     if len(stop_names) < 2:
         return "Error: A path requires at least two stops."
-    db: Session = SessionLocal()
-
-    existing_path = db.query(Path).filter(Path.name == path_name).first()
-    if existing_path:
-        db.close()
-        return f"Error: A path with the name '{path_name}' already exists. Please use the existing path or choose a different name."
-
-    stops = db.query(Stop).filter(Stop.name.in_(stop_names)).all()
-    stop_map = {stop.name: stop.stop_id for stop in stops}
-    if len(stops) != len(stop_names):
-        found_names = set(stop_map.keys())
-        missing_names = [name for name in stop_names if name not in found_names]
-        db.close()
-        return f"Error: The following stops were not found: {', '.join(missing_names)}. Please create them first."
-    ordered_stop_ids = [str(stop_map[name]) for name in stop_names]
-    new_path = Path(name=path_name, ordered_stop_ids=",".join(ordered_stop_ids))
-    db.add(new_path)
-    db.commit()
-    db.close()
-    return f"Successfully created new path '{path_name}' with stops: {', '.join(stop_names)}."
+    with tool_session(config) as db:
+        existing_path = db.query(Path).filter(Path.name == path_name).first()
+        if existing_path:
+            return f"Error: A path with the name '{path_name}' already exists. Please use the existing path or choose a different name."
+
+        stops = db.query(Stop).filter(Stop.name.in_(stop_names)).all()
+        stop_map = {stop.name: stop.stop_id for stop in stops}
+        if len(stops) != len(stop_names):
+            found_names = set(stop_map.keys())
+            missing_names = [name for name in stop_names if name not in found_names]
+            return f"Error: The following stops were not found: {', '.join(missing_names)}. Please create them first."
+        ordered_stop_ids = [str(stop_map[name]) for name in stop_names]
+        new_path = Path(
+            name=path_name,
+            ordered_stop_ids=",".join(ordered_stop_ids),
+            path_stops=[PathStop(stop_id=stop_map[name], stop_order=order) for order, name in enumerate(stop_names, start=1)],
+        )
+        db.add(new_path)
+        db.commit()
+        return f"Successfully created new path '{path_name}' with stops: {', '.join(stop_names)}."
 
 @tool
-def update_route_status(route_display_name: str, new_status: str) -> str:
+def update_route_status(route_display_name: str, new_status: str, config: RunnableConfig) -> str:
     """Updates the status of a route. Valid statuses are 'active' or 'deactivated'."""
-    db: Session = SessionLocal()
-    route = db.query(Route).filter(Route.display_name == route_display_name).first()
-    if not route:
-        db.close()
-        return f"Error: Route '{route_display_name}' not found."
-    if new_status.lower() not in ['active', 'deactivated']:
-        db.close()
-        return "Error: Invalid status. Please use 'active' or 'deactivated'."
-    route.status = StatusEnum[new_status.lower()]
-    db.commit()
-    db.close()
-    return f"Successfully updated status of route '{route_display_name}' to {new_status}."
+    with tool_session(config) as db:
+        route = db.query(Route).filter(Route.display_name == route_display_name).first()
+        if not route:
+            return f"Error: Route '{route_display_name}' not found."
+        if new_status.lower() not in ['active', 'deactivated']:
+            return "Error: Invalid status. Please use 'active' or 'deactivated'."
+        update_status_by_id(db, Route.status, [route.route_id], StatusEnum[new_status.lower()])
+        return f"Successfully updated status of route '{route_display_name}' to {new_status}."
 
 @tool
-def get_deployment_details(trip_display_name: str) -> str:
+def get_deployment_details(trip_display_name: str, config: RunnableConfig) -> str:
     """Gets the assigned vehicle and driver details for a specific trip."""
-    db: Session = SessionLocal()
-    trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if not trip:
-        db.close()
-        return f"Trip '{trip_display_name}' not found."
-    deployment = db.query(Deployment).filter(Deployment.trip_id == trip.trip_id).first()
-    if not deployment:
-        db.close()
-        return f"No vehicle is currently deployed for the trip '{trip_display_name}'."
-    vehicle = db.query(Vehicle).get(deployment.vehicle_id)
-    driver = db.query(Driver).get(deployment.driver_id)
-    db.close()
-    return (
-        f"Deployment for '{trip_display_name}':\n"
-        f"- Vehicle: {vehicle.license_plate} ({vehicle.type}, {vehicle.capacity} seats)\n"
-        f"- Driver: {driver.name} (Contact: {driver.phone_number})"
-    )
-
-def check_route_deactivation_consequences(route_display_name: str, db: Session) -> dict:
-    route = db.query(Route).filter(Route.display_name == route_display_name).first()
-    if not route:
-        return {"has_consequences": False, "details": "Route not found."}
-    active_trips = db.query(DailyTrip).filter(
-        DailyTrip.route_id == route.route_id, 
-        DailyTrip.live_status.in_(['scheduled', 'in_progress'])
-    ).all()
-    if not active_trips:
-        return {"has_consequences": False}
-    trip_names = [trip.display_name for trip in active_trips]
-    return {
-        "has_consequences": True,
-        "details": (
-            f"This route is used by {len(active_trips)} active trip(s) today: {', '.join(trip_names)}. "
-            "Deactivating the route may cause issues with these trips."
+    with tool_session(config) as db:
+        trip = get_trip_summary_by_name(db, trip_display_name)
+        if not trip:
+            return f"Trip '{trip_display_name}' not found."
+        if not trip.deployment_id:
+            return f"No vehicle is currently deployed for the trip '{trip_display_name}'."
+        return (
+            f"Deployment for '{trip_display_name}':\n"
+            f"- Vehicle: {trip.vehicle_license_plate} ({trip.vehicle_type}, {trip.vehicle_capacity} seats)\n"
+            f"- Driver: {trip.driver_name} (Contact: {trip.driver_phone_number})"
         )
+
+def collect_consequences(tool_calls: List[dict], db: Session) -> List[str]:
+    """
+    Evaluates every high-impact call of one agent step together, with at most
+    one query for all trips and one for all routes, however many calls there are.
+    Returns one human-readable warning per affected trip or route.
+    """
+    trip_names = {
+        call["args"].get("trip_display_name") for call in tool_calls
+        if call["name"] == "remove_vehicle_from_trip"
+    }
+    route_names = {
+        call["args"].get("route_display_name") for call in tool_calls
+        if call["name"] == "update_route_status" and str(call["args"].get("new_status", "")).lower() == "deactivated"
     }
+    details = []
+    if trip_names:
+        booked_trips = db.query(DailyTrip.display_name, DailyTrip.booking_status_percentage).filter(
+            DailyTrip.display_name.in_(trip_names),
+            DailyTrip.booking_status_percentage > 0
+        ).all()
+        details += [f"The trip '{name}' is already {percentage}% booked by employees" for name, percentage in booked_trips]
+    if route_names:
+        active_trips = db.query(Route.display_name, DailyTrip.display_name).join(
+            DailyTrip, DailyTrip.route_id == Route.route_id
+        ).filter(
+            Route.display_name.in_(route_names),
+            DailyTrip.live_status.in_(['scheduled', 'in_progress'])
+        ).order_by(Route.display_name, DailyTrip.trip_id).all()
+        trips_by_route = {}
+        for route_name, trip_name in active_trips:
+            trips_by_route.setdefault(route_name, []).append(trip_name)
+        details += [
+            f"The route '{route_name}' is used by {len(trip_names_for_route)} active trip(s) today: "
+            f"{', '.join(trip_names_for_route)}, and deactivating it may cause issues with these trips"
+            for route_name, trip_names_for_route in trips_by_route.items()
+        ]
+    return details
 
 @tool
-def create_new_trip(route_display_name: str, trip_display_name: str, live_status: str = "scheduled") -> str:
+def create_new_trip(route_display_name: str, trip_display_name: str, config: RunnableConfig, live_status: str = "scheduled") -> str:
     """Creates a new daily trip for a given route with a specific display name and status."""
-    db: Session = SessionLocal()
-    route = db.query(Route).filter(Route.display_name == route_display_name).first()
-    if not route:
-        db.close()
-        return f"Error: The route '{route_display_name}' could not be found. Please ensure the route exists."
-    existing_trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
-    if existing_trip:
-        db.close()
-        return f"Error: A trip named '{trip_display_name}' already exists for today."
-    new_trip = DailyTrip(
-        route_id=route.route_id,
-        display_name=trip_display_name,
-        live_status=live_status,
-        booking_status_percentage=0
-    )
-    db.add(new_trip)
-    db.commit()
-    db.close()
-    return f"Successfully created new trip '{trip_display_name}' for route '{route_display_name}' with status '{live_status}'."
+    with tool_session(config) as db:
+        route = db.query(Route).filter(Route.display_name == route_display_name).first()
+        if not route:
+            return f"Error: The route '{route_display_name}' could not be found. Please ensure the route exists."
+        existing_trip = db.query(DailyTrip).filter(DailyTrip.display_name == trip_display_name).first()
+        if existing_trip:
+            return f"Error: A trip named '{trip_display_name}' already exists for today."
+        new_trip = DailyTrip(
+            route_id=route.route_id,
+            display_name=trip_display_name,
+            live_status=live_status,
+            booking_status_percentage=0
+        )
+        db.add(new_trip)
+        db.commit()
+        return f"Successfully created new trip '{trip_display_name}' for route '{route_display_name}' with status '{live_status}'."
 
 @tool
-def get_all_trips() -> str:
+def generate_trips_for_day(day: str, config: RunnableConfig, route_display_names: Optional[List[str]] = None) -> str:
+    """Creates the trips for a service day (YYYY-MM-DD) from all active routes, or only the named ones. Routes that already have a trip that day are skipped."""
+    try:
+        service_day = datetime.strptime(day, "%Y-%m-%d")
+    except ValueError:
+        return f"Error: '{day}' is not a date in YYYY-MM-DD format."
+    with tool_session(config) as db:
+        route_ids = None
+        if route_display_names:
+            routes = dict(db.query(Route.display_name, Route.route_id).filter(Route.display_name.in_(route_display_names)).all())
+            missing = [name for name in route_display_names if name not in routes]
+            if missing:
+                return f"Error: Route(s) not found: {', '.join(missing)}."
+            route_ids = list(routes.values())
+        created = db.execute(daily_trips_insert(service_day, route_ids)).rowcount
+        db.commit()
+        return f"Created {created} trip(s) for {day}. Routes that already had a trip that day were left as they were."
+
+@tool
+def get_all_trips(config: RunnableConfig) -> str:
     """Returns a list of all display names for today's trips."""
-    db: Session = SessionLocal()
-    trips = db.query(DailyTrip).all()
-    if not trips:
-        db.close()
-        return "There are no trips scheduled for today."
-    
-    trip_names = [trip.display_name for trip in trips]
-    db.close()
-    return f"Found {len(trip_names)} trips today: {', '.join(trip_names)}"
\ No newline at end of file
+    with tool_session(config) as db:
+        trips = db.query(DailyTrip).all()
+        if not trips:
+            return "There are no trips scheduled for today."
+
+        trip_names = [trip.display_name for trip in trips]
+        return f"Found {len(trip_names)} trips today: {', '.join(trip_names)}"
\ No newline at end of file
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Benchmarks must not write their conversations into the real checkpoint store.
+os.environ.setdefault("MOVI_CHECKPOINT_DB", os.path.join(tempfile.mkdtemp(prefix="movi-bench-"), "checkpoints.db"))
+# Measure the model path unless a benchmark turns these shortcuts on itself.
+os.environ.setdefault("MOVI_FAST_PATH", "false")
+os.environ.setdefault("MOVI_RESPONSE_CACHE", "false")
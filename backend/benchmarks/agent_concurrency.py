@@ -0,0 +1,88 @@
+"""
+Load test: do in-flight agent conversations hold up the UI read endpoints?
+
+Fires N concurrent /invoke_agent requests against a fake LLM with a fixed
+latency and, while they are running, polls /trips and /stops. Run it once in
+the default (async) mode and once with --blocking, which reproduces the old
+synchronous `movi_agent.invoke` call inside the async handler.
+
+    python seed.py
+    python -m benchmarks.agent_concurrency --agents 20 --latency 1.0
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+
+import agent.graph as agent_graph
+from benchmarks.fakes import ScriptedChatModel
+
+
+class _BlockingAgent:
+    """
+    Holds the event loop for the whole graph run, like the old sync call. It
+    uses its own graph without a checkpointer, since the shared one is bound
+    to the (blocked) server loop.
+    """
+
+    def __init__(self):
+        self.graph = agent_graph.create_movi_agent_graph()
+
+    async def ainvoke(self, inputs, *args, **kwargs):
+        result = {}
+        worker = threading.Thread(target=lambda: result.update(asyncio.run(self.graph.ainvoke(inputs))))
+        worker.start()
+        worker.join()
+        return result
+
+
+async def _poll_ui(client: httpx.AsyncClient, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        for url in ("/trips", "/stops"):
+            start = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+
+async def run(agents: int, latency: float, blocking: bool):
+    agent_graph.ChatOpenAI = lambda **kwargs: ScriptedChatModel(latency=latency)
+    agent_graph.get_model_with_tools.cache_clear()
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app), httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        if blocking:
+            main.movi_agent = _BlockingAgent()
+        stop = asyncio.Event()
+        samples: list = []
+        poller = asyncio.create_task(_poll_ui(client, stop, samples))
+        body = {"messages": [{"role": "user", "content": "How many vehicles are not assigned?"}], "currentPage": "busDashboard"}
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/invoke_agent", json=body) for _ in range(agents)))
+        agent_wall = time.perf_counter() - start
+        stop.set()
+        await poller
+
+    assert all(r.status_code == 200 for r in responses)
+    samples.sort()
+    mode = "blocking invoke" if blocking else "async ainvoke"
+    print(f"mode={mode} agents={agents} llm_latency={latency:.2f}s")
+    print(f"  agent wall clock:        {agent_wall:.2f}s")
+    print(f"  UI reads during load:    {len(samples)}")
+    if samples:
+        print(f"  UI latency p50 / max:    {statistics.median(samples) * 1000:.1f}ms / {samples[-1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.agents, args.latency, args.blocking))
@@ -0,0 +1,75 @@
+"""
+Time-to-first-byte of /invoke_agent versus the SSE /invoke_agent/stream endpoint.
+
+The fake model first calls get_unassigned_vehicles, then streams a reply
+word by word every --token-delay seconds.
+
+    python seed.py
+    python -m benchmarks.agent_streaming --token-delay 0.05
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from langchain_core.messages import AIMessage
+
+import agent.graph as agent_graph
+from benchmarks.fakes import ScriptedChatModel
+from benchmarks.server import start_server
+
+REPLY = "There are two vehicles without an assignment right now: KA-01-7890 and TN-07-1122. Shall I assign one?"
+
+
+def _fake_model(latency: float, token_delay: float) -> ScriptedChatModel:
+    return ScriptedChatModel(
+        script=[AIMessage(content="", tool_calls=[{"name": "get_unassigned_vehicles", "args": {}, "id": "call_1"}])],
+        latency=latency,
+        token_delay=token_delay,
+        final_reply=REPLY,
+    )
+
+
+async def run(latency: float, token_delay: float, port: int):
+    import main
+
+    server = start_server(main.app, port)
+    body = {"messages": [{"role": "user", "content": "Which vehicles are unassigned?"}], "currentPage": "busDashboard"}
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+        agent_graph.ChatOpenAI = lambda **kwargs: _fake_model(latency, token_delay)
+        agent_graph.get_model_with_tools.cache_clear()
+        start = time.perf_counter()
+        response = await client.post("/invoke_agent", json=body)
+        blocking_total = time.perf_counter() - start
+        response.raise_for_status()
+
+        agent_graph.get_model_with_tools.cache_clear()
+        events = []
+        first_byte = first_token = None
+        start = time.perf_counter()
+        async with client.stream("POST", "/invoke_agent/stream", json=body) as stream:
+            async for line in stream.aiter_lines():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                if line.startswith("event: "):
+                    events.append(line[len("event: "):])
+                    if events[-1] == "token" and first_token is None:
+                        first_token = time.perf_counter() - start
+        streaming_total = time.perf_counter() - start
+    server.should_exit = True
+
+    print(f"llm_latency={latency * 1000:.0f}ms token_delay={token_delay * 1000:.0f}ms")
+    print(f"  /invoke_agent          first byte == done: {blocking_total * 1000:7.1f}ms")
+    print(f"  /invoke_agent/stream   first event:        {first_byte * 1000:7.1f}ms")
+    print(f"                         first token:        {first_token * 1000:7.1f}ms")
+    print(f"                         done:               {streaming_total * 1000:7.1f}ms")
+    print(f"  event sequence: {', '.join(dict.fromkeys(events))} ({events.count('token')} tokens)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency, args.token_delay, args.port))
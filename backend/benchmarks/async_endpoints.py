@@ -0,0 +1,132 @@
+"""
+Concurrent requests to a read endpoint written the old way (def + sync
+Session, run in FastAPI's threadpool) and the new way (async def +
+AsyncSession, see get_async_db in database/connection.py).
+
+Both serve the first page of /vehicles/available from the same throwaway
+SQLite file with the same pool size. --db-latency adds a fixed delay to every
+query, as the network round trip to a database server would. A sync request
+holds one of the threadpool's 40 threads for its whole round trip; an async
+one only a pool connection, so it is bounded by --pool-size instead.
+
+    python -m benchmarks.async_endpoints --requests 400 --concurrency 200 --db-latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from database.connection import make_async_engine, make_engine
+from database.models import Base, Vehicle
+from database.queries import available_vehicles_query, day_window, keyset_page
+
+VEHICLES = 5000
+
+
+def _pause(seconds: float) -> int:
+    time.sleep(seconds)
+    return 0
+
+
+def _add_latency(engine, latency: float):
+    # Deterministic, so SQLite evaluates the constant call once per statement.
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("movi_pause", 1, _pause, deterministic=True)
+
+
+def _build_app(path: str, pool_size: int, latency: float):
+    url = f"sqlite:///{path}"
+    sync_engine = make_engine(url, pool_size=pool_size, max_overflow=0)
+    async_engine = make_async_engine(url, pool_size=pool_size, max_overflow=0)
+    _add_latency(sync_engine, latency)
+    _add_latency(async_engine.sync_engine, latency)
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    AsyncSessionFactory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    def page():
+        start, end = day_window(datetime(2025, 1, 15))
+        query = available_vehicles_query(start, end).where(func.movi_pause(latency) == 0)
+        return keyset_page(query, Vehicle.vehicle_id, None, 100)
+
+    app = FastAPI()
+
+    @app.get("/sync/vehicles/available")
+    def sync_available(db: Session = Depends(get_sync_db)):
+        return [vehicle.vehicle_id for vehicle in db.scalars(page()).all()]
+
+    @app.get("/async/vehicles/available")
+    async def async_available(db: AsyncSession = Depends(get_async_db)):
+        return [vehicle.vehicle_id for vehicle in (await db.scalars(page())).all()]
+
+    return app, sync_engine, async_engine
+
+
+async def _load(app, url: str, requests: int, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+    latencies, peak_threads = [], threading.active_count()
+
+    async def one(client):
+        nonlocal peak_threads
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+            peak_threads = max(peak_threads, threading.active_count())
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        # Open the pool's connections before timing.
+        await asyncio.gather(*(one(client) for _ in range(concurrency)))
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, statistics.median(latencies), sorted(latencies)[int(len(latencies) * 0.95)], peak_threads
+
+
+async def run(requests: int, concurrency: int, pool_size: int, latency: float):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-async-"), "vehicles.db")
+    app, sync_engine, async_engine = _build_app(path, pool_size, latency)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(insert(Vehicle), [{"vehicle_id": i, "license_plate": f"KA-{i:05d}", "type": "Bus", "capacity": 40} for i in range(1, VEHICLES + 1)])
+    print(f"{requests} requests, {concurrency} concurrent, pool {pool_size}, {latency * 1000:.0f}ms per query")
+    try:
+        for label, url in (("def + Session", "/sync/vehicles/available"), ("async + AsyncSession", "/async/vehicles/available")):
+            throughput, p50, p95, threads = await _load(app, url, requests, concurrency)
+            print(f"  {label:<21} {throughput:7.0f} req/s  p50 {p50 * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms  peak threads {threads}")
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.pool_size, args.db_latency))
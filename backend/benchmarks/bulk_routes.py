@@ -0,0 +1,116 @@
+"""
+Bulk route creation, per-route loop versus one set-based pass.
+
+The loop is what crud.route.bulk_create_routes did: for every route, fetch
+its Path, run the ordered path_stops/stops join to find the first and last
+stop, add the Route, then refresh each one after the commit. The set-based
+pass is crud.route.bulk_create_routes itself: it resolves every distinct
+path's endpoints with path_endpoints_query (one windowed statement) and
+inserts all routes with one INSERT ... RETURNING.
+
+Runs on a throwaway SQLite file (never the app database), counting the SQL
+statements each approach sends as well as the time.
+
+    python -m benchmarks.bulk_routes --routes 10000 --paths 200
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, event, insert
+from sqlalchemy.orm import Session
+
+from crud.route import bulk_create_routes
+from database.models import Base, Path, PathStop, Route, Stop
+from schemas import RouteCreate
+
+STOPS = 2000
+STOPS_PER_PATH = 15
+
+
+def _build(paths: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-bulk-routes-"), "routes.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    stop_ids = {path_id: rng.sample(range(1, STOPS + 1), STOPS_PER_PATH) for path_id in range(1, paths + 1)}
+    with engine.begin() as conn:
+        conn.execute(insert(Stop), [{"stop_id": i, "name": f"Stop {i}", "latitude": 12.9, "longitude": 77.5} for i in range(1, STOPS + 1)])
+        conn.execute(insert(Path), [
+            {"path_id": path_id, "name": f"Path {path_id}", "ordered_stop_ids": ",".join(map(str, ids))}
+            for path_id, ids in stop_ids.items()
+        ])
+        conn.execute(insert(PathStop), [
+            {"path_id": path_id, "stop_id": sid, "stop_order": order}
+            for path_id, ids in stop_ids.items() for order, sid in enumerate(ids, start=1)
+        ])
+    return engine
+
+
+def _batch(routes: int, paths: int):
+    rng = random.Random(11)
+    return [
+        RouteCreate(path_id=rng.randint(1, paths), route_display_name=f"Route {i}", shift_time=f"{i % 24:02d}:{i % 60:02d}",
+                    direction="up", capacity=40, allocated_waitlist=0, status="active")
+        for i in range(1, routes + 1)
+    ]
+
+
+def _loop(db: Session, batch):
+    db_routes = []
+    for route in batch:
+        path = db.query(Path).filter(Path.path_id == route.path_id).first()
+        if not path:
+            raise ValueError(f"Path with id {route.path_id} does not exist")
+        path_stops = (
+            db.query(PathStop, Stop)
+            .join(Stop, PathStop.stop_id == Stop.stop_id)
+            .filter(PathStop.path_id == route.path_id)
+            .order_by(PathStop.stop_order)
+            .all()
+        )
+        if len(path_stops) < 2:
+            raise ValueError(f"Path {route.path_id} must have at least 2 stops")
+        db_routes.append(Route(path_id=route.path_id, display_name=route.route_display_name, shift_time=route.shift_time,
+                               direction=route.direction, start_point=path_stops[0].Stop.name, end_point=path_stops[-1].Stop.name))
+    db.add_all(db_routes)
+    db.commit()
+    for db_route in db_routes:
+        db.refresh(db_route)
+    return [(r.route_id, r.path_id, r.start_point, r.end_point) for r in db_routes]
+
+
+def _set_based(db: Session, batch):
+    return [(r.route_id, r.path_id, r.start_point, r.end_point) for r in bulk_create_routes(db, batch)]
+
+
+def run(routes: int, paths: int):
+    engine = _build(paths)
+    batch = _batch(routes, paths)
+    statements = [0]
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.__setitem__(0, statements[0] + 1))
+    print(f"{routes} routes over {paths} paths of {STOPS_PER_PATH} stops")
+    results = {}
+    for label, fn in (("per-route loop", _loop), ("set-based", _set_based)):
+        with Session(engine) as db:
+            db.execute(delete(Route))
+            db.commit()
+        statements[0] = 0
+        started = time.perf_counter()
+        with Session(engine) as db:
+            created = fn(db, batch)
+        elapsed = time.perf_counter() - started
+        results[label] = sorted((path_id, start, end) for _, path_id, start, end in created)
+        print(f"  {label:<15} {elapsed:7.2f}s  {statements[0]:6d} statements")
+    assert results["per-route loop"] == results["set-based"], "route endpoints disagree"
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=10000)
+    parser.add_argument("--paths", type=int, default=200)
+    args = parser.parse_args()
+    run(args.routes, args.paths)
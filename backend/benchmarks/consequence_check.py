@@ -0,0 +1,59 @@
+"""
+Queries issued by the consequence check when one agent step contains several
+high-impact calls, evaluated together versus one call at a time (the old
+per-call behaviour, which also only ever looked at the last call).
+
+    python seed.py
+    python -m benchmarks.consequence_check --calls 1 5 25
+"""
+import argparse
+
+from sqlalchemy import event
+
+from agent.tools import collect_consequences
+from database.connection import SessionLocal, engine
+from database.models import DailyTrip, Route
+
+
+def _tool_calls(db, count: int) -> list:
+    trips = [name for (name,) in db.query(DailyTrip.display_name).limit(count).all()]
+    routes = [name for (name,) in db.query(Route.display_name).limit(count).all()]
+    calls = []
+    for i in range(count):
+        if i % 2 == 0 and trips:
+            calls.append({"name": "remove_vehicle_from_trip", "args": {"trip_display_name": trips[i % len(trips)]}})
+        elif routes:
+            calls.append({"name": "update_route_status", "args": {"route_display_name": routes[i % len(routes)], "new_status": "deactivated"}})
+    return calls
+
+
+def run(call_counts: list):
+    queries = []
+    listener = lambda *args: queries.append(1)
+    db = SessionLocal()
+    try:
+        print(f"{'calls':>6} {'batched queries':>16} {'per-call queries':>17}")
+        for count in call_counts:
+            calls = _tool_calls(db, count)
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                queries.clear()
+                collect_consequences(calls, db)
+                batched = len(queries)
+                queries.clear()
+                for call in calls:
+                    collect_consequences([call], db)
+                per_call = len(queries)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            print(f"{len(calls):>6} {batched:>16} {per_call:>17}")
+            assert batched <= 2, "The batched check must not grow with the number of calls."
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 5, 25])
+    args = parser.parse_args()
+    run(args.calls)
@@ -0,0 +1,62 @@
+"""
+Request size and latency per turn: resending the whole transcript (no
+thread_id) versus posting only the new message to a checkpointed thread.
+
+    python seed.py
+    python -m benchmarks.conversation_checkpointing --turns 40
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+import agent.graph as agent_graph
+from benchmarks.fakes import ScriptedChatModel
+
+REPORT_TURNS = {1, 5, 10, 20, 40, 80, 160}
+
+
+async def run(turns: int):
+    agent_graph.ChatOpenAI = lambda **kwargs: ScriptedChatModel(final_reply="Trip 'Bulk - 00:01' is scheduled and 25% booked.")
+    agent_graph.get_model_with_tools.cache_clear()
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app), httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        history = []
+        thread_id = None
+        rows = []
+        for turn in range(1, turns + 1):
+            user_message = {"role": "user", "content": f"Turn {turn}: what is the status of Bulk - 00:01?"}
+
+            full_body = json.dumps({"messages": history + [user_message], "currentPage": "busDashboard"})
+            start = time.perf_counter()
+            full = await client.post("/invoke_agent", content=full_body, headers={"Content-Type": "application/json"})
+            full_latency = time.perf_counter() - start
+
+            thread_body = json.dumps({"messages": [user_message], "currentPage": "busDashboard", "thread_id": thread_id})
+            start = time.perf_counter()
+            threaded = await client.post("/invoke_agent", content=thread_body, headers={"Content-Type": "application/json"})
+            thread_latency = time.perf_counter() - start
+
+            thread_id = threaded.json()["thread_id"]
+            history += [user_message, {"role": "assistant", "content": full.json()["content"]}]
+            if turn in REPORT_TURNS or turn == turns:
+                rows.append((turn, len(full_body), full_latency, len(thread_body), thread_latency))
+
+        state = await main.movi_agent.aget_state({"configurable": {"thread_id": thread_id}})
+        evicted = await main.movi_agent.checkpointer.aevict_expired(ttl_seconds=0)
+
+    print(f"{'turn':>5} | {'full history':>22} | {'thread_id + new message':>26}")
+    for turn, full_bytes, full_latency, thread_bytes, thread_latency in rows:
+        print(f"{turn:>5} | {full_bytes:>8} B {full_latency * 1000:>8.1f}ms | {thread_bytes:>12} B {thread_latency * 1000:>8.1f}ms")
+    print(f"server-side thread holds {len(state.values['messages'])} messages; TTL sweep with ttl=0 evicted {evicted} thread(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns))
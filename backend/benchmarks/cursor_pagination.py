@@ -0,0 +1,85 @@
+"""
+A deep page of /trips fetched with LIMIT/OFFSET versus a keyset cursor.
+
+Builds a throwaway SQLite file (never the app database) with enough trips for
+--page pages of --page-size, then fetches that page newest first, as /trips
+lists them: once by skipping (page - 1) * page_size rows, once from the
+X-Next-Cursor value a client would hold after the previous page. OFFSET has
+to walk every skipped row; the cursor seeks straight to it on the primary key.
+
+    python -m benchmarks.cursor_pagination --page 10000 --page-size 100
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database.models import Base, DailyTrip, Path, Route
+from database.queries import decode_cursor, encode_cursor, keyset_page
+
+INSERT_BATCH = 50000
+
+
+def _build(trips: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-pagination-"), "trips.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Path), [{"path_id": 1, "name": "Path 1", "ordered_stop_ids": ""}])
+        conn.execute(insert(Route), [{"route_id": 1, "path_id": 1, "display_name": "Route 1", "shift_time": "08:00"}])
+        for start in range(1, trips + 1, INSERT_BATCH):
+            conn.execute(insert(DailyTrip), [
+                {"trip_id": i, "route_id": 1, "display_name": f"Trip {i}", "live_status": "scheduled", "booking_status_percentage": 0}
+                for i in range(start, min(start + INSERT_BATCH, trips + 1))
+            ])
+    return engine
+
+
+def _median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(page: int, page_size: int, runs: int):
+    trips = page * page_size + page_size
+    started = time.perf_counter()
+    engine = _build(trips)
+    print(f"{trips} trips in {time.perf_counter() - started:.1f}s; page {page} of {page_size}, newest first")
+
+    newest_first = select(DailyTrip).order_by(DailyTrip.trip_id.desc())
+    with Session(engine) as db:
+        def by_offset(number: int):
+            return db.scalars(newest_first.offset((number - 1) * page_size).limit(page_size)).all()
+
+        def by_cursor(cursor):
+            after = decode_cursor(cursor)
+            return db.scalars(keyset_page(select(DailyTrip), DailyTrip.trip_id, after, page_size, descending=True)).all()
+
+        # The cursor a client holds after reading the previous page.
+        cursor = encode_cursor(by_offset(page - 1)[-1].trip_id)
+        assert [t.trip_id for t in by_offset(page)] == [t.trip_id for t in by_cursor(cursor)], "pages disagree"
+
+        for label, offset_fn, cursor_fn in (
+            ("page 1", lambda: by_offset(1), lambda: by_cursor(None)),
+            (f"page {page}", lambda: by_offset(page), lambda: by_cursor(cursor)),
+        ):
+            old, new = _median_ms(offset_fn, runs), _median_ms(cursor_fn, runs)
+            print(f"  {label:<11} offset {old:9.2f}ms -> cursor {new:7.2f}ms  x{old / max(new, 1e-9):,.0f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.page, args.page_size, args.runs)
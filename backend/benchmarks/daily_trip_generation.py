@@ -0,0 +1,105 @@
+"""
+Generating a service day's trips for every active route: a per-route loop
+versus the single INSERT ... SELECT in database/trip_generation.py.
+
+The loop does what building trips one by one amounts to, only with a single
+commit: for each active route, check whether it already has a trip that day,
+then add the DailyTrip. Both run on a throwaway SQLite file (never the app
+database) whose routes already have --history-days days of trips, with the
+migrations applied. Each approach is then run a second time for the same day
+to show that a re-run creates nothing.
+
+    python -m benchmarks.daily_trip_generation --routes 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from database.migrations import run_migrations
+from database.models import Base, DailyTrip, Path, Route, StatusEnum
+from database.queries import day_window, trip_in_window
+from database.trip_generation import daily_trips_insert
+
+INSERT_BATCH = 50000
+DAY = datetime(2025, 2, 1)
+
+
+def _build(routes: int, history_days: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-trip-generation-"), "trips.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Path), [{"path_id": 1, "name": "Path 1", "ordered_stop_ids": ""}])
+        conn.execute(insert(Route), [
+            {"route_id": i, "path_id": 1, "display_name": f"Route {i}", "shift_time": f"{i % 24:02d}:00",
+             # One route in ten is deactivated and gets no trips.
+             "status": StatusEnum.deactivated if i % 10 == 0 else StatusEnum.active}
+            for i in range(1, routes + 1)
+        ])
+        history = (
+            {"route_id": route_id, "display_name": f"Route {route_id} ({DAY - timedelta(days=days):%Y-%m-%d})",
+             "trip_date": DAY - timedelta(days=days), "live_status": "completed", "booking_status_percentage": 80}
+            for days in range(1, history_days + 1) for route_id in range(1, routes + 1)
+        )
+        batch = []
+        for row in history:
+            batch.append(row)
+            if len(batch) == INSERT_BATCH:
+                conn.execute(insert(DailyTrip), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(DailyTrip), batch)
+    return engine
+
+
+def _loop(db: Session) -> int:
+    start, end = day_window(DAY)
+    created = 0
+    for route in db.query(Route).filter(Route.status == StatusEnum.active).all():
+        existing = db.query(DailyTrip).filter(DailyTrip.route_id == route.route_id, trip_in_window(start, end)).first()
+        if existing:
+            continue
+        db.add(DailyTrip(route_id=route.route_id, display_name=f"{route.display_name} ({start:%Y-%m-%d})",
+                         trip_date=start, live_status="scheduled", booking_status_percentage=0))
+        created += 1
+    db.commit()
+    return created
+
+
+def _insert_select(db: Session) -> int:
+    created = db.execute(daily_trips_insert(DAY)).rowcount
+    db.commit()
+    return created
+
+
+def run(routes: int, history_days: int):
+    started = time.perf_counter()
+    engine = _build(routes, history_days)
+    print(f"{routes} routes, {routes * history_days} trips of history, built in {time.perf_counter() - started:.1f}s")
+    start, end = day_window(DAY)
+    for label, fn in (("per-route loop", _loop), ("INSERT ... SELECT", _insert_select)):
+        with Session(engine) as db:
+            db.execute(delete(DailyTrip).where(DailyTrip.trip_date >= start, DailyTrip.trip_date < end))
+            db.commit()
+        for attempt in ("first run", "re-run"):
+            with Session(engine) as db:
+                started = time.perf_counter()
+                created = fn(db)
+                elapsed = time.perf_counter() - started
+                on_day = db.scalar(select(func.count()).select_from(DailyTrip).where(DailyTrip.trip_date >= start, DailyTrip.trip_date < end))
+            print(f"  {label:<18} {attempt:<9} {elapsed:7.2f}s  created {created:6d}  trips on the day {on_day}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=50000)
+    parser.add_argument("--history-days", type=int, default=7)
+    args = parser.parse_args()
+    run(args.routes, args.history_days)
@@ -0,0 +1,85 @@
+"""
+Driver availability on a large synthetic roster: the old behaviour (return
+the whole table, available or not) versus one keyset page of truly available
+drivers, a deep page, an OFFSET page at the same depth, and a full
+chunked stream, with Python memory for the whole-table and stream cases.
+
+Runs against a throwaway SQLite file, never the app database.
+
+    python -m benchmarks.driver_availability --drivers 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, DailyTrip, Deployment, Driver, Route, Vehicle
+from database.queries import available_drivers_query, day_window, iter_keyset, keyset_page
+
+DAY = datetime(2025, 1, 15)
+
+
+def _build_roster(drivers: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-roster-"), "roster.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    # Two in three drivers work a trip on DAY; the rest are free.
+    busy = [driver_id for driver_id in range(1, drivers + 1) if driver_id % 3]
+    with engine.begin() as conn:
+        conn.execute(insert(Route), [{"route_id": 1, "display_name": "R - 08:30", "shift_time": "08:30"}])
+        conn.execute(insert(Vehicle), [{"vehicle_id": 1, "license_plate": "KA-1", "type": "Bus", "capacity": 40}])
+        conn.execute(insert(Driver), [{"driver_id": i, "name": f"Driver {i}", "phone_number": f"{i:010d}"} for i in range(1, drivers + 1)])
+        conn.execute(insert(DailyTrip), [
+            {"trip_id": i, "route_id": 1, "display_name": f"Trip {i}", "trip_date": DAY.replace(hour=8, minute=30), "live_status": "scheduled"}
+            for i in range(1, len(busy) + 1)
+        ])
+        conn.execute(insert(Deployment), [{"trip_id": i, "vehicle_id": 1, "driver_id": driver_id} for i, driver_id in enumerate(busy, start=1)])
+    return engine, sessionmaker(bind=engine)
+
+
+def _timed(label: str, work, track_memory: bool = False):
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    rows = work()
+    elapsed = time.perf_counter() - started
+    memory = ""
+    if track_memory:
+        memory = f" {tracemalloc.get_traced_memory()[1] / 2**20:7.1f} MiB"
+        tracemalloc.stop()
+    print(f"  {label:<34} {elapsed * 1000:8.1f}ms{memory}  ({rows} rows)")
+
+
+def run(drivers: int, page_size: int):
+    engine, session_factory = _build_roster(drivers)
+    db = session_factory()
+    start, end = day_window(DAY)
+    available = lambda: available_drivers_query(start, end, "08:30")
+    deep_after_id = drivers * 9 // 10
+    print(f"{drivers} drivers, {drivers - drivers * 2 // 3} free on {DAY.date()}, page size {page_size}")
+    try:
+        _timed("whole table (old)", lambda: len(db.query(Driver).all()), track_memory=True)
+        db.expunge_all()
+        _timed("first keyset page", lambda: len(db.scalars(keyset_page(available(), Driver.driver_id, None, page_size)).all()))
+        _timed(f"keyset page after id {deep_after_id}", lambda: len(db.scalars(keyset_page(available(), Driver.driver_id, deep_after_id, page_size)).all()))
+        # Every third driver is free, so this OFFSET lands on the same page.
+        offset = deep_after_id // 3
+        _timed(f"OFFSET {offset} page", lambda: len(db.scalars(available().order_by(Driver.driver_id).offset(offset).limit(page_size)).all()))
+        db.expunge_all()
+        _timed("stream every free driver", lambda: sum(1 for _ in iter_keyset(db, available(), Driver.driver_id)), track_memory=True)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drivers", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    run(args.drivers, args.page_size)
@@ -0,0 +1,61 @@
+"""
+Latency and model calls for simple lookups answered on the deterministic fast
+path versus the same questions sent through the model.
+
+The scripted fake model sleeps --latency seconds per call and, like the real
+one, needs two calls per lookup: one to pick the tool, one to phrase the answer.
+
+    python seed.py
+    python -m benchmarks.fast_path --latency 1.0 --runs 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import agent.graph as agent_graph
+from benchmarks.fakes import ScriptedChatModel
+
+QUESTIONS = [
+    ("status of Bulk - 00:01", "get_trip_status", {"trip_display_name": "Bulk - 00:01"}),
+    ("list unassigned vehicles", "get_unassigned_vehicles", {}),
+    ("show all trips", "get_all_trips", {}),
+    ("What are the stops on Path-1?", "list_stops_for_path", {"path_name": "Path-1"}),
+]
+
+
+async def _ask(graph, question: str, tool: str, args: dict, latency: float):
+    model = ScriptedChatModel(
+        script=[AIMessage(content="", tool_calls=[{"name": tool, "args": args, "id": "call_1"}])],
+        latency=latency,
+    )
+    agent_graph.ChatOpenAI = lambda **kwargs: model
+    agent_graph.get_model_with_tools.cache_clear()
+    started = time.perf_counter()
+    await graph.ainvoke({"messages": [HumanMessage(content=question)]})
+    return time.perf_counter() - started, model.calls
+
+
+async def run(runs: int, latency: float):
+    graph = agent_graph.create_movi_agent_graph()
+    print(f"{len(QUESTIONS)} questions x {runs} runs, model latency {latency * 1000:.0f}ms")
+    for label, enabled in (("model", False), ("fast path", True)):
+        agent_graph.FAST_PATH_ENABLED = enabled
+        samples, model_calls = [], 0
+        for _ in range(runs):
+            for question, tool, args in QUESTIONS:
+                elapsed, calls = await _ask(graph, question, tool, args, latency)
+                samples.append(elapsed)
+                model_calls += calls
+        print(f"  {label:<10} p50 {statistics.median(samples) * 1000:8.1f}ms  "
+              f"max {max(samples) * 1000:8.1f}ms  model calls {model_calls}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.latency))
@@ -0,0 +1,60 @@
+"""
+Size and latency of the image preprocessing stage for a synthetic
+full-resolution dashboard screenshot: cold (decode + resize + re-encode in
+the worker pool) versus a repeated upload served from the hash cache.
+
+    python -m benchmarks.image_preprocessing --width 2880 --height 1800
+"""
+import argparse
+import asyncio
+import base64
+import io
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from agent.images import IMAGE_MAX_SIDE, preprocess_image
+
+
+def fake_screenshot(width: int, height: int) -> str:
+    """A PNG data URL that looks roughly like a table-heavy dashboard."""
+    rng = random.Random(7)
+    image = Image.new("RGB", (width, height), (246, 247, 249))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, 64), fill=(30, 64, 175))
+    draw.rectangle((0, 64, 260, height), fill=(255, 255, 255))
+    for row, y in enumerate(range(120, height - 40, 36)):
+        draw.rectangle((300, y, width - 40, y + 30), fill=(255, 255, 255) if row % 2 else (241, 245, 249))
+        for x in range(320, width - 200, 180):
+            draw.text((x, y + 8), f"Trip {rng.randint(0, 9999):04d}", fill=(31, 41, 55))
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+
+
+async def run(width: int, height: int, repeats: int):
+    original = fake_screenshot(width, height)
+
+    start = time.perf_counter()
+    processed = await preprocess_image(original)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await preprocess_image(original)
+    cached = (time.perf_counter() - start) / repeats
+
+    print(f"screenshot {width}x{height} -> max side {IMAGE_MAX_SIDE}px")
+    print(f"  data URL size: {len(original) / 1024:8.1f} KiB -> {len(processed) / 1024:8.1f} KiB")
+    print(f"  cold preprocess:   {cold * 1000:8.1f}ms")
+    print(f"  cached (same hash): {cached * 1000:7.2f}ms avg over {repeats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=2880)
+    parser.add_argument("--height", type=int, default=1800)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.width, args.height, args.repeats))
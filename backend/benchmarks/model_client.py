@@ -0,0 +1,64 @@
+"""
+Per-step latency of the shared, tool-bound ChatOpenAI client versus building
+a fresh ChatOpenAI + bind_tools on every call (the old call_model behaviour).
+
+Starts benchmarks/stub_openai.py on a local port and points the agent at it,
+so no API key or network access is needed.
+
+    python -m benchmarks.model_client --calls 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from benchmarks.server import start_server
+from benchmarks.stub_openai import create_stub_app
+
+
+async def _time_calls(build, calls: int) -> list:
+    messages = [SystemMessage(content="You are Movi."), HumanMessage(content="How many vehicles are not assigned?")]
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await build().ainvoke(messages)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def run(calls: int, port: int, latency: float):
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ["MOVI_LLM_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    import agent.graph as agent_graph
+
+    def rebuild_every_call():
+        model = ChatOpenAI(model=agent_graph.LLM_MODEL, temperature=0, streaming=True, base_url=base_url)
+        return model.bind_tools(agent_graph.tools)
+
+    server = start_server(create_stub_app(latency), port)
+    try:
+        results = {
+            "rebuilt per call": await _time_calls(rebuild_every_call, calls),
+            "shared client": await _time_calls(agent_graph.get_model_with_tools, calls),
+        }
+    finally:
+        server.should_exit = True
+
+    print(f"calls={calls} stub_latency={latency * 1000:.0f}ms")
+    for label, samples in results.items():
+        overhead = [s - latency for s in samples]
+        print(f"  {label:<18} p50 {statistics.median(samples) * 1000:7.2f}ms   mean client overhead {statistics.mean(overhead) * 1000:6.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.port, args.latency))
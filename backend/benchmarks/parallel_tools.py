@@ -0,0 +1,70 @@
+"""
+Per-step wall clock of the tool node when the model asks for several
+read-only tools at once, with read-only calls run concurrently versus the
+fully serialized baseline.
+
+The scripted fake model emits get_trip_status for three trips plus
+get_unassigned_vehicles and get_all_trips in a single step. --query-rtt adds
+a per-query delay to mimic a database across the network.
+
+    python seed.py
+    python -m benchmarks.parallel_tools --query-rtt 0.005 --runs 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from sqlalchemy import event
+
+import agent.graph as agent_graph
+from benchmarks.fakes import ScriptedChatModel
+from database.connection import engine
+
+TOOL_STEP = AIMessage(content="", tool_calls=[
+    {"name": "get_trip_status", "args": {"trip_display_name": "Bulk - 00:01"}, "id": "call_1"},
+    {"name": "get_trip_status", "args": {"trip_display_name": "Path Path - 00:02"}, "id": "call_2"},
+    {"name": "get_trip_status", "args": {"trip_display_name": "Bulk - 00:01"}, "id": "call_3"},
+    {"name": "get_unassigned_vehicles", "args": {}, "id": "call_4"},
+    {"name": "get_all_trips", "args": {}, "id": "call_5"},
+])
+
+
+async def _time_tool_step(graph) -> float:
+    agent_graph.get_model_with_tools.cache_clear()
+    step_started = None
+    async for update in graph.astream({"messages": [HumanMessage(content="Status of my trips and free vehicles?")]}, stream_mode="updates"):
+        if "agent" in update and step_started is None:
+            step_started = time.perf_counter()
+        elif "action" in update:
+            return time.perf_counter() - step_started
+    raise RuntimeError("The tool step never ran.")
+
+
+async def run(runs: int, query_rtt: float):
+    agent_graph.ChatOpenAI = lambda **kwargs: ScriptedChatModel(script=[TOOL_STEP])
+    if query_rtt:
+        event.listen(engine, "before_cursor_execute", lambda *args: time.sleep(query_rtt))
+    graph = agent_graph.create_movi_agent_graph()
+
+    results = {}
+    parallel_safe = set(agent_graph.PARALLEL_SAFE_TOOLS)
+    for label, safe_tools in (("serialized", set()), ("parallel read-only", parallel_safe)):
+        agent_graph.PARALLEL_SAFE_TOOLS.clear()
+        agent_graph.PARALLEL_SAFE_TOOLS.update(safe_tools)
+        results[label] = [await _time_tool_step(graph) for _ in range(runs)]
+
+    print(f"{len(TOOL_STEP.tool_calls)} tool calls per step, query_rtt={query_rtt * 1000:.1f}ms, runs={runs}")
+    for label, samples in results.items():
+        print(f"  {label:<20} p50 {statistics.median(samples) * 1000:7.1f}ms")
+    saved = statistics.median(results["serialized"]) - statistics.median(results["parallel read-only"])
+    print(f"  saved per step:      {saved * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--query-rtt", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.query_rtt))
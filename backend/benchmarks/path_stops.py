@@ -0,0 +1,102 @@
+"""
+Stop lookups on paths stored as an ordered_stop_ids CSV versus the
+normalized path_stops table, at a large number of paths.
+
+Builds a throwaway SQLite file (never the app database) holding only the CSV
+column, times the online backfill (migration 3 in database/migrations.py),
+then compares "which paths pass through this stop" as a LIKE scan against the
+(stop_id, path_id) index, and a path's ordered stops parsed from the CSV
+against one join.
+
+    python -m benchmarks.path_stops --paths 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database.migrations import backfill_path_stops
+from database.models import Base, Path, PathStop, Stop
+from database.queries import path_stops_query, paths_containing_stop_query
+
+STOPS = 5000
+STOPS_PER_PATH = 15
+
+
+def _build(paths: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-path-stops-"), "paths.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        conn.execute(insert(Stop), [{"stop_id": i, "name": f"Stop {i}", "latitude": 12.9, "longitude": 77.5} for i in range(1, STOPS + 1)])
+        conn.execute(insert(Path), [
+            {"path_id": i, "name": f"Path {i}", "ordered_stop_ids": ",".join(map(str, rng.sample(range(1, STOPS + 1), STOPS_PER_PATH)))}
+            for i in range(1, paths + 1)
+        ])
+    return engine
+
+
+def _csv_paths_for_stop(db: Session, stop_id: int):
+    # Comma-wrap both sides so stop 12 does not match 112 or 120.
+    return db.query(Path).filter(("," + Path.ordered_stop_ids + ",").like(f"%,{stop_id},%")).all()
+
+
+def _csv_ordered_stops(db: Session, path_id: int):
+    path = db.query(Path).filter(Path.path_id == path_id).first()
+    stop_ids = [int(sid) for sid in path.ordered_stop_ids.split(',')]
+    stop_map = {stop.stop_id: stop for stop in db.query(Stop).filter(Stop.stop_id.in_(stop_ids)).all()}
+    return [stop_map[sid] for sid in stop_ids if sid in stop_map]
+
+
+def _median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(paths: int, runs: int):
+    engine = _build(paths)
+    started = time.perf_counter()
+    backfill_path_stops(engine)
+    with engine.connect() as conn:
+        rows = len(conn.execute(select(PathStop.id)).all())
+    print(f"{paths} paths x {STOPS_PER_PATH} stops over {STOPS} stops; backfilled {rows} rows in {time.perf_counter() - started:.1f}s")
+
+    stop_id, path_id = 1234, paths // 2
+    with Session(engine) as db:
+        csv_paths = {p.path_id for p in _csv_paths_for_stop(db, stop_id)}
+        indexed_paths = {p.path_id for p in db.scalars(paths_containing_stop_query(stop_id)).all()}
+        assert csv_paths == indexed_paths, "reverse lookups disagree"
+        csv_stops = [s.stop_id for s in _csv_ordered_stops(db, path_id)]
+        joined_stops = [s.stop_id for s in db.scalars(path_stops_query().where(PathStop.path_id == path_id)).all()]
+        assert csv_stops == joined_stops, "stop orders disagree"
+
+        cases = [
+            (f"paths through stop ({len(indexed_paths)})",
+             lambda: _csv_paths_for_stop(db, stop_id),
+             lambda: db.scalars(paths_containing_stop_query(stop_id)).all()),
+            ("ordered stops of a path",
+             lambda: _csv_ordered_stops(db, path_id),
+             lambda: db.scalars(path_stops_query().where(PathStop.path_id == path_id)).all()),
+        ]
+        for label, csv_fn, indexed_fn in cases:
+            old, new = _median_ms(csv_fn, runs), _median_ms(indexed_fn, runs)
+            print(f"  {label:<28} csv {old:9.2f}ms -> path_stops {new:7.2f}ms  x{old / max(new, 1e-9):,.0f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.paths, args.runs)
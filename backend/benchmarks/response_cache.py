@@ -0,0 +1,74 @@
+"""
+Latency of repeated read-only questions with the response cache, and proof
+that a write to a table the answer read evicts it.
+
+Each question goes through the scripted fake model (two calls of --latency
+seconds: pick the tool, phrase the answer) on a miss. Every --write-every
+rounds a trip row is committed, which must evict the trip answers.
+
+    python seed.py
+    python -m benchmarks.response_cache --rounds 10 --latency 0.5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import agent.graph as agent_graph
+from agent.response_cache import response_cache
+from benchmarks.fakes import ScriptedChatModel
+from database.connection import SessionLocal
+from database.models import DailyTrip
+
+QUESTIONS = [
+    ("Could you check how Bulk - 00:01 is doing for me", "get_trip_status", {"trip_display_name": "Bulk - 00:01"}),
+    ("Which routes run on Path-1 these days", "find_routes_for_path", {"path_name": "Path-1"}),
+]
+
+
+def _touch_trip():
+    db = SessionLocal()
+    try:
+        trip = db.query(DailyTrip).filter(DailyTrip.display_name == "Bulk - 00:01").first()
+        trip.booking_status_percentage = trip.booking_status_percentage
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run(rounds: int, latency: float, write_every: int):
+    agent_graph.RESPONSE_CACHE_ENABLED = True
+    graph = agent_graph.create_movi_agent_graph()
+    config = {"configurable": {"current_page": "busDashboard"}}
+    response_cache.clear()
+    hits, misses = [], []
+    for round_number in range(rounds):
+        if write_every and round_number and round_number % write_every == 0:
+            _touch_trip()
+        for question, tool, args in QUESTIONS:
+            model = ScriptedChatModel(
+                script=[AIMessage(content="", tool_calls=[{"name": tool, "args": args, "id": "call_1"}])],
+                latency=latency,
+            )
+            agent_graph.ChatOpenAI = lambda **kwargs: model
+            agent_graph.get_model_with_tools.cache_clear()
+            started = time.perf_counter()
+            await graph.ainvoke({"messages": [HumanMessage(content=question)]}, config)
+            (misses if model.calls else hits).append(time.perf_counter() - started)
+
+    print(f"{len(QUESTIONS)} questions x {rounds} rounds, model latency {latency * 1000:.0f}ms, write every {write_every} rounds")
+    print(f"  miss p50 {statistics.median(misses) * 1000:8.1f}ms  ({len(misses)})")
+    if hits:
+        print(f"  hit  p50 {statistics.median(hits) * 1000:8.1f}ms  ({len(hits)})")
+    print(f"  stats {response_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--write-every", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds, args.latency, args.write_every))
@@ -0,0 +1,18 @@
+"""
+Helpers for running ASGI apps on a real local socket during benchmarks.
+httpx's in-process ASGITransport buffers whole responses, which hides
+streaming behaviour, so anything that measures time-to-first-byte uses this.
+"""
+import threading
+import time
+
+import uvicorn
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """Runs `app` with uvicorn on 127.0.0.1:`port` in a daemon thread and waits until it accepts connections."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
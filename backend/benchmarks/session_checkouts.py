@@ -0,0 +1,93 @@
+"""
+Connection-pool checkouts per agent turn with one scoped session per graph
+run versus a session per tool call (what the tools fall back to without a
+run scope), and the most pooled connections held while the model was being
+called.
+
+Both modes check out one connection per tool call: the run's session gives
+its connection back at every commit so that none is held while the model is
+thinking. Fewer checkouts would mean holding a connection through LLM
+latency, which starves the pool under concurrent conversations; the
+"held during model calls" column (zero for both) is what the scope trades
+the checkouts for.
+
+The scripted turn makes four tool steps, including a high-impact
+update_route_status that goes through check_consequences. A last run makes
+the model fail mid-turn to show the scoped connection is still returned.
+
+    python seed.py
+    python -m benchmarks.session_checkouts --turns 10
+"""
+import argparse
+import asyncio
+from contextlib import nullcontext
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage
+from sqlalchemy import event
+
+import agent.graph as agent_graph
+from agent.session import run_session_scope
+from benchmarks.fakes import ScriptedChatModel
+from database.connection import engine
+
+SCRIPT = [
+    AIMessage(content="", tool_calls=[{"name": "get_trip_status", "args": {"trip_display_name": "Bulk - 00:01"}, "id": "call_1"}]),
+    AIMessage(content="", tool_calls=[{"name": "get_deployment_details", "args": {"trip_display_name": "Bulk - 00:01"}, "id": "call_2"}]),
+    AIMessage(content="", tool_calls=[{"name": "find_routes_for_path", "args": {"path_name": "Path-1"}, "id": "call_3"}]),
+    AIMessage(content="", tool_calls=[{"name": "update_route_status", "args": {"route_display_name": "Path-1 - 00:01", "new_status": "active"}, "id": "call_4"}]),
+]
+
+
+class WatchingChatModel(ScriptedChatModel):
+    """Notes how many pooled connections are checked out at each model call."""
+    held: List[int] = []
+
+    def _next_message(self) -> AIMessage:
+        self.held.append(engine.pool.checkedout())
+        return super()._next_message()
+
+
+class FailingChatModel(ScriptedChatModel):
+    """Raises once the script runs out, as a dropped LLM connection would."""
+
+    def _next_message(self) -> AIMessage:
+        if self.calls >= len(self.script):
+            raise RuntimeError("LLM connection dropped")
+        return super()._next_message()
+
+
+async def _turn(graph, scoped: bool, model: ScriptedChatModel):
+    agent_graph.ChatOpenAI = lambda **kwargs: model
+    agent_graph.get_model_with_tools.cache_clear()
+    config = {"configurable": {}}
+    with run_session_scope(config) if scoped else nullcontext(config) as run_config:
+        await graph.ainvoke({"messages": [HumanMessage(content="Check Bulk - 00:01 and keep its route active")]}, run_config)
+
+
+async def run(turns: int):
+    graph = agent_graph.create_movi_agent_graph()
+    checkouts = []
+    event.listen(engine.pool, "checkout", lambda *args: checkouts.append(1))
+
+    print(f"{len(SCRIPT)} tool steps per turn, {turns} turns")
+    for label, scoped in (("session per tool call", False), ("session per run", True)):
+        checkouts.clear()
+        held = []
+        for _ in range(turns):
+            model = WatchingChatModel(script=SCRIPT)
+            await _turn(graph, scoped, model)
+            held += model.held
+        print(f"  {label:<22} {len(checkouts) / turns:5.1f} checkouts per turn  at most {max(held)} held during model calls")
+
+    try:
+        await _turn(graph, True, FailingChatModel(script=SCRIPT[:2]))
+    except RuntimeError as e:
+        print(f"  failing turn raised {e!r}; connections still checked out: {engine.pool.checkedout()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns))
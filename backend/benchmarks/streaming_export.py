@@ -0,0 +1,103 @@
+"""
+Peak memory of a full trips export built the old way versus streamed.
+
+The old way is what /trips/all did: load every DailyTrip as an ORM object,
+validate each into the Pydantic schema and serialize the list as one JSON
+body. The streamed export is database/exports.py: one yield_per query over a
+server-side cursor, written out as NDJSON (or CSV) one batch at a time.
+Both read a throwaway SQLite file (never the app database) through the async
+engine; peak Python allocations are measured with tracemalloc at each of
+--trips, so the growth of each approach with table size shows directly.
+
+    python -m benchmarks.streaming_export --trips 100000 400000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+from database.connection import make_async_engine, make_engine
+from database.exports import export_chunks, trips_export_query
+from database.models import Base, DailyTrip, Path, Route
+
+INSERT_BATCH = 50000
+ROUTES = 50
+
+
+def _build(trips: int) -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-export-"), "trips.db")
+    engine = make_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    first_day = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Path), [{"path_id": 1, "name": "Path 1", "ordered_stop_ids": ""}])
+        conn.execute(insert(Route), [
+            {"route_id": i, "path_id": 1, "display_name": f"Route {i}", "shift_time": "08:00"} for i in range(1, ROUTES + 1)
+        ])
+        for start in range(1, trips + 1, INSERT_BATCH):
+            conn.execute(insert(DailyTrip), [
+                {"trip_id": i, "route_id": i % ROUTES + 1, "display_name": f"Trip {i}", "trip_date": first_day + timedelta(days=i % 365),
+                 "live_status": "scheduled", "booking_status_percentage": i % 100}
+                for i in range(start, min(start + INSERT_BATCH, trips + 1))
+            ])
+    engine.dispose()
+    return path
+
+
+async def _whole_body(db: AsyncSession) -> int:
+    trips = (await db.scalars(select(DailyTrip))).all()
+    body = TypeAdapter(list[schemas.DailyTrip]).dump_json([schemas.DailyTrip.model_validate(trip) for trip in trips])
+    return len(body)
+
+
+async def _streamed(db: AsyncSession, fmt: str) -> int:
+    written = 0
+    async for chunk in export_chunks(db, trips_export_query(), fmt):
+        written += len(chunk)
+    return written
+
+
+async def _measure(engine, fn, *args):
+    async def once():
+        async with AsyncSession(engine) as db:
+            return await fn(db, *args)
+
+    started = time.perf_counter()
+    size = await once()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    await once()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def run(sizes):
+    for trips in sizes:
+        engine = make_async_engine(f"sqlite:///{_build(trips)}")
+        print(f"{trips} trips")
+        try:
+            for label, fn, args in (
+                ("list + one JSON body", _whole_body, ()),
+                ("streamed NDJSON", _streamed, ("ndjson",)),
+                ("streamed CSV", _streamed, ("csv",)),
+            ):
+                size, elapsed, peak = await _measure(engine, fn, *args)
+                print(f"  {label:<21} {size / 2**20:7.1f} MB out  {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MB")
+        finally:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, nargs="+", default=[100000, 400000])
+    args = parser.parse_args()
+    asyncio.run(run(args.trips))
@@ -0,0 +1,71 @@
+"""
+A minimal OpenAI-compatible chat completions server for offline benchmarks.
+
+It answers every request with the same short text reply after a fixed delay,
+streaming it as server-sent events when the client asks for `stream=true`.
+Point the agent at it with MOVI_LLM_BASE_URL=http://127.0.0.1:<port>/v1.
+
+    python -m benchmarks.stub_openai --port 8765 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+REPLY_WORDS = ["All", " vehicles", " are", " currently", " assigned", "."]
+
+
+def create_stub_app(latency: float = 0.05) -> FastAPI:
+    app = FastAPI()
+
+    def _chunk(delta: dict, finish_reason=None) -> str:
+        payload = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "stub",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        if not body.get("stream"):
+            return {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "stub",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(REPLY_WORDS)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": len(REPLY_WORDS), "total_tokens": 1 + len(REPLY_WORDS)},
+            }
+
+        async def events():
+            yield _chunk({"role": "assistant", "content": ""})
+            for word in REPLY_WORDS:
+                yield _chunk({"content": word})
+            yield _chunk({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.latency), host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,48 @@
+"""
+SQL statements issued per read-only agent tool, checked against a fixed
+budget so an N+1 lookup cannot creep back in. Exits non-zero on a breach.
+
+    python seed.py
+    python -m benchmarks.tool_queries
+"""
+import sys
+
+from sqlalchemy import event
+
+from agent.tools import (
+    find_routes_for_path, get_all_trips, get_deployment_details,
+    get_trip_status, get_unassigned_vehicles, list_stops_for_path,
+)
+from database.connection import engine
+
+# (tool, arguments, statements allowed)
+QUERY_BUDGETS = [
+    (get_trip_status, {"trip_display_name": "Bulk - 00:01"}, 1),
+    (get_trip_status, {"trip_display_name": "Path Path - 00:02"}, 1),
+    (get_deployment_details, {"trip_display_name": "Bulk - 00:01"}, 1),
+    (get_unassigned_vehicles, {}, 1),
+    (list_stops_for_path, {"path_name": "Path-1"}, 2),
+    (find_routes_for_path, {"path_name": "Path-1"}, 2),
+    (get_all_trips, {}, 1),
+]
+
+
+def run() -> bool:
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    ok = True
+    try:
+        for tool, arguments, budget in QUERY_BUDGETS:
+            statements.clear()
+            tool.invoke(arguments)
+            passed = len(statements) <= budget
+            ok = ok and passed
+            print(f"  {'ok  ' if passed else 'FAIL'} {tool.name:<26} {len(statements)} statement(s), budget {budget}  {arguments}")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
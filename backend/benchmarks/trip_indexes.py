@@ -0,0 +1,106 @@
+"""
+Query plans and latency of the hot trip, route and driver lookups at 1M
+trips, before and after the index migrations in database/migrations.py.
+
+Builds a throwaway SQLite file (never the app database), drops the lookup
+indexes to get the old schema, measures, runs the migrations and measures
+again.
+
+    python -m benchmarks.trip_indexes --trips 1000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+
+from database.migrations import MIGRATIONS, drop_indexes, run_migrations
+from database.models import Base, DailyTrip, Driver, Path, Route
+
+ROUTES = 2000
+DRIVERS = 20000
+STATUSES = ["scheduled", "in_progress", "completed", "cancelled"]
+FIRST_DAY = datetime(2025, 1, 1)
+
+QUERIES = {
+    "trip by display_name": ("SELECT * FROM daily_trips WHERE display_name = :name", {"name": "Trip 654321"}),
+    "trips by live_status": ("SELECT count(*) FROM daily_trips WHERE live_status = :status", {"status": "in_progress"}),
+    "trips by route + status": ("SELECT * FROM daily_trips WHERE route_id = :route AND live_status = :status", {"route": 77, "status": "scheduled"}),
+    "trips by route": ("SELECT count(*) FROM daily_trips WHERE route_id = :route", {"route": 77}),
+    "trips on day + status": (
+        "SELECT * FROM daily_trips WHERE trip_date >= :start AND trip_date < :end AND live_status = :status",
+        {"start": FIRST_DAY + timedelta(days=100), "end": FIRST_DAY + timedelta(days=101), "status": "scheduled"},
+    ),
+    "route by display_name": ("SELECT * FROM routes WHERE display_name = :name", {"name": "Route 1234 - 08:30"}),
+    "routes by status": ("SELECT count(*) FROM routes WHERE status = 'deactivated'", {}),
+    "routes by path": ("SELECT * FROM routes WHERE path_id = :path", {"path": 12}),
+    "driver by name": ("SELECT * FROM drivers WHERE name = :name", {"name": "Driver 4321"}),
+}
+
+
+def _build(trips: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-indexes-"), "trips.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Path), [{"path_id": i, "name": f"Path {i}", "ordered_stop_ids": "1,2"} for i in range(1, 101)])
+        conn.execute(insert(Route), [
+            {"route_id": i, "path_id": i % 100 + 1, "display_name": f"Route {i} - 08:30", "shift_time": "08:30",
+             "status": "deactivated" if i % 10 == 0 else "active"}
+            for i in range(1, ROUTES + 1)
+        ])
+        conn.execute(insert(Driver), [{"driver_id": i, "name": f"Driver {i}", "phone_number": f"{i:010d}"} for i in range(1, DRIVERS + 1)])
+        batch = 100000
+        for offset in range(0, trips, batch):
+            conn.execute(insert(DailyTrip), [
+                {"trip_id": i, "route_id": i % ROUTES + 1, "display_name": f"Trip {i}",
+                 "trip_date": FIRST_DAY + timedelta(days=i % 365, minutes=i % 1440),
+                 "booking_status_percentage": i % 101, "live_status": STATUSES[i % len(STATUSES)]}
+                for i in range(offset + 1, min(offset + batch, trips) + 1)
+            ])
+    # Start from the schema before the migrations: no lookup indexes at all.
+    with engine.begin() as conn:
+        drop_indexes(conn, *[index.name for table in Base.metadata.tables.values() for index in table.indexes])
+    return engine
+
+
+def _measure(engine, runs: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for label, (sql, params) in QUERIES.items():
+            plan = " / ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params))
+            samples = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                conn.execute(text(sql), params).all()
+                samples.append(time.perf_counter() - started)
+            results[label] = (statistics.median(samples), plan)
+    return results
+
+
+def run(trips: int, runs: int):
+    started = time.perf_counter()
+    engine = _build(trips)
+    print(f"{trips} trips, {ROUTES} routes, {DRIVERS} drivers (built in {time.perf_counter() - started:.1f}s)")
+    before = _measure(engine, runs)
+    started = time.perf_counter()
+    applied = run_migrations(engine)
+    print(f"migrations {applied} of {len(MIGRATIONS)} applied in {time.perf_counter() - started:.1f}s")
+    after = _measure(engine, runs)
+    for label in QUERIES:
+        (old, old_plan), (new, new_plan) = before[label], after[label]
+        print(f"  {label:<24} {old * 1000:9.2f}ms -> {new * 1000:7.2f}ms  x{old / max(new, 1e-9):,.0f}")
+        print(f"      before: {old_plan}")
+        print(f"      after:  {new_plan}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.trips, args.runs)
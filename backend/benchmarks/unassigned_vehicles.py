@@ -0,0 +1,77 @@
+"""
+Unassigned-vehicle lookup on a synthetic fleet: the old approach (load every
+Deployment, send the ids back in NOT IN (...)) versus the NOT EXISTS
+anti-join, in wall clock and Python memory.
+
+Runs against a throwaway SQLite file, never the app database. On SQLite
+builds with a lower bound-parameter limit (999 before 3.32, 32766 after),
+the old query fails outright once there are more deployments than that.
+
+    python -m benchmarks.unassigned_vehicles --vehicles 20000 40000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, DailyTrip, Deployment, Driver, Vehicle
+from database.queries import not_deployed_in_window
+
+
+def _build_fleet(vehicles: int, free: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="movi-fleet-"), "fleet.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    deployed = vehicles - free
+    with engine.begin() as conn:
+        conn.execute(insert(Vehicle), [{"vehicle_id": i, "license_plate": f"KA-{i:06d}", "type": "Cab", "capacity": 4} for i in range(1, vehicles + 1)])
+        conn.execute(insert(Driver), [{"driver_id": 1, "name": "Driver", "phone_number": "0"}])
+        conn.execute(insert(DailyTrip), [{"trip_id": i, "display_name": f"Trip {i}", "live_status": "scheduled"} for i in range(1, deployed + 1)])
+        conn.execute(insert(Deployment), [{"trip_id": i, "vehicle_id": i, "driver_id": 1} for i in range(1, deployed + 1)])
+    return engine, sessionmaker(bind=engine)
+
+
+def _old_lookup(db):
+    assigned_vehicle_ids = [d.vehicle_id for d in db.query(Deployment).all()]
+    return db.query(Vehicle).filter(Vehicle.vehicle_id.notin_(assigned_vehicle_ids)).all()
+
+
+def _anti_join_lookup(db):
+    return db.query(Vehicle.license_plate).filter(not_deployed_in_window(Deployment.vehicle_id, Vehicle.vehicle_id)).all()
+
+
+def _measure(session_factory, lookup):
+    db = session_factory()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        found = len(lookup(db))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        return f"{elapsed * 1000:8.1f}ms {peak / 2**20:7.1f} MiB  ({found} free)"
+    except Exception as e:
+        return f"failed: {type(e).__name__}: {str(e).splitlines()[0][:60]}"
+    finally:
+        tracemalloc.stop()
+        db.close()
+
+
+def run(fleet_sizes: list, free: int):
+    for vehicles in fleet_sizes:
+        engine, session_factory = _build_fleet(vehicles, free)
+        print(f"{vehicles} vehicles, {vehicles - free} deployed")
+        print(f"  load + NOT IN     {_measure(session_factory, _old_lookup)}")
+        print(f"  NOT EXISTS        {_measure(session_factory, _anti_join_lookup)}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[20000, 40000])
+    parser.add_argument("--free", type=int, default=100)
+    args = parser.parse_args()
+    run(args.vehicles, args.free)
@@ -1,3 +1,3 @@
-from . import vehicle, driver, stop, path, route
-
+# Submodules are imported on use (`import crud.route`), so one module's
+# dependencies never stop another from loading.
 __all__ = ["vehicle", "driver", "stop", "path", "route"]
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from backend.database.models import DailyTrip, Route, Deployment
+from backend.database.bulk import delete_trips_by_id, delete_trips_where, update_status_by_id
+from backend.database.queries import keyset_page
 from schemas import DailyTripCreate
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 # ----------------------------
@@ -34,22 +36,24 @@ def create_daily_trip(db: Session, trip: DailyTripCreate) -> DailyTrip:
 def create_bulk_daily_trips(db: Session, trips: List[DailyTripCreate]) -> List[DailyTrip]:
     """
     Create multiple daily trips at once.
+    The batch's routes are validated with one IN query. To create a whole
+    day's trips from the routes, see database/trip_generation.py.
     """
-    db_trips = []
+    route_ids = {trip.route_id for trip in trips}
+    known_routes = set(db.scalars(select(Route.route_id).where(Route.route_id.in_(route_ids))))
     for trip in trips:
-        # Validate route exists
-        route = db.query(Route).filter(Route.route_id == trip.route_id).first()
-        if not route:
+        if trip.route_id not in known_routes:
             raise ValueError(f"Route with id {trip.route_id} does not exist")
-        
-        db_trip = DailyTrip(
+
+    db_trips = [
+        DailyTrip(
             route_id=trip.route_id,
             display_name=trip.display_name,
             booking_status_percentage=trip.booking_status_percentage,
             live_status=trip.live_status
         )
-        db_trips.append(db_trip)
-    
+        for trip in trips
+    ]
     db.add_all(db_trips)
     db.commit()
     for trip in db_trips:
@@ -68,11 +72,11 @@ def get_daily_trip_by_id(db: Session, trip_id: int) -> Optional[DailyTrip]:
     return db.query(DailyTrip).filter(DailyTrip.trip_id == trip_id).first()
 
 
-def get_all_daily_trips(db: Session, skip: int = 0, limit: int = 100) -> List[DailyTrip]:
+def get_all_daily_trips(db: Session, after_id: Optional[int] = None, limit: int = 100) -> List[DailyTrip]:
     """
     Get all daily trips with pagination.
     """
-    return db.query(DailyTrip).offset(skip).limit(limit).all()
+    return keyset_page(db.query(DailyTrip), DailyTrip.trip_id, after_id, limit).all()
 
 
 def get_daily_trips_by_route(db: Session, route_id: int) -> List[DailyTrip]:
@@ -234,19 +238,12 @@ def bulk_update_live_status(
     db: Session, 
     trip_ids: List[int], 
     live_status: str
-) -> int:
+) -> List[Tuple[int, str]]:
     """
-    Update live status for multiple trips at once.
-    Returns the number of updated trips.
+    Update live status for multiple trips at once, in chunks.
+    Returns (trip_id, previous live status) for each trip that changed.
     """
-    count = db.query(DailyTrip).filter(
-        DailyTrip.trip_id.in_(trip_ids)
-    ).update(
-        {DailyTrip.live_status: live_status},
-        synchronize_session=False
-    )
-    db.commit()
-    return count
+    return update_status_by_id(db, DailyTrip.live_status, trip_ids, live_status)
 
 
 # ----------------------------
@@ -255,46 +252,30 @@ def bulk_update_live_status(
 
 def delete_daily_trip(db: Session, trip_id: int) -> bool:
     """
-    Delete a daily trip by ID.
-    Note: This will cascade delete related deployments.
+    Delete a daily trip by ID, together with its deployments.
     """
-    db_trip = db.query(DailyTrip).filter(DailyTrip.trip_id == trip_id).first()
-    if not db_trip:
-        return False
-    
-    db.delete(db_trip)
-    db.commit()
-    return True
+    return delete_trips_by_id(db, [trip_id]) > 0
 
 
 def delete_daily_trips_by_route(db: Session, route_id: int) -> int:
     """
-    Delete all daily trips for a specific route.
+    Delete all daily trips for a specific route, with their deployments.
     Returns the number of deleted trips.
     """
-    count = db.query(DailyTrip).filter(DailyTrip.route_id == route_id).count()
-    db.query(DailyTrip).filter(DailyTrip.route_id == route_id).delete(synchronize_session=False)
-    db.commit()
-    return count
+    return delete_trips_where(db, DailyTrip.route_id == route_id)
 
 
 def delete_daily_trips_by_status(db: Session, live_status: str) -> int:
     """
-    Delete all daily trips with a specific live status.
+    Delete all daily trips with a specific live status, with their deployments.
     Returns the number of deleted trips.
     """
-    count = db.query(DailyTrip).filter(DailyTrip.live_status == live_status).count()
-    db.query(DailyTrip).filter(DailyTrip.live_status == live_status).delete(synchronize_session=False)
-    db.commit()
-    return count
+    return delete_trips_where(db, DailyTrip.live_status == live_status)
 
 
 def bulk_delete_daily_trips(db: Session, trip_ids: List[int]) -> int:
     """
-    Delete multiple daily trips by their IDs.
+    Delete multiple daily trips by their IDs, with their deployments.
     Returns the number of deleted trips.
     """
-    count = db.query(DailyTrip).filter(DailyTrip.trip_id.in_(trip_ids)).count()
-    db.query(DailyTrip).filter(DailyTrip.trip_id.in_(trip_ids)).delete(synchronize_session=False)
-    db.commit()
-    return count
+    return delete_trips_by_id(db, trip_ids)
@@ -1,8 +1,12 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from backend.database.models import Deployment, DailyTrip, Vehicle, Driver
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from database.models import Deployment, DailyTrip, Vehicle, Driver
+from database.bulk import delete_deployments_by_id
+from database.queries import available_drivers_query, available_vehicles_query, day_window, keyset_page
 from schemas import DeploymentCreate
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 # ----------------------------
@@ -61,37 +65,60 @@ def create_deployment(db: Session, deployment: DeploymentCreate) -> Deployment:
     return db_deployment
 
 
-def create_bulk_deployments(db: Session, deployments: List[DeploymentCreate]) -> List[Deployment]:
+def create_bulk_deployments(db: Session, deployments: List[DeploymentCreate]) -> Tuple[List[Row], List[dict]]:
     """
     Create multiple deployments at once.
-    """
-    db_deployments = []
-    for deployment in deployments:
-        # Validate trip, vehicle, and driver exist
-        trip = db.query(DailyTrip).filter(DailyTrip.trip_id == deployment.trip_id).first()
-        if not trip:
-            raise ValueError(f"Trip with id {deployment.trip_id} does not exist")
-        
-        vehicle = db.query(Vehicle).filter(Vehicle.vehicle_id == deployment.vehicle_id).first()
-        if not vehicle:
-            raise ValueError(f"Vehicle with id {deployment.vehicle_id} does not exist")
-        
-        driver = db.query(Driver).filter(Driver.driver_id == deployment.driver_id).first()
-        if not driver:
-            raise ValueError(f"Driver with id {deployment.driver_id} does not exist")
-        
-        db_deployment = Deployment(
-            trip_id=deployment.trip_id,
-            vehicle_id=deployment.vehicle_id,
-            driver_id=deployment.driver_id
-        )
-        db_deployments.append(db_deployment)
-    
-    db.add_all(db_deployments)
-    db.commit()
-    for deployment in db_deployments:
-        db.refresh(deployment)
-    return db_deployments
+    The whole batch is validated in one pass: one IN query each for its
+    trips, vehicles and drivers, and one for trips that are already deployed.
+    Rows that fail are skipped and reported as {"index", "trip_id", "error"};
+    the rest go in as one INSERT ... RETURNING.
+    Returns (created rows, errors). Raises IntegrityError, with nothing
+    inserted, if another request deployed one of the trips in between.
+    """
+    trip_ids = {deployment.trip_id for deployment in deployments}
+    vehicle_ids = {deployment.vehicle_id for deployment in deployments}
+    driver_ids = {deployment.driver_id for deployment in deployments}
+    known_trips = set(db.scalars(select(DailyTrip.trip_id).where(DailyTrip.trip_id.in_(trip_ids))))
+    known_vehicles = set(db.scalars(select(Vehicle.vehicle_id).where(Vehicle.vehicle_id.in_(vehicle_ids))))
+    known_drivers = set(db.scalars(select(Driver.driver_id).where(Driver.driver_id.in_(driver_ids))))
+    # A trip holds one deployment (deployments.trip_id is unique).
+    deployed_trips = set(db.scalars(select(Deployment.trip_id).where(Deployment.trip_id.in_(trip_ids))))
+
+    rows, errors = [], []
+    for index, deployment in enumerate(deployments):
+        if deployment.trip_id not in known_trips:
+            error = f"Trip with id {deployment.trip_id} does not exist"
+        elif deployment.vehicle_id not in known_vehicles:
+            error = f"Vehicle with id {deployment.vehicle_id} does not exist"
+        elif deployment.driver_id not in known_drivers:
+            error = f"Driver with id {deployment.driver_id} does not exist"
+        elif deployment.trip_id in deployed_trips:
+            error = f"Trip {deployment.trip_id} already has a deployment"
+        else:
+            error = None
+        if error:
+            errors.append({"index": index, "trip_id": deployment.trip_id, "error": error})
+            continue
+        # Later rows for the same trip conflict with this one.
+        deployed_trips.add(deployment.trip_id)
+        rows.append({"trip_id": deployment.trip_id, "vehicle_id": deployment.vehicle_id, "driver_id": deployment.driver_id})
+
+    created = []
+    if rows:
+        # Plain rows rather than ORM objects: nothing to expire on commit and
+        # refresh one by one afterwards.
+        try:
+            created = db.execute(
+                insert(Deployment).returning(
+                    Deployment.deployment_id, Deployment.trip_id, Deployment.vehicle_id, Deployment.driver_id
+                ),
+                rows,
+            ).all()
+        except IntegrityError:
+            db.rollback()
+            raise
+        db.commit()
+    return created, errors
 
 
 # ----------------------------
@@ -105,11 +132,11 @@ def get_deployment_by_id(db: Session, deployment_id: int) -> Optional[Deployment
     return db.query(Deployment).filter(Deployment.deployment_id == deployment_id).first()
 
 
-def get_all_deployments(db: Session, skip: int = 0, limit: int = 100) -> List[Deployment]:
+def get_all_deployments(db: Session, after_id: Optional[int] = None, limit: int = 100) -> List[Deployment]:
     """
     Get all deployments with pagination.
     """
-    return db.query(Deployment).offset(skip).limit(limit).all()
+    return keyset_page(db.query(Deployment), Deployment.deployment_id, after_id, limit).all()
 
 
 def get_deployments_by_trip(db: Session, trip_id: int) -> List[Deployment]:
@@ -193,30 +220,26 @@ def check_driver_availability(db: Session, driver_id: int, trip_id: int) -> bool
 
 def get_available_vehicles_for_trip(db: Session, trip_id: int) -> List[Vehicle]:
     """
-    Get all vehicles that are not yet deployed to a specific trip.
+    Get all vehicles that are not deployed to any trip on the same day as the
+    given trip (including the trip itself), using a NOT EXISTS anti-join.
     """
-    deployed_vehicle_ids = db.query(Deployment.vehicle_id).filter(
-        Deployment.trip_id == trip_id
-    ).all()
-    deployed_ids = [vid[0] for vid in deployed_vehicle_ids]
-    
-    return db.query(Vehicle).filter(
-        Vehicle.vehicle_id.notin_(deployed_ids)
-    ).all()
+    trip = db.query(DailyTrip.trip_date).filter(DailyTrip.trip_id == trip_id).first()
+    if not trip:
+        return []
+    start, end = day_window(trip.trip_date)
+    return db.scalars(available_vehicles_query(start, end)).all()
 
 
 def get_available_drivers_for_trip(db: Session, trip_id: int) -> List[Driver]:
     """
-    Get all drivers that are not yet deployed to a specific trip.
+    Get all drivers that are not deployed to any trip on the same day as the
+    given trip (including the trip itself), using a NOT EXISTS anti-join.
     """
-    deployed_driver_ids = db.query(Deployment.driver_id).filter(
-        Deployment.trip_id == trip_id
-    ).all()
-    deployed_ids = [did[0] for did in deployed_driver_ids]
-    
-    return db.query(Driver).filter(
-        Driver.driver_id.notin_(deployed_ids)
-    ).all()
+    trip = db.query(DailyTrip.trip_date).filter(DailyTrip.trip_id == trip_id).first()
+    if not trip:
+        return []
+    start, end = day_window(trip.trip_date)
+    return db.scalars(available_drivers_query(start, end)).all()
 
 
 def get_deployment_count_by_trip(db: Session, trip_id: int) -> int:
@@ -420,8 +443,7 @@ def delete_deployments_by_trip(db: Session, trip_id: int) -> int:
     Delete all deployments for a specific trip.
     Returns the number of deleted deployments.
     """
-    count = db.query(Deployment).filter(Deployment.trip_id == trip_id).count()
-    db.query(Deployment).filter(Deployment.trip_id == trip_id).delete(synchronize_session=False)
+    count = db.query(Deployment).filter(Deployment.trip_id == trip_id).delete(synchronize_session=False)
     db.commit()
     return count
 
@@ -431,8 +453,7 @@ def delete_deployments_by_vehicle(db: Session, vehicle_id: int) -> int:
     Delete all deployments for a specific vehicle.
     Returns the number of deleted deployments.
     """
-    count = db.query(Deployment).filter(Deployment.vehicle_id == vehicle_id).count()
-    db.query(Deployment).filter(Deployment.vehicle_id == vehicle_id).delete(synchronize_session=False)
+    count = db.query(Deployment).filter(Deployment.vehicle_id == vehicle_id).delete(synchronize_session=False)
     db.commit()
     return count
 
@@ -442,8 +463,7 @@ def delete_deployments_by_driver(db: Session, driver_id: int) -> int:
     Delete all deployments for a specific driver.
     Returns the number of deleted deployments.
     """
-    count = db.query(Deployment).filter(Deployment.driver_id == driver_id).count()
-    db.query(Deployment).filter(Deployment.driver_id == driver_id).delete(synchronize_session=False)
+    count = db.query(Deployment).filter(Deployment.driver_id == driver_id).delete(synchronize_session=False)
     db.commit()
     return count
 
@@ -453,7 +473,4 @@ def bulk_delete_deployments(db: Session, deployment_ids: List[int]) -> int:
     Delete multiple deployments by their IDs.
     Returns the number of deleted deployments.
     """
-    count = db.query(Deployment).filter(Deployment.deployment_id.in_(deployment_ids)).count()
-    db.query(Deployment).filter(Deployment.deployment_id.in_(deployment_ids)).delete(synchronize_session=False)
-    db.commit()
-    return count
+    return delete_deployments_by_id(db, deployment_ids)
@@ -1,9 +1,11 @@
 """
 CRUD operations for Driver model
 """
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from backend.database.models import Driver
+from backend.database.queries import available_drivers_query, day_window, iter_keyset, keyset_page
 from schemas import DriverCreate, DriverResponse
 
 
@@ -58,7 +60,7 @@ def get_driver_by_phone(db: Session, phone_number: str) -> Optional[Driver]:
 
 def get_drivers(
     db: Session, 
-    skip: int = 0, 
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Driver]:
     """
@@ -66,13 +68,13 @@ def get_drivers(
     
     Args:
         db: Database session
-        skip: Number of records to skip (for pagination)
+        after_id: Last driver_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Driver objects
     """
-    return db.query(Driver).offset(skip).limit(limit).all()
+    return keyset_page(db.query(Driver), Driver.driver_id, after_id, limit).all()
 
 
 def get_all_drivers(db: Session) -> List[Driver]:
@@ -88,20 +90,55 @@ def get_all_drivers(db: Session) -> List[Driver]:
     return db.query(Driver).all()
 
 
-def get_available_drivers(db: Session) -> List[Driver]:
+def get_available_drivers(
+    db: Session,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: int = 100
+) -> List[Driver]:
     """
-    Get all drivers that are not currently deployed (not assigned to any trip).
-    This would need to be joined with Deployment table to check availability.
-    For now, returns all drivers - can be enhanced later.
+    Get one page of drivers with no deployment on a trip on `day` (and, if
+    given, in the `shift_time` shift). Without a day or shift, drivers with
+    no deployment at all. Pages are keyset-based: pass the last driver_id of
+    the previous page as `after_id`.
     
     Args:
         db: Database session
+        day: Calendar day to check; its time of day is ignored
+        shift_time: Route shift, e.g. "08:30"
+        after_id: Last driver_id of the previous page
+        limit: Maximum number of drivers to return
         
     Returns:
-        List of available Driver objects
+        List of available Driver objects, ordered by driver_id
     """
-    # TODO: Add logic to check deployments and filter out assigned drivers
-    return db.query(Driver).all()
+    start, end = day_window(day)
+    query = available_drivers_query(start, end, shift_time)
+    return db.scalars(keyset_page(query, Driver.driver_id, after_id, limit)).all()
+
+
+def iter_available_drivers(
+    db: Session,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    chunk_size: int = 1000
+) -> Iterator[Driver]:
+    """
+    Yield every available driver, fetching `chunk_size` at a time so memory
+    stays flat however large the roster is.
+    
+    Args:
+        db: Database session
+        day: Calendar day to check; its time of day is ignored
+        shift_time: Route shift, e.g. "08:30"
+        chunk_size: Drivers fetched per query
+        
+    Returns:
+        Iterator of available Driver objects, ordered by driver_id
+    """
+    start, end = day_window(day)
+    return iter_keyset(db, available_drivers_query(start, end, shift_time), Driver.driver_id, chunk_size)
 
 
 def update_driver(
@@ -201,7 +238,7 @@ def get_driver_count(db: Session) -> int:
 def search_drivers(
     db: Session, 
     search_term: str,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Driver]:
     """
@@ -210,26 +247,24 @@ def search_drivers(
     Args:
         db: Database session
         search_term: Search string to match against name or phone
-        skip: Number of records to skip
+        after_id: Last driver_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of matching Driver objects
     """
-    return db.query(Driver)\
+    query = db.query(Driver)\
         .filter(
             (Driver.name.ilike(f"%{search_term}%")) | 
             (Driver.phone_number.ilike(f"%{search_term}%"))
-        )\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+        )
+    return keyset_page(query, Driver.driver_id, after_id, limit).all()
 
 
 def search_drivers_by_name(
     db: Session,
     name: str,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Driver]:
     """
@@ -238,17 +273,15 @@ def search_drivers_by_name(
     Args:
         db: Database session
         name: Name to search for
-        skip: Number of records to skip
+        after_id: Last driver_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of matching Driver objects
     """
-    return db.query(Driver)\
-        .filter(Driver.name.ilike(f"%{name}%"))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = db.query(Driver)\
+        .filter(Driver.name.ilike(f"%{name}%"))
+    return keyset_page(query, Driver.driver_id, after_id, limit).all()
 
 
 def check_driver_exists(db: Session, driver_id: int) -> bool:
@@ -317,7 +350,7 @@ def bulk_create_drivers(db: Session, drivers: List[DriverCreate]) -> List[Driver
 def get_drivers_sorted_by_name(
     db: Session,
     ascending: bool = True,
-    skip: int = 0,
+    after: Optional[Tuple[str, int]] = None,
     limit: int = 100
 ) -> List[Driver]:
     """
@@ -326,17 +359,11 @@ def get_drivers_sorted_by_name(
     Args:
         db: Database session
         ascending: Sort in ascending order if True, descending if False
-        skip: Number of records to skip
+        after: (name, driver_id) of the last row of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Driver objects sorted by name
     """
     query = db.query(Driver)
-    
-    if ascending:
-        query = query.order_by(Driver.name.asc())
-    else:
-        query = query.order_by(Driver.name.desc())
-    
-    return query.offset(skip).limit(limit).all()
+    return keyset_page(query, (Driver.name, Driver.driver_id), after, limit, descending=not ascending).all()
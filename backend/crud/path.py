@@ -1,12 +1,32 @@
 """
 CRUD operations for Path model
 """
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from backend.database.models import Path, PathStop, Stop
+from backend.database.queries import keyset_page, paths_containing_stop_query
 from schemas import PathCreate, PathResponse, PathStopBase
 
 
+def _sync_ordered_stop_ids(db: Session, db_path: Path) -> None:
+    """
+    Rewrite the path's ordered_stop_ids from its path_stops rows, in stop order,
+    so the comma-separated copy never drifts from the rows it mirrors.
+    
+    Args:
+        db: Database session
+        db_path: Path whose stops were just written
+    """
+    db.flush()
+    stop_ids = db.scalars(
+        select(PathStop.stop_id)
+        .where(PathStop.path_id == db_path.path_id)
+        .order_by(PathStop.stop_order)
+    ).all()
+    db_path.ordered_stop_ids = ",".join(str(stop_id) for stop_id in stop_ids)
+
+
 def create_path(db: Session, path: PathCreate) -> Path:
     """
     Create a new path with ordered stops.
@@ -18,7 +38,7 @@ def create_path(db: Session, path: PathCreate) -> Path:
     Returns:
         Created Path object with stops
     """
-    db_path = Path(path_name=path.path_name)
+    db_path = Path(name=path.path_name, ordered_stop_ids="")
     db.add(db_path)
     db.flush()
     
@@ -31,6 +51,7 @@ def create_path(db: Session, path: PathCreate) -> Path:
         )
         db.add(path_stop)
     
+    _sync_ordered_stop_ids(db, db_path)
     db.commit()
     db.refresh(db_path)
     return db_path
@@ -61,12 +82,12 @@ def get_path_by_name(db: Session, path_name: str) -> Optional[Path]:
     Returns:
         Path object if found, None otherwise
     """
-    return db.query(Path).filter(Path.path_name == path_name).first()
+    return db.query(Path).filter(Path.name == path_name).first()
 
 
 def get_paths(
     db: Session, 
-    skip: int = 0, 
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Path]:
     """
@@ -74,13 +95,13 @@ def get_paths(
     
     Args:
         db: Database session
-        skip: Number of records to skip (for pagination)
+        after_id: Last path_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Path objects
     """
-    return db.query(Path).offset(skip).limit(limit).all()
+    return keyset_page(db.query(Path), Path.path_id, after_id, limit).all()
 
 
 def get_all_paths(db: Session) -> List[Path]:
@@ -116,7 +137,7 @@ def update_path(
     
     if db_path:
         # Update path name
-        db_path.path_name = path_update.path_name
+        db_path.name = path_update.path_name
         
         # Delete existing path stops
         db.query(PathStop).filter(PathStop.path_id == path_id).delete()
@@ -130,6 +151,7 @@ def update_path(
             )
             db.add(path_stop)
         
+        _sync_ordered_stop_ids(db, db_path)
         db.commit()
         db.refresh(db_path)
     
@@ -173,7 +195,7 @@ def get_path_count(db: Session) -> int:
 def search_paths(
     db: Session, 
     search_term: str,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Path]:
     """
@@ -182,17 +204,15 @@ def search_paths(
     Args:
         db: Database session
         search_term: Search string to match against path name
-        skip: Number of records to skip
+        after_id: Last path_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of matching Path objects
     """
-    return db.query(Path)\
-        .filter(Path.path_name.ilike(f"%{search_term}%"))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = db.query(Path)\
+        .filter(Path.name.ilike(f"%{search_term}%"))
+    return keyset_page(query, Path.path_id, after_id, limit).all()
 
 
 def get_path_stops_ordered(db: Session, path_id: int) -> List[tuple]:
@@ -238,11 +258,7 @@ def get_paths_containing_stop(db: Session, stop_id: int) -> List[Path]:
     Returns:
         List of Path objects containing the stop
     """
-    return db.query(Path)\
-        .join(PathStop)\
-        .filter(PathStop.stop_id == stop_id)\
-        .distinct()\
-        .all()
+    return db.scalars(paths_containing_stop_query(stop_id)).all()
 
 
 def get_paths_by_stop_count(
@@ -294,7 +310,8 @@ def add_stop_to_path(
     Returns:
         Created PathStop object if successful, None otherwise
     """
-    if not check_path_exists(db, path_id):
+    db_path = get_path(db, path_id)
+    if not db_path:
         return None
     
     path_stop = PathStop(
@@ -303,6 +320,7 @@ def add_stop_to_path(
         stop_order=stop_order
     )
     db.add(path_stop)
+    _sync_ordered_stop_ids(db, db_path)
     db.commit()
     db.refresh(path_stop)
     return path_stop
@@ -329,6 +347,9 @@ def remove_stop_from_path(
         .filter(PathStop.stop_id == stop_id)\
         .delete()
     
+    db_path = get_path(db, path_id)
+    if db_path:
+        _sync_ordered_stop_ids(db, db_path)
     db.commit()
     return result > 0
 
@@ -336,7 +357,7 @@ def remove_stop_from_path(
 def get_paths_sorted_by_name(
     db: Session,
     ascending: bool = True,
-    skip: int = 0,
+    after: Optional[Tuple[str, int]] = None,
     limit: int = 100
 ) -> List[Path]:
     """
@@ -345,17 +366,11 @@ def get_paths_sorted_by_name(
     Args:
         db: Database session
         ascending: Sort in ascending order if True, descending if False
-        skip: Number of records to skip
+        after: (name, path_id) of the last row of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Path objects sorted by name
     """
     query = db.query(Path)
-    
-    if ascending:
-        query = query.order_by(Path.path_name.asc())
-    else:
-        query = query.order_by(Path.path_name.desc())
-    
-    return query.offset(skip).limit(limit).all()
+    return keyset_page(query, (Path.name, Path.path_id), after, limit, descending=not ascending).all()
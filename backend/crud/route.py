@@ -1,9 +1,12 @@
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from backend.database.models import Route, Path, PathStop, Stop
+from sqlalchemy import and_, insert, select
+from database.models import Route, Path, PathStop, Stop, StatusEnum
+from database.bulk import delete_routes_by_id, update_status_by_id
+from database.queries import keyset_page, path_endpoints_query
 from schemas import RouteCreate, RouteStatus
 from datetime import time
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 # ----------------------------
@@ -39,14 +42,12 @@ def create_route(db: Session, route: RouteCreate) -> Route:
     # Create route with auto-populated start/end points
     db_route = Route(
         path_id=route.path_id,
-        route_display_name=route.route_display_name,
+        display_name=route.route_display_name,
         shift_time=route.shift_time,
         direction=route.direction,
         start_point=start_stop_name,
         end_point=end_stop_name,
-        capacity=route.capacity,
-        allocated_waitlist=route.allocated_waitlist,
-        status=route.status
+        status=StatusEnum(route.status)
     )
     
     db.add(db_route)
@@ -66,7 +67,7 @@ def get_route(db: Session, route_id: int) -> Optional[Route]:
 
 def get_all_routes(
     db: Session, 
-    skip: int = 0, 
+    after_id: Optional[int] = None,
     limit: int = 100,
     status: Optional[RouteStatus] = None
 ) -> List[Route]:
@@ -78,7 +79,7 @@ def get_all_routes(
     if status:
         query = query.filter(Route.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    return keyset_page(query, Route.route_id, after_id, limit).all()
 
 
 def get_routes_by_path(db: Session, path_id: int) -> List[Route]:
@@ -313,72 +314,57 @@ def update_route_waitlist(
 # ----------------------------
 
 def delete_route(db: Session, route_id: int) -> bool:
-    """Delete a route by ID. Returns True if deleted, False if not found."""
-    db_route = get_route(db, route_id)
-    if not db_route:
+    """Delete a route by ID. Returns True if deleted, False if not found. Raises ValueError while the route still has trips."""
+    if not get_route(db, route_id):
         return False
-    
-    db.delete(db_route)
-    db.commit()
+    if not delete_routes_by_id(db, [route_id]):
+        raise ValueError(f"Route {route_id} still has trips; delete them first")
     return True
 
 
 def delete_routes_by_path(db: Session, path_id: int) -> int:
-    """Delete all routes associated with a path. Returns count of deleted routes."""
-    count = db.query(Route).filter(Route.path_id == path_id).delete()
-    db.commit()
-    return count
+    """Delete all routes associated with a path that have no trips. Returns count of deleted routes."""
+    route_ids = db.scalars(select(Route.route_id).where(Route.path_id == path_id)).all()
+    return delete_routes_by_id(db, route_ids)
 
 
 # ----------------------------
 # BULK OPERATIONS
 # ----------------------------
 
-def bulk_create_routes(db: Session, routes: List[RouteCreate]) -> List[Route]:
+def bulk_create_routes(db: Session, routes: List[RouteCreate]) -> List[Row]:
     """
     Create multiple routes at once.
-    Auto-populates start_point and end_point for each route.
+    Auto-populates start_point and end_point for each route from one query
+    over the batch's distinct paths, then inserts every route in one
+    INSERT ... RETURNING. Nothing is inserted if any route is invalid.
     """
-    db_routes = []
-    
+    endpoints = {
+        row.path_id: row
+        for row in db.execute(path_endpoints_query({route.path_id for route in routes}))
+    }
+    rows = []
     for route in routes:
-        # Validate path exists
-        path = db.query(Path).filter(Path.path_id == route.path_id).first()
-        if not path:
+        path = endpoints.get(route.path_id)
+        if path is None:
             raise ValueError(f"Path with id {route.path_id} does not exist")
-        
-        # Get stops for the path
-        path_stops = (
-            db.query(PathStop, Stop)
-            .join(Stop, PathStop.stop_id == Stop.stop_id)
-            .filter(PathStop.path_id == route.path_id)
-            .order_by(PathStop.stop_order)
-            .all()
-        )
-        
-        if not path_stops or len(path_stops) < 2:
+        if path.stop_count < 2:
             raise ValueError(f"Path {route.path_id} must have at least 2 stops")
-        
-        # Create route with auto-populated start/end points
-        db_route = Route(
-            path_id=route.path_id,
-            route_display_name=route.route_display_name,
-            shift_time=route.shift_time,
-            direction=route.direction,
-            start_point=path_stops[0].Stop.name,
-            end_point=path_stops[-1].Stop.name,
-            capacity=route.capacity,
-            allocated_waitlist=route.allocated_waitlist,
-            status=route.status
-        )
-        db_routes.append(db_route)
-    
-    db.add_all(db_routes)
+        rows.append({
+            "path_id": route.path_id,
+            "display_name": route.route_display_name,
+            "shift_time": route.shift_time,
+            "direction": route.direction,
+            "start_point": path.start_point,
+            "end_point": path.end_point,
+            "status": StatusEnum(route.status),
+        })
+    if not rows:
+        return []
+
+    # Plain rows, so nothing has to be refreshed one by one after the commit.
+    db_routes = db.execute(insert(Route).returning(*Route.__table__.columns), rows).all()
     db.commit()
-    
-    for db_route in db_routes:
-        db.refresh(db_route)
-    
     return db_routes
 
 
@@ -386,13 +372,6 @@ def bulk_update_route_status(
     db: Session, 
     route_ids: List[int], 
     status: RouteStatus
-) -> int:
-    """Bulk update status for multiple routes. Returns count of updated routes."""
-    count = db.query(Route).filter(
-        Route.route_id.in_(route_ids)
-    ).update(
-        {Route.status: status},
-        synchronize_session=False
-    )
-    db.commit()
-    return count
+) -> List[Tuple[int, RouteStatus]]:
+    """Bulk update status for multiple routes, in chunks. Returns (route_id, previous status) for each route that changed."""
+    return update_status_by_id(db, Route.status, route_ids, status)
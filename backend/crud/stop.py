@@ -2,8 +2,9 @@
 CRUD operations for Stop model
 """
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from backend.database.models import Stop
+from backend.database.queries import keyset_page
 from schemas import StopCreate, StopResponse
 
 
@@ -59,7 +60,7 @@ def get_stop_by_name(db: Session, name: str) -> Optional[Stop]:
 
 def get_stops(
     db: Session, 
-    skip: int = 0, 
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Stop]:
     """
@@ -67,13 +68,13 @@ def get_stops(
     
     Args:
         db: Database session
-        skip: Number of records to skip (for pagination)
+        after_id: Last stop_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Stop objects
     """
-    return db.query(Stop).offset(skip).limit(limit).all()
+    return keyset_page(db.query(Stop), Stop.stop_id, after_id, limit).all()
 
 
 def get_all_stops(db: Session) -> List[Stop]:
@@ -155,7 +156,7 @@ def get_stop_count(db: Session) -> int:
 def search_stops(
     db: Session, 
     search_term: str,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Stop]:
     """
@@ -164,17 +165,15 @@ def search_stops(
     Args:
         db: Database session
         search_term: Search string to match against stop name
-        skip: Number of records to skip
+        after_id: Last stop_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of matching Stop objects
     """
-    return db.query(Stop)\
-        .filter(Stop.name.ilike(f"%{search_term}%"))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = db.query(Stop)\
+        .filter(Stop.name.ilike(f"%{search_term}%"))
+    return keyset_page(query, Stop.stop_id, after_id, limit).all()
 
 
 def get_stops_by_location(
@@ -251,7 +250,7 @@ def bulk_create_stops(db: Session, stops: List[StopCreate]) -> List[Stop]:
 def get_stops_sorted_by_name(
     db: Session,
     ascending: bool = True,
-    skip: int = 0,
+    after: Optional[Tuple[str, int]] = None,
     limit: int = 100
 ) -> List[Stop]:
     """
@@ -260,17 +259,11 @@ def get_stops_sorted_by_name(
     Args:
         db: Database session
         ascending: Sort in ascending order if True, descending if False
-        skip: Number of records to skip
+        after: (name, stop_id) of the last row of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of Stop objects sorted by name
     """
     query = db.query(Stop)
-    
-    if ascending:
-        query = query.order_by(Stop.name.asc())
-    else:
-        query = query.order_by(Stop.name.desc())
-    
-    return query.offset(skip).limit(limit).all()
+    return keyset_page(query, (Stop.name, Stop.stop_id), after, limit, descending=not ascending).all()
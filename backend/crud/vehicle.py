@@ -1,9 +1,11 @@
 """
 CRUD operations for Vehicle model
 """
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from backend.database.models import Vehicle, VehicleType
+from backend.database.queries import available_vehicles_query, day_window, iter_keyset, keyset_page
 from schemas import VehicleCreate, VehicleResponse
 
 
@@ -60,7 +62,7 @@ def get_vehicle_by_license_plate(db: Session, license_plate: str) -> Optional[Ve
 
 def get_vehicles(
     db: Session, 
-    skip: int = 0, 
+    after_id: Optional[int] = None,
     limit: int = 100,
     vehicle_type: Optional[VehicleType] = None
 ) -> List[Vehicle]:
@@ -69,7 +71,7 @@ def get_vehicles(
     
     Args:
         db: Database session
-        skip: Number of records to skip (for pagination)
+        after_id: Last vehicle_id of the previous page
         limit: Maximum number of records to return
         vehicle_type: Optional filter by vehicle type (Bus or Cab)
         
@@ -81,7 +83,7 @@ def get_vehicles(
     if vehicle_type:
         query = query.filter(Vehicle.type == vehicle_type)
     
-    return query.offset(skip).limit(limit).all()
+    return keyset_page(query, Vehicle.vehicle_id, after_id, limit).all()
 
 
 def get_all_vehicles(db: Session) -> List[Vehicle]:
@@ -111,26 +113,64 @@ def get_vehicles_by_type(db: Session, vehicle_type: VehicleType) -> List[Vehicle
     return db.query(Vehicle).filter(Vehicle.type == vehicle_type).all()
 
 
-def get_available_vehicles(db: Session, vehicle_type: Optional[VehicleType] = None) -> List[Vehicle]:
+def get_available_vehicles(
+    db: Session,
+    vehicle_type: Optional[VehicleType] = None,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: int = 100
+) -> List[Vehicle]:
     """
-    Get all vehicles that are not currently deployed (not assigned to any trip).
-    This would need to be joined with Deployment table to check availability.
-    For now, returns all vehicles - can be enhanced later.
+    Get one page of vehicles with no deployment on a trip on `day` (and, if
+    given, in the `shift_time` shift). Without a day or shift, vehicles with
+    no deployment at all. Pages are keyset-based: pass the last vehicle_id of
+    the previous page as `after_id`.
     
     Args:
         db: Database session
         vehicle_type: Optional filter by vehicle type
+        day: Calendar day to check; its time of day is ignored
+        shift_time: Route shift, e.g. "08:30"
+        after_id: Last vehicle_id of the previous page
+        limit: Maximum number of vehicles to return
         
     Returns:
-        List of available Vehicle objects
+        List of available Vehicle objects, ordered by vehicle_id
     """
-    # TODO: Add logic to check deployments and filter out assigned vehicles
-    query = db.query(Vehicle)
-    
+    start, end = day_window(day)
+    query = available_vehicles_query(start, end, shift_time)
     if vehicle_type:
-        query = query.filter(Vehicle.type == vehicle_type)
+        query = query.where(Vehicle.type == vehicle_type)
+    return db.scalars(keyset_page(query, Vehicle.vehicle_id, after_id, limit)).all()
+
+
+def iter_available_vehicles(
+    db: Session,
+    vehicle_type: Optional[VehicleType] = None,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    chunk_size: int = 1000
+) -> Iterator[Vehicle]:
+    """
+    Yield every available vehicle, fetching `chunk_size` at a time so memory
+    stays flat however large the fleet is.
     
-    return query.all()
+    Args:
+        db: Database session
+        vehicle_type: Optional filter by vehicle type
+        day: Calendar day to check; its time of day is ignored
+        shift_time: Route shift, e.g. "08:30"
+        chunk_size: Vehicles fetched per query
+        
+    Returns:
+        Iterator of available Vehicle objects, ordered by vehicle_id
+    """
+    start, end = day_window(day)
+    query = available_vehicles_query(start, end, shift_time)
+    if vehicle_type:
+        query = query.where(Vehicle.type == vehicle_type)
+    return iter_keyset(db, query, Vehicle.vehicle_id, chunk_size)
 
 
 def update_vehicle(
@@ -206,7 +246,7 @@ def get_vehicle_count(db: Session, vehicle_type: Optional[VehicleType] = None) -
 def search_vehicles(
     db: Session, 
     search_term: str,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100
 ) -> List[Vehicle]:
     """
@@ -215,17 +255,15 @@ def search_vehicles(
     Args:
         db: Database session
         search_term: Search string to match against license plate
-        skip: Number of records to skip
+        after_id: Last vehicle_id of the previous page
         limit: Maximum number of records to return
         
     Returns:
         List of matching Vehicle objects
     """
-    return db.query(Vehicle)\
-        .filter(Vehicle.license_plate.ilike(f"%{search_term}%"))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = db.query(Vehicle)\
+        .filter(Vehicle.license_plate.ilike(f"%{search_term}%"))
+    return keyset_page(query, Vehicle.vehicle_id, after_id, limit).all()
 
 
 def get_vehicles_by_capacity_range(
@@ -0,0 +1,114 @@
+"""
+Set-based bulk writes, run in chunks.
+
+Counts come from the rowcount of the DELETE itself, never from a separate
+COUNT(*) with the same filter, which would scan twice and miss rows inserted
+in between. Id lists are split into chunks of BULK_CHUNK_SIZE to stay under
+the database's bound-parameter limit, and each chunk commits on its own, so
+a large delete never holds the write lock for long. A trip is deleted in
+the same transaction as its deployments, so an interrupted delete never
+leaves a dependent row behind. Nothing cascades in the schema itself
+(SQLite does not enforce the foreign keys by default), so dependents are
+deleted here, children first. Routes are the exception: a route that still
+has trips (its dated history among them) is never deleted, and its trips
+have to be deleted explicitly first.
+
+Bulk status updates work the same way. Each chunk reads the current status
+of its rows (locking them where the database supports it), then updates the
+rows whose status differs with UPDATE ... RETURNING. Only rows that really
+changed are reported, with their previous status, and recorded as row
+changes (see database/versions.py) that are published when the chunk commits.
+"""
+import os
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import delete, exists, inspect, select, update
+from sqlalchemy.orm import Session
+
+from .models import DailyTrip, Deployment, Route
+from .versions import RowChange, record_row_changes
+
+BULK_CHUNK_SIZE = int(os.getenv("MOVI_BULK_CHUNK_SIZE", "500"))
+
+def chunked(ids: Iterable[int], size: int = BULK_CHUNK_SIZE) -> Iterator[List[int]]:
+    """The distinct `ids` in ascending lists of at most `size`."""
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+def delete_deployments_by_id(db: Session, deployment_ids: Iterable[int]) -> int:
+    """Deletes the given deployments; returns how many existed."""
+    deleted = 0
+    for chunk in chunked(deployment_ids):
+        deleted += db.execute(delete(Deployment).where(Deployment.deployment_id.in_(chunk))).rowcount
+        db.commit()
+    return deleted
+
+def _delete_trip_chunk(db: Session, trip_ids: List[int]) -> int:
+    db.execute(delete(Deployment).where(Deployment.trip_id.in_(trip_ids)))
+    deleted = db.execute(delete(DailyTrip).where(DailyTrip.trip_id.in_(trip_ids))).rowcount
+    db.commit()
+    return deleted
+
+def delete_trips_by_id(db: Session, trip_ids: Iterable[int]) -> int:
+    """Deletes the given trips and their deployments; returns how many trips existed."""
+    return sum(_delete_trip_chunk(db, chunk) for chunk in chunked(trip_ids))
+
+def delete_trips_where(db: Session, *conditions) -> int:
+    """
+    Deletes the trips matching `conditions` and their deployments; returns
+    how many trips were deleted. Ids are read one chunk at a time in key
+    order, so no list of every match is built first.
+    """
+    deleted, after_id = 0, None
+    while True:
+        query = select(DailyTrip.trip_id).where(*conditions)
+        if after_id is not None:
+            query = query.where(DailyTrip.trip_id > after_id)
+        trip_ids = db.scalars(query.order_by(DailyTrip.trip_id).limit(BULK_CHUNK_SIZE)).all()
+        if not trip_ids:
+            return deleted
+        deleted += _delete_trip_chunk(db, trip_ids)
+        after_id = trip_ids[-1]
+
+def delete_routes_by_id(db: Session, route_ids: Iterable[int]) -> int:
+    """
+    Deletes those of the given routes that have no trips left; returns how
+    many were deleted. Routes with trips are kept, checked in the DELETE
+    itself so a trip added meanwhile still protects its route.
+    """
+    deleted = 0
+    for chunk in chunked(route_ids):
+        deleted += db.execute(delete(Route).where(
+            Route.route_id.in_(chunk), ~exists().where(DailyTrip.route_id == Route.route_id)
+        )).rowcount
+        db.commit()
+    return deleted
+
+def update_status_by_id(db: Session, column, ids: Iterable[int], status) -> List[Tuple[int, Any]]:
+    """
+    Sets the status `column` (e.g. DailyTrip.live_status) to `status` on the
+    rows with the given primary keys. Returns (id, previous status) for each
+    row that changed; rows already at `status`, and unknown ids, are left out.
+    """
+    model = column.class_
+    primary_key = inspect(model).primary_key[0]
+    changed = []
+    for chunk in chunked(ids):
+        previous = dict(db.execute(
+            select(primary_key, column).where(primary_key.in_(chunk), column.is_distinct_from(status)).with_for_update()
+        ).all())
+        if not previous:
+            continue
+        updated = db.scalars(
+            update(model).where(primary_key.in_(list(previous)), column.is_distinct_from(status))
+            .values({column: status}).returning(primary_key)
+            .execution_options(synchronize_session=False)
+        ).all()
+        changes = [(row_id, previous[row_id]) for row_id in sorted(updated)]
+        record_row_changes(db, (
+            RowChange(model.__tablename__, row_id, column.key, old_status, status) for row_id, old_status in changes
+        ))
+        db.commit()
+        changed += changes
+    return changed
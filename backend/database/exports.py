@@ -0,0 +1,120 @@
+"""
+Streaming exports of trips, deployments and routes as NDJSON or CSV.
+
+Each export is one SELECT of plain columns run with yield_per: the driver
+reads it through a server-side cursor and hands rows over EXPORT_BATCH_SIZE
+at a time, and each batch is written out as one chunk of text before the
+next is fetched. Memory stays at one batch however large the table is, and
+the whole export comes from a single snapshot of the database.
+"""
+import csv
+import enum
+import io
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DailyTrip, Deployment, Driver, Route, Vehicle
+
+EXPORT_BATCH_SIZE = int(os.getenv("MOVI_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _trip_filters(start: Optional[datetime], end: Optional[datetime], route_id: Optional[int],
+                  status: Optional[str]) -> list:
+    conditions = []
+    if start is not None:
+        conditions.append(DailyTrip.trip_date >= start)
+    if end is not None:
+        conditions.append(DailyTrip.trip_date < end)
+    if route_id is not None:
+        conditions.append(DailyTrip.route_id == route_id)
+    if status is not None:
+        conditions.append(DailyTrip.live_status == status)
+    return conditions
+
+def trips_export_query(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       route_id: Optional[int] = None, status: Optional[str] = None):
+    """Trips dated in [start, end), on `route_id`, with live_status `status`; each filter optional."""
+    return select(
+        DailyTrip.trip_id,
+        DailyTrip.route_id,
+        DailyTrip.display_name,
+        DailyTrip.trip_date,
+        DailyTrip.booking_status_percentage,
+        DailyTrip.live_status,
+    ).where(*_trip_filters(start, end, route_id, status)).order_by(DailyTrip.trip_id)
+
+def deployments_export_query(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             route_id: Optional[int] = None, status: Optional[str] = None):
+    """Deployments with their trip, vehicle and driver joined in, filtered on the trip like trips_export_query."""
+    return select(
+        Deployment.deployment_id,
+        Deployment.trip_id,
+        DailyTrip.display_name.label("trip_display_name"),
+        DailyTrip.trip_date,
+        DailyTrip.route_id,
+        DailyTrip.live_status,
+        Deployment.vehicle_id,
+        Vehicle.license_plate.label("vehicle_license_plate"),
+        Deployment.driver_id,
+        Driver.name.label("driver_name"),
+    ).join(
+        DailyTrip, DailyTrip.trip_id == Deployment.trip_id
+    ).outerjoin(
+        Vehicle, Vehicle.vehicle_id == Deployment.vehicle_id
+    ).outerjoin(
+        Driver, Driver.driver_id == Deployment.driver_id
+    ).where(*_trip_filters(start, end, route_id, status)).order_by(Deployment.deployment_id)
+
+def routes_export_query(route_id: Optional[int] = None, status=None):
+    """Routes, optionally one route or those with `status` (a StatusEnum)."""
+    query = select(
+        Route.route_id,
+        Route.path_id,
+        Route.display_name,
+        Route.shift_time,
+        Route.direction,
+        Route.start_point,
+        Route.end_point,
+        Route.status,
+    ).order_by(Route.route_id)
+    if route_id is not None:
+        query = query.where(Route.route_id == route_id)
+    if status is not None:
+        query = query.where(Route.status == status)
+    return query
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+async def export_chunks(db: AsyncSession, query, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    Runs `query` and yields its rows as text in `fmt` ("ndjson" or "csv"),
+    one chunk per batch of `batch_size` rows. CSV starts with a header line.
+    """
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    columns = list(result.keys())
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+    async for batch in result.partitions():
+        buffer = io.StringIO()
+        if fmt == "csv":
+            writer = csv.writer(buffer)
+            writer.writerows([_plain(value) for value in row] for row in batch)
+        else:
+            for row in batch:
+                buffer.write(json.dumps({column: _plain(value) for column, value in zip(columns, row)}))
+                buffer.write("\n")
+        yield buffer.getvalue()
@@ -0,0 +1,129 @@
+"""
+Versioned schema migrations.
+
+Tables are created from the models with Base.metadata.create_all, which never
+touches a table that already exists. Changes to existing tables go here as
+numbered steps. Each step runs once, in its own transaction, and is recorded
+in schema_migrations. A fresh database already has the current schema from
+create_all and then runs every step too, so steps must be no-ops there
+(CREATE INDEX IF NOT EXISTS, DROP INDEX IF EXISTS, ...).
+
+Data backfills are registered with online=True. Such a step gets the engine
+instead of a connection and commits batch by batch, so other processes can
+keep writing in between; it must be safe to re-run after an interruption.
+
+    python -m database.migrations
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, exists, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Base, Path, PathStop, Stop
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+MIGRATIONS: List[Tuple[int, str, Callable, bool]] = []
+
+BACKFILL_BATCH_SIZE = 500
+
+def migration(version: int, name: str, online: bool = False):
+    def register(step: Callable):
+        MIGRATIONS.append((version, name, step, online))
+        return step
+    return register
+
+def create_model_indexes(conn: Connection, *names: str):
+    """Creates the named indexes exactly as declared on the models, if missing."""
+    indexes = {index.name: index for table in Base.metadata.tables.values() for index in table.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+def drop_indexes(conn: Connection, *names: str):
+    for name in names:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+@migration(1, "availability indexes on deployments and daily_trips")
+def add_availability_indexes(conn: Connection):
+    # Single-column indexes from before the covering (resource, trip) ones.
+    drop_indexes(conn, "ix_deployments_vehicle_id", "ix_deployments_driver_id")
+    create_model_indexes(conn, "ix_deployments_vehicle_trip", "ix_deployments_driver_trip")
+
+@migration(2, "lookup indexes on trips, routes and drivers")
+def add_lookup_indexes(conn: Connection):
+    # Superseded by the (trip_date, live_status) composite.
+    drop_indexes(conn, "ix_daily_trips_trip_date")
+    create_model_indexes(
+        conn,
+        "ix_daily_trips_display_name", "ix_daily_trips_live_status",
+        "ix_daily_trips_route_status", "ix_daily_trips_date_status",
+        "ix_routes_display_name", "ix_routes_status", "ix_routes_path_id",
+        "ix_drivers_name",
+    )
+    # Without statistics SQLite's planner guesses between overlapping indexes,
+    # e.g. picks live_status over (trip_date, live_status) for a day's trips.
+    conn.execute(text("ANALYZE"))
+
+@migration(3, "backfill path_stops from paths.ordered_stop_ids", online=True)
+def backfill_path_stops(engine: Engine):
+    # create_all has already created path_stops; paths that have rows there
+    # (written since, or by an interrupted run) are left alone.
+    after_id, copied = 0, 0
+    while True:
+        with engine.begin() as conn:
+            paths = conn.execute(
+                select(Path.path_id, Path.ordered_stop_ids)
+                .where(Path.path_id > after_id, ~exists().where(PathStop.path_id == Path.path_id))
+                .order_by(Path.path_id).limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            if not paths:
+                break
+            stop_ids = {path.path_id: [int(sid) for sid in path.ordered_stop_ids.split(',') if sid.strip()] for path in paths}
+            # Ids of deleted stops were skipped by every reader of the CSV; drop them here too.
+            known = set(conn.execute(
+                select(Stop.stop_id).where(Stop.stop_id.in_({sid for ids in stop_ids.values() for sid in ids}))
+            ).scalars())
+            rows = [
+                {"path_id": path_id, "stop_id": sid, "stop_order": order}
+                for path_id, ids in stop_ids.items()
+                for order, sid in enumerate((sid for sid in ids if sid in known), start=1)
+            ]
+            if rows:
+                conn.execute(insert(PathStop), rows)
+            copied += len(paths)
+            after_id = paths[-1].path_id
+    print(f"---BACKFILLED {copied} PATHS---")
+
+@migration(4, "route and date index on daily_trips")
+def add_route_date_index(conn: Connection):
+    create_model_indexes(conn, "ix_daily_trips_route_date")
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Applies every pending migration in version order; returns the versions applied."""
+    migration_metadata.create_all(engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    newly_applied = []
+    for version, name, step, online in sorted(MIGRATIONS, key=lambda entry: entry[0]):
+        if version in applied:
+            continue
+        print(f"---MIGRATION {version}: {name}---")
+        if online:
+            step(engine)
+        with engine.begin() as conn:
+            if not online:
+                step(conn)
+            conn.execute(insert(schema_migrations).values(version=version, name=name, applied_at=datetime.now()))
+        newly_applied.append(version)
+    return newly_applied
+
+if __name__ == "__main__":
+    from .connection import create_db_and_tables
+    create_db_and_tables()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, DateTime, Enum as SQLAlchemyEnum
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, DateTime, Index, UniqueConstraint, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship, declarative_base
 import enum
 
@@ -19,19 +19,36 @@ class Path(Base):
     __tablename__ = 'paths'
     path_id = Column(Integer, primary_key=True)
     name = Column(String, unique=True, nullable=False)
+    # Comma-separated copy of path_stops, kept in step for API clients.
     ordered_stop_ids = Column(String, nullable=False)
+    path_stops = relationship("PathStop", order_by="PathStop.stop_order", cascade="all, delete-orphan",
+                              passive_deletes=True)
+
+class PathStop(Base):
+    __tablename__ = 'path_stops'
+    # (path_id, stop_order) reads a path's stops in order; (stop_id, path_id)
+    # answers "which paths pass through this stop" from the index alone.
+    __table_args__ = (
+        UniqueConstraint('path_id', 'stop_order', name='uq_path_stops_path_order'),
+        Index('ix_path_stops_stop_path', 'stop_id', 'path_id'),
+    )
+    id = Column(Integer, primary_key=True)
+    path_id = Column(Integer, ForeignKey('paths.path_id', ondelete='CASCADE'), nullable=False)
+    stop_id = Column(Integer, ForeignKey('stops.stop_id'), nullable=False)
+    stop_order = Column(Integer, nullable=False)
+    stop = relationship("Stop")
 
 class Route(Base):
     __tablename__ = 'routes'
     route_id = Column(Integer, primary_key=True)
     # --- CORRECTED FOREIGN KEY ---
-    path_id = Column(Integer, ForeignKey('paths.path_id'))
-    display_name = Column(String, nullable=False)
+    path_id = Column(Integer, ForeignKey('paths.path_id'), index=True)
+    display_name = Column(String, nullable=False, index=True)
     shift_time = Column(String, nullable=False)
     direction = Column(String)
     start_point = Column(String)
     end_point = Column(String)
-    status = Column(SQLAlchemyEnum(StatusEnum), default=StatusEnum.active)
+    status = Column(SQLAlchemyEnum(StatusEnum), default=StatusEnum.active, index=True)
     path = relationship("Path")
 
 class Vehicle(Base):
@@ -44,22 +61,37 @@ class Vehicle(Base):
 class Driver(Base):
     __tablename__ = 'drivers'
     driver_id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     phone_number = Column(String, unique=True)
 
 class DailyTrip(Base):
     __tablename__ = 'daily_trips'
+    # (route_id, live_status) also serves lookups by route_id alone, and
+    # (trip_date, live_status) lookups and ranges by trip_date alone.
+    # (route_id, trip_date) finds a route's trip on a given day, which the
+    # daily trip generator probes once per route.
+    __table_args__ = (
+        Index('ix_daily_trips_route_status', 'route_id', 'live_status'),
+        Index('ix_daily_trips_date_status', 'trip_date', 'live_status'),
+        Index('ix_daily_trips_route_date', 'route_id', 'trip_date'),
+    )
     trip_id = Column(Integer, primary_key=True)
     # --- CORRECTED FOREIGN KEY ---
     route_id = Column(Integer, ForeignKey('routes.route_id'))
-    display_name = Column(String, nullable=False)
+    display_name = Column(String, nullable=False, index=True)
     trip_date = Column(DateTime)
     booking_status_percentage = Column(Integer, default=0)
-    live_status = Column(String, default="NOT_STARTED")
+    live_status = Column(String, default="NOT_STARTED", index=True)
     route = relationship("Route")
 
 class Deployment(Base):
     __tablename__ = 'deployments'
+    # Covering indexes for the availability anti-joins (see database/queries.py):
+    # each probe finds a resource's trips without touching the table.
+    __table_args__ = (
+        Index('ix_deployments_vehicle_trip', 'vehicle_id', 'trip_id'),
+        Index('ix_deployments_driver_trip', 'driver_id', 'trip_id'),
+    )
     deployment_id = Column(Integer, primary_key=True)
     # --- CORRECTED FOREIGN KEYS ---
     trip_id = Column(Integer, ForeignKey('daily_trips.trip_id'), unique=True)
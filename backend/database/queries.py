@@ -0,0 +1,234 @@
+"""
+Read queries shared by the agent tools, the CRUD layer and the REST endpoints.
+
+Each one is a single SELECT, built as a select() statement that is not tied
+to a session, so the same query runs on a sync Session (db.execute(),
+db.scalars()) and on an AsyncSession (await db.execute(), ...). Projections
+return plain rows rather than ORM objects, so callers never trigger lazy
+loads or follow-up lookups.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, exists, func, literal, null, or_, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import DailyTrip, Deployment, Driver, Path, PathStop, Route, Stop, Vehicle
+
+def trip_summary_query():
+    """
+    One row per trip with its deployment, vehicle and driver joined in.
+    Trips without a deployment come back with the vehicle and driver columns
+    set to None.
+    """
+    return select(
+        DailyTrip.trip_id,
+        DailyTrip.display_name,
+        DailyTrip.live_status,
+        DailyTrip.booking_status_percentage,
+        Deployment.deployment_id,
+        Vehicle.license_plate.label("vehicle_license_plate"),
+        Vehicle.type.label("vehicle_type"),
+        Vehicle.capacity.label("vehicle_capacity"),
+        Driver.name.label("driver_name"),
+        Driver.phone_number.label("driver_phone_number"),
+    ).outerjoin(
+        Deployment, Deployment.trip_id == DailyTrip.trip_id
+    ).outerjoin(
+        Vehicle, Vehicle.vehicle_id == Deployment.vehicle_id
+    ).outerjoin(
+        Driver, Driver.driver_id == Deployment.driver_id
+    )
+
+def get_trip_summary_by_name(db: Session, display_name: str) -> Optional[object]:
+    return db.execute(trip_summary_query().where(DailyTrip.display_name == display_name)).first()
+
+def get_trip_summary_by_id(db: Session, trip_id: int) -> Optional[object]:
+    return db.execute(trip_summary_query().where(DailyTrip.trip_id == trip_id)).first()
+
+def day_window(day: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """The [midnight, next midnight) window of `day`; (None, None) for an undated trip."""
+    if day is None:
+        return None, None
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
+
+def trip_in_window(start: datetime, end: datetime):
+    """Trips that occupy [start, end). Undated trips run every day, so they occupy every window."""
+    return or_(DailyTrip.trip_date.is_(None), and_(DailyTrip.trip_date >= start, DailyTrip.trip_date < end))
+
+def not_deployed_in_window(deployment_column, resource_id_column, start: Optional[datetime] = None,
+                           end: Optional[datetime] = None, shift_time: Optional[str] = None):
+    """
+    Correlated NOT EXISTS filter, true for vehicles (or drivers) without a
+    deployment on a trip in [start, end) and, if given, on a route of that
+    shift; with neither, true for those without any deployment. The database
+    runs it as an anti-join over the covering (resource, trip) index, so no
+    deployment is loaded into Python and no id list is sent back as parameters.
+    """
+    conditions = [deployment_column == resource_id_column]
+    if (start is not None and end is not None) or shift_time is not None:
+        conditions.append(DailyTrip.trip_id == Deployment.trip_id)
+    if start is not None and end is not None:
+        conditions.append(trip_in_window(start, end))
+    if shift_time is not None:
+        conditions += [Route.route_id == DailyTrip.route_id, Route.shift_time == shift_time]
+    return ~exists().where(*conditions)
+
+def available_vehicles_query(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             shift_time: Optional[str] = None):
+    return select(Vehicle).where(not_deployed_in_window(Deployment.vehicle_id, Vehicle.vehicle_id, start, end, shift_time))
+
+def available_drivers_query(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            shift_time: Optional[str] = None):
+    return select(Driver).where(not_deployed_in_window(Deployment.driver_id, Driver.driver_id, start, end, shift_time))
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def keyset_page(query, key, after, limit: int, descending: bool = False):
+    """
+    One page of `query` ordered by `key`, starting after `after`. `key` is a
+    unique column, or a tuple of columns ending in one, e.g. (name, id), so
+    the order is total; `after` is then the tuple of the last row's values.
+    Unlike OFFSET, the cost of a page does not grow with how deep it is.
+    """
+    columns = key if isinstance(key, tuple) else (key,)
+    if after is not None:
+        values = after if isinstance(after, tuple) else (after,)
+        left, right = (tuple_(*columns), tuple_(*values)) if len(columns) > 1 else (columns[0], values[0])
+        query = query.where(left < right if descending else left > right)
+    return query.order_by(*(column.desc() if descending else column for column in columns)).limit(limit)
+
+def key_of(row, key):
+    """The value(s) of `key` on `row`, in the form keyset_page() takes as `after`."""
+    if isinstance(key, tuple):
+        return tuple(getattr(row, column.key) for column in key)
+    return getattr(row, key.key)
+
+def encode_cursor(after) -> str:
+    """An opaque, URL-safe cursor for the page after the row whose key is `after`."""
+    values = list(after) if isinstance(after, tuple) else [after]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], arity: int = 1):
+    """The `after` value encoded in `cursor`; None for no cursor. Raises ValueError if malformed."""
+    if cursor is None:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != arity or not all(isinstance(v, (int, str)) for v in values):
+        raise ValueError(f"Malformed cursor: {cursor!r}")
+    return values[0] if arity == 1 else tuple(values)
+
+def split_page(rows: Sequence[Any], key, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Splits rows fetched with a limit of `limit + 1` into the page and the
+    cursor of the next one, or None on the last page. The extra row saves a
+    client the empty request that would otherwise end every listing.
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    return page, encode_cursor(key_of(page[-1], key))
+
+def iter_keyset(db: Session, query, key, chunk_size: int = 1000) -> Iterator:
+    """Yields every entity selected by `query` in key order, one keyset page at a time."""
+    after = None
+    while True:
+        page = db.scalars(keyset_page(query, key, after, chunk_size)).all()
+        yield from page
+        if len(page) < chunk_size:
+            return
+        after = key_of(page[-1], key)
+
+async def aiter_keyset(db: AsyncSession, query, key, chunk_size: int = 1000) -> AsyncIterator:
+    """iter_keyset() on an AsyncSession."""
+    after = None
+    while True:
+        page = (await db.scalars(keyset_page(query, key, after, chunk_size))).all()
+        for row in page:
+            yield row
+        if len(page) < chunk_size:
+            return
+        after = key_of(page[-1], key)
+
+def fleet_availability_query(start: Optional[datetime], end: Optional[datetime]):
+    """
+    Vehicles and drivers free in [start, end) as one UNION ALL statement, one
+    row per resource: (kind, id, name, detail, capacity). `detail` is the
+    vehicle type or the driver's phone number.
+    """
+    vehicles = select(
+        literal("vehicle").label("kind"),
+        Vehicle.vehicle_id.label("id"),
+        Vehicle.license_plate.label("name"),
+        Vehicle.type.label("detail"),
+        Vehicle.capacity.label("capacity"),
+    ).where(not_deployed_in_window(Deployment.vehicle_id, Vehicle.vehicle_id, start, end))
+    drivers = select(
+        literal("driver").label("kind"),
+        Driver.driver_id.label("id"),
+        Driver.name.label("name"),
+        Driver.phone_number.label("detail"),
+        null().label("capacity"),
+    ).where(not_deployed_in_window(Deployment.driver_id, Driver.driver_id, start, end))
+    return union_all(vehicles, drivers)
+
+def path_stops_query():
+    """Stops joined to their path_stops rows, in stop order. Filter on PathStop or Path."""
+    return select(Stop).join(PathStop, PathStop.stop_id == Stop.stop_id).order_by(PathStop.stop_order)
+
+def stops_for_path_name_query(path_name: str):
+    return path_stops_query().join(Path, Path.path_id == PathStop.path_id).where(Path.name == path_name)
+
+def trip_route_stops_query(trip_id: int):
+    """The ordered stops of a trip's route, trip to route to path_stops in one join."""
+    return path_stops_query().join(
+        Route, Route.path_id == PathStop.path_id
+    ).join(
+        DailyTrip, DailyTrip.route_id == Route.route_id
+    ).where(DailyTrip.trip_id == trip_id)
+
+def paths_containing_stop_query(stop_id: int):
+    """
+    Paths that pass through `stop_id`, each once even if the stop repeats.
+    The IN subquery is driven from the (stop_id, path_id) index and only
+    those paths are fetched by primary key; a correlated EXISTS would probe
+    once per path, and the old LIKE scan parsed every path's ordered_stop_ids.
+    """
+    return select(Path).where(
+        Path.path_id.in_(select(PathStop.path_id).where(PathStop.stop_id == stop_id))
+    ).order_by(Path.path_id)
+
+def path_endpoints_query(path_ids):
+    """
+    The first and last stop names of each path in `path_ids`, one row per
+    existing path: (path_id, start_point, end_point, stop_count). A path
+    without stops has stop_count 0 and no endpoints. One pass over the
+    paths' path_stops rows ranks them from each end with ROW_NUMBER(), so a
+    batch of routes sharing a few paths costs one statement, not an ordered
+    join per route.
+    """
+    ranked = select(
+        PathStop.path_id,
+        Stop.name,
+        func.row_number().over(partition_by=PathStop.path_id, order_by=PathStop.stop_order).label("from_start"),
+        func.row_number().over(partition_by=PathStop.path_id, order_by=PathStop.stop_order.desc()).label("from_end"),
+        func.count().over(partition_by=PathStop.path_id).label("stop_count"),
+    ).join(Stop, Stop.stop_id == PathStop.stop_id).where(PathStop.path_id.in_(path_ids)).subquery()
+    ends = select(
+        ranked.c.path_id,
+        func.max(case((ranked.c.from_start == 1, ranked.c.name))).label("start_point"),
+        func.max(case((ranked.c.from_end == 1, ranked.c.name))).label("end_point"),
+        func.max(ranked.c.stop_count).label("stop_count"),
+    ).where(or_(ranked.c.from_start == 1, ranked.c.from_end == 1)).group_by(ranked.c.path_id).subquery()
+    return select(
+        Path.path_id, ends.c.start_point, ends.c.end_point, func.coalesce(ends.c.stop_count, 0).label("stop_count"),
+    ).outerjoin(ends, ends.c.path_id == Path.path_id).where(Path.path_id.in_(path_ids))
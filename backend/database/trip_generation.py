@@ -0,0 +1,58 @@
+"""
+Generates a service day's trips from the routes in one INSERT ... SELECT,
+so the rows never pass through Python.
+
+Every active route (or every active route among the given ids) gets one
+DailyTrip dated at midnight of the day, named "<route name> (<YYYY-MM-DD>)",
+scheduled and unbooked. A route that already has a trip on that day is
+skipped by a NOT EXISTS probe on the (route_id, trip_date) index, so a re-run
+only fills in what is missing.
+
+"On that day" is trip_in_window's rule, the one the availability checks use.
+An undated trip runs every day, so its route never gets a second trip that
+would double-book its vehicle and driver.
+
+    python -m database.trip_generation 2025-01-15
+"""
+import sys
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.orm import Session
+
+from .models import DailyTrip, Route, StatusEnum
+from .queries import day_window, trip_in_window
+
+def daily_trips_insert(day: datetime, route_ids: Optional[Iterable[int]] = None):
+    """The INSERT ... SELECT that creates `day`'s missing trips; session-free like the read queries."""
+    start, end = day_window(day)
+    routes = select(
+        Route.route_id,
+        (Route.display_name + f" ({start:%Y-%m-%d})").label("display_name"),
+        literal(start, DailyTrip.trip_date.type).label("trip_date"),
+        literal(0).label("booking_status_percentage"),
+        literal("scheduled").label("live_status"),
+    ).where(
+        Route.status == StatusEnum.active,
+        ~exists().where(DailyTrip.route_id == Route.route_id, trip_in_window(start, end)),
+    )
+    if route_ids is not None:
+        routes = routes.where(Route.route_id.in_(set(route_ids)))
+    return insert(DailyTrip).from_select(
+        ["route_id", "display_name", "trip_date", "booking_status_percentage", "live_status"], routes
+    )
+
+def generate_daily_trips(db: Session, day: datetime, route_ids: Optional[Iterable[int]] = None) -> int:
+    """Creates and commits `day`'s missing trips; returns how many were created."""
+    created = db.execute(daily_trips_insert(day, route_ids)).rowcount
+    db.commit()
+    print(f"---GENERATED {created} TRIPS FOR {day:%Y-%m-%d}---")
+    return created
+
+if __name__ == "__main__":
+    from .connection import SessionLocal, create_db_and_tables
+    create_db_and_tables()
+    day = datetime.strptime(sys.argv[1], "%Y-%m-%d") if len(sys.argv) > 1 else datetime.now()
+    with SessionLocal() as db:
+        generate_daily_trips(db, day)
@@ -0,0 +1,98 @@
+"""
+In-process data versions: one counter per table, bumped after every commit
+that wrote to that table. Caches stamp their entries with the versions of the
+tables they read and treat an entry as stale once any of them moves.
+
+The counters live in this process and only see its own commits. Another
+worker process, seed.py or a migration writing to the same database does not
+move them, so caches built on them must also bound an entry's age (see the
+TTL in agent/response_cache.py).
+
+Writes are collected per session and only published on commit, so a reader
+can never see a new version while the data behind it is still uncommitted.
+
+Writers that know exactly which rows they changed (the bulk status updates
+in database/bulk.py) also record row-level changes. These are published the
+same way to on_rows_changed listeners, so a live view can apply them
+without re-reading the table.
+"""
+import itertools
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_versions: Dict[str, int] = defaultdict(int)
+_lock = threading.Lock()
+_listeners: List[Callable[[Set[str]], None]] = []
+
+@dataclass(frozen=True)
+class RowChange:
+    """One committed change of `column` on the row of `table` with primary key `id`."""
+    table: str
+    id: int
+    column: str
+    previous: Any
+    current: Any
+
+_row_listeners: List[Callable[[List[RowChange]], None]] = []
+
+def table_versions(tables: Iterable[str]) -> Dict[str, int]:
+    """Returns the current version of each table in `tables`."""
+    with _lock:
+        return {table: _versions[table] for table in tables}
+
+def on_tables_changed(callback: Callable[[Set[str]], None]):
+    """Registers `callback(tables)` to run after a commit that changed `tables`."""
+    _listeners.append(callback)
+
+def on_rows_changed(callback: Callable[[List[RowChange]], None]):
+    """Registers `callback(changes)` to run after a commit that recorded row changes."""
+    _row_listeners.append(callback)
+
+def record_row_changes(session: Session, changes: Iterable[RowChange]):
+    """Queues `changes` on `session`; they are published if and when it commits."""
+    session.info.setdefault("row_changes", []).extend(changes)
+
+def bump_tables(tables: Iterable[str]):
+    tables = set(tables)
+    if not tables:
+        return
+    with _lock:
+        for table in tables:
+            _versions[table] += 1
+    for callback in _listeners:
+        callback(tables)
+
+def _pending_tables(session: Session) -> Set[str]:
+    return session.info.setdefault("changed_tables", set())
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    pending = _pending_tables(session)
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        pending.add(inspect(obj).mapper.local_table.name)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state):
+    # Bulk insert/update/delete statements bypass the unit of work.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _pending_tables(orm_execute_state.session).add(mapper.local_table.name)
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_tables(session):
+    bump_tables(session.info.pop("changed_tables", ()))
+    changes = session.info.pop("row_changes", None)
+    if changes:
+        for callback in _row_listeners:
+            callback(changes)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("changed_tables", None)
+    session.info.pop("row_changes", None)
@@ -1,17 +1,58 @@
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import schemas
 import database.models as models
-from database.connection import get_db
+from crud.deployment import create_bulk_deployments
+from database.bulk import delete_routes_by_id, update_status_by_id
+from database.connection import AsyncSessionLocal, async_engine, create_db_and_tables, get_async_db
+from database.exports import EXPORT_MEDIA_TYPES, deployments_export_query, export_chunks, routes_export_query, trips_export_query
 from database.models import StatusEnum
+from database.trip_generation import daily_trips_insert
+from database.versions import on_rows_changed
+from database.queries import (
+    MAX_PAGE_SIZE, PAGE_SIZE, aiter_keyset, available_drivers_query, available_vehicles_query, day_window,
+    decode_cursor, fleet_availability_query, keyset_page, path_stops_query, paths_containing_stop_query,
+    split_page, trip_summary_query, trip_route_stops_query,
+)
 from agent.graph import create_movi_agent_graph
-from langchain_core.messages import HumanMessage, AIMessage
+from agent.checkpointing import open_checkpointer, run_eviction_loop
+from agent.images import preprocess_image
+from agent.response_cache import response_cache
+from agent.session import run_session_scope
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+
+movi_agent = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global movi_agent
+    await asyncio.to_thread(create_db_and_tables)
+    async with open_checkpointer() as checkpointer:
+        movi_agent = create_movi_agent_graph(checkpointer=checkpointer)
+        eviction_task = asyncio.create_task(run_eviction_loop(checkpointer))
+        try:
+            yield
+        finally:
+            # Let the eviction loop finish cancelling before the saver's connection closes.
+            eviction_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await eviction_task
+            await async_engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # --- Agent Models and Endpoint ---
@@ -28,107 +70,367 @@ class Message(BaseModel):
     content: str
 
 class AgentRequest(BaseModel):
+    # With a thread_id, `messages` only holds the new turn; the rest of the
+    # conversation is restored from the server-side checkpoint. Without one,
+    # `messages` is the full history and a new thread is started.
     messages: List[Message]
     currentPage: Optional[str] = "unknown"
     image: Optional[str] = None
+    thread_id: Optional[str] = None
 
-movi_agent = create_movi_agent_graph()
+def agent_config(request: AgentRequest) -> dict:
+    return {"configurable": {"thread_id": request.thread_id or str(uuid.uuid4()), "current_page": request.currentPage}}
 
-@app.post("/invoke_agent")
-async def invoke_agent(request: AgentRequest):
+async def build_agent_inputs(request: AgentRequest) -> dict:
     langchain_messages = [AIMessage(content=msg.content) if msg.role == 'assistant' else HumanMessage(content=msg.content) for msg in request.messages]
     if request.image:
         last_user_text = ""
         if langchain_messages and isinstance(langchain_messages[-1], HumanMessage):
              last_user_text = langchain_messages[-1].content
              langchain_messages = langchain_messages[:-1]
-        multimodal_content = [{"type": "text", "text": last_user_text}, {"type": "image_url", "image_url": {"url": request.image}}]
+        try:
+            image_url = await preprocess_image(request.image)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        multimodal_content = [{"type": "text", "text": last_user_text}, {"type": "image_url", "image_url": {"url": image_url}}]
         langchain_messages.append(HumanMessage(content=multimodal_content))
-    inputs = {"messages": langchain_messages}
-    final_state = movi_agent.invoke(inputs)
+    return {"messages": langchain_messages}
+
+@app.post("/invoke_agent")
+async def invoke_agent(request: AgentRequest):
+    inputs = await build_agent_inputs(request)
+    config = agent_config(request)
+    with run_session_scope(config) as run_config:
+        final_state = await movi_agent.ainvoke(inputs, run_config)
     ai_response = final_state['messages'][-1]
-    return {"role": "assistant", "content": ai_response.content}
+    return {"role": "assistant", "content": ai_response.content, "thread_id": config["configurable"]["thread_id"]}
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_agent_events(inputs: dict, config: dict):
+    """
+    Translates LangGraph's astream_events into the SSE events the chat UI consumes:
+    token, tool_start, tool_end, confirmation, then a final done (or error).
+    """
+    final_content = ""
+    try:
+        with run_session_scope(config) as run_config:
+            async for event in movi_agent.astream_events(inputs, run_config, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream" and event["metadata"].get("langgraph_node") == "agent":
+                    content = event["data"]["chunk"].content
+                    if isinstance(content, str) and content:
+                        yield sse_event("token", {"content": content})
+                elif kind == "on_tool_start":
+                    yield sse_event("tool_start", {"name": event["name"], "input": event["data"].get("input")})
+                elif kind == "on_tool_end":
+                    output = event["data"].get("output")
+                    yield sse_event("tool_end", {"name": event["name"], "output": output.content if isinstance(output, ToolMessage) else output})
+                elif kind == "on_chain_end" and event["name"] == "check_consequences":
+                    for message in (event["data"].get("output") or {}).get("messages", []):
+                        if isinstance(message, AIMessage):
+                            yield sse_event("confirmation", {"content": message.content})
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    final_content = event["data"]["output"]["messages"][-1].content
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+        return
+    yield sse_event("done", {"role": "assistant", "content": final_content, "thread_id": config["configurable"]["thread_id"]})
+
+@app.post("/invoke_agent/stream")
+async def invoke_agent_stream(request: AgentRequest):
+    inputs = await build_agent_inputs(request)
+    return StreamingResponse(
+        stream_agent_events(inputs, agent_config(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/invoke_agent/cache-stats")
+def get_agent_cache_stats():
+    return response_cache.stats()
 
 # --- All UI Data Endpoints ---
+# These run on the async engine: a request waiting on the database does not
+# hold a threadpool thread.
+#
+# List endpoints return one page of at most `limit` rows in a stable key
+# order. When there are more, the X-Next-Cursor response header carries an
+# opaque cursor; pass it back as `cursor` for the next page.
+
+async def paginate(db: AsyncSession, response: Response, query, key, cursor: Optional[str], limit: int,
+                   descending: bool = False):
+    try:
+        after = decode_cursor(cursor, len(key) if isinstance(key, tuple) else 1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = (await db.scalars(keyset_page(query, key, after, limit + 1, descending))).all()
+    page, next_cursor = split_page(rows, key, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return page
 
 @app.get("/trips", response_model=List[schemas.DailyTrip])
-def get_all_trips(db: Session = Depends(get_db)):
-    return db.query(models.DailyTrip).order_by(models.DailyTrip.trip_id.desc()).all()
+async def get_all_trips(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    # Newest first, as before.
+    return await paginate(db, response, select(models.DailyTrip), models.DailyTrip.trip_id, cursor, limit, descending=True)
+
+@app.post("/trips/generate")
+async def generate_trips(day: Optional[datetime] = None, route_ids: Optional[List[int]] = Query(None), db: AsyncSession = Depends(get_async_db)):
+    # One trip per active route (or per active route in route_ids) that has
+    # none on the day yet; see database/trip_generation.py.
+    day = day or datetime.now()
+    result = await db.execute(daily_trips_insert(day, route_ids))
+    await db.commit()
+    return {"day": day_window(day)[0], "created": result.rowcount}
 
 @app.get("/routes", response_model=List[schemas.Route])
-def get_all_routes_by_status(status: str = "active", db: Session = Depends(get_db)):
+async def get_all_routes_by_status(response: Response, status: str = "active", cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                                   db: AsyncSession = Depends(get_async_db)):
     try:
         status_enum = StatusEnum[status]
     except KeyError:
         raise HTTPException(status_code=400, detail=f"Invalid status value: {status}.")
-    return db.query(models.Route).filter(models.Route.status == status_enum).all()
+    query = select(models.Route).where(models.Route.status == status_enum)
+    return await paginate(db, response, query, models.Route.route_id, cursor, limit)
 
 @app.get("/vehicles", response_model=List[schemas.Vehicle])
-def get_all_vehicles(db: Session = Depends(get_db)):
-    return db.query(models.Vehicle).all()
+async def get_all_vehicles(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    return await paginate(db, response, select(models.Vehicle), models.Vehicle.vehicle_id, cursor, limit)
 
 @app.get("/drivers", response_model=List[schemas.Driver])
-def get_all_drivers(db: Session = Depends(get_db)):
-    return db.query(models.Driver).all()
+async def get_all_drivers(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    return await paginate(db, response, select(models.Driver), models.Driver.driver_id, cursor, limit)
+
+# Availability on a day (and optionally a shift), paged like the lists above.
+# The /stream variants send every match as NDJSON, read from the database in
+# chunks.
+
+@app.get("/drivers/available", response_model=List[schemas.Driver])
+async def get_available_drivers(response: Response, day: Optional[datetime] = None, shift_time: Optional[str] = None,
+                                cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    start, end = day_window(day or datetime.now())
+    return await paginate(db, response, available_drivers_query(start, end, shift_time), models.Driver.driver_id, cursor, limit)
+
+@app.get("/drivers/available/stream")
+async def stream_available_drivers(day: Optional[datetime] = None, shift_time: Optional[str] = None):
+    start, end = day_window(day or datetime.now())
+    return StreamingResponse(
+        ndjson_rows(available_drivers_query(start, end, shift_time), models.Driver.driver_id, schemas.Driver),
+        media_type="application/x-ndjson",
+    )
+
+@app.get("/vehicles/available", response_model=List[schemas.Vehicle])
+async def get_available_vehicles(response: Response, day: Optional[datetime] = None, shift_time: Optional[str] = None,
+                                 cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    start, end = day_window(day or datetime.now())
+    return await paginate(db, response, available_vehicles_query(start, end, shift_time), models.Vehicle.vehicle_id, cursor, limit)
+
+@app.get("/vehicles/available/stream")
+async def stream_available_vehicles(day: Optional[datetime] = None, shift_time: Optional[str] = None):
+    start, end = day_window(day or datetime.now())
+    return StreamingResponse(
+        ndjson_rows(available_vehicles_query(start, end, shift_time), models.Vehicle.vehicle_id, schemas.Vehicle),
+        media_type="application/x-ndjson",
+    )
+
+async def ndjson_rows(query, id_column, schema):
+    # The session is opened here rather than through Depends, so it stays
+    # open for as long as the response is streaming.
+    async with AsyncSessionLocal() as db:
+        async for row in aiter_keyset(db, query, id_column):
+            yield schema.model_validate(row).model_dump_json() + "\n"
 
 @app.get("/stops", response_model=List[schemas.Stop])
-def get_all_stops(db: Session = Depends(get_db)):
-    return db.query(models.Stop).all()
+async def get_all_stops(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    return await paginate(db, response, select(models.Stop), models.Stop.stop_id, cursor, limit)
 
 @app.get("/paths", response_model=List[schemas.Path])
-def get_all_paths(db: Session = Depends(get_db)):
-    return db.query(models.Path).all()
+async def get_all_paths(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_db)):
+    return await paginate(db, response, select(models.Path), models.Path.path_id, cursor, limit)
 
-@app.get("/trip-details/{trip_id}/route-stops", response_model=List[schemas.Stop])
-def get_trip_route_stops(trip_id: int, db: Session = Depends(get_db)):
-    trip = db.query(models.DailyTrip).filter(models.DailyTrip.trip_id == trip_id).first()
+@app.get("/stops/{stop_id}/paths", response_model=List[schemas.Path])
+async def get_paths_for_stop(stop_id: int, response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                             db: AsyncSession = Depends(get_async_db)):
+    query = paths_containing_stop_query(stop_id).order_by(None)  # paginate orders by path_id
+    return await paginate(db, response, query, models.Path.path_id, cursor, limit)
+
+# Full-table exports for reporting, streamed as NDJSON or CSV (?format=csv)
+# from a server-side cursor; see database/exports.py. Trips and deployments
+# filter on the trip's date ([start, end)), route and live_status.
+
+def export_response(name: str, query, format: str) -> StreamingResponse:
+    async def chunks():
+        async with AsyncSessionLocal() as db:
+            async for chunk in export_chunks(db, query, format):
+                yield chunk
+    return StreamingResponse(
+        chunks(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+@app.get("/exports/trips")
+async def export_trips(format: Literal["ndjson", "csv"] = "ndjson", start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       route_id: Optional[int] = None, status: Optional[str] = None):
+    return export_response("trips", trips_export_query(start, end, route_id, status), format)
+
+@app.get("/exports/deployments")
+async def export_deployments(format: Literal["ndjson", "csv"] = "ndjson", start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             route_id: Optional[int] = None, status: Optional[str] = None):
+    return export_response("deployments", deployments_export_query(start, end, route_id, status), format)
+
+@app.get("/exports/routes")
+async def export_routes(format: Literal["ndjson", "csv"] = "ndjson", route_id: Optional[int] = None, status: Optional[str] = None):
+    try:
+        status_enum = StatusEnum[status] if status is not None else None
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Invalid status value: {status}.")
+    return export_response("routes", routes_export_query(route_id, status_enum), format)
+
+@app.get("/trip-details/{trip_id}/summary", response_model=schemas.TripSummary)
+async def get_trip_summary(trip_id: int, db: AsyncSession = Depends(get_async_db)):
+    trip = (await db.execute(trip_summary_query().where(models.DailyTrip.trip_id == trip_id))).first()
     if not trip:
-        return []
-    route = db.query(models.Route).filter(models.Route.route_id == trip.route_id).first()
-    if not route:
-        return []
-    path = db.query(models.Path).filter(models.Path.path_id == route.path_id).first()
-    if not path:
-        return []
-    stop_ids = [int(sid) for sid in path.ordered_stop_ids.split(',')]
-    stops = db.query(models.Stop).filter(models.Stop.stop_id.in_(stop_ids)).all()
-    stop_map = {stop.stop_id: stop for stop in stops}
-    ordered_stops = [stop_map[sid] for sid in stop_ids if sid in stop_map]
-    return ordered_stops
+        raise HTTPException(status_code=404, detail="Trip not found")
+    return trip
+
+@app.get("/fleet/availability", response_model=schemas.FleetAvailability)
+async def get_fleet_availability(start: Optional[datetime] = None, end: Optional[datetime] = None, db: AsyncSession = Depends(get_async_db)):
+    # Vehicles and drivers with no deployment in [start, end), today by default.
+    if start is None:
+        start, default_end = day_window(datetime.now())
+        end = end or default_end
+    elif end is None:
+        end = start + timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start.")
+    rows = (await db.execute(fleet_availability_query(start, end))).all()
+    return {
+        "start": start,
+        "end": end,
+        "vehicles": [{"vehicle_id": row.id, "license_plate": row.name, "type": row.detail, "capacity": row.capacity} for row in rows if row.kind == "vehicle"],
+        "drivers": [{"driver_id": row.id, "name": row.name, "phone_number": row.detail} for row in rows if row.kind == "driver"],
+    }
+
+@app.get("/trip-details/{trip_id}/route-stops", response_model=List[schemas.Stop])
+async def get_trip_route_stops(trip_id: int, db: AsyncSession = Depends(get_async_db)):
+    return (await db.scalars(trip_route_stops_query(trip_id))).all()
     
+@app.post("/deployments/bulk", status_code=201)
+async def bulk_create_deployments(deployments: List[schemas.DeploymentCreate], db: AsyncSession = Depends(get_async_db)):
+    # Valid rows are created in one INSERT; invalid or conflicting rows come
+    # back in "errors" with their index in the request (see crud/deployment.py).
+    try:
+        created, errors = await db.run_sync(create_bulk_deployments, deployments)
+    except IntegrityError:
+        # Another request deployed one of these trips after the batch was checked.
+        raise HTTPException(status_code=409, detail="A trip in the batch was deployed concurrently; retry the request.")
+    return {"created": [row._asdict() for row in created], "errors": errors}
+
 @app.post("/routes", response_model=schemas.Route)
-def create_route(route: schemas.RouteCreate, db: Session = Depends(get_db)):
-    path = db.query(models.Path).filter(models.Path.path_id == route.path_id).first()
+async def create_route(route: schemas.RouteCreate, db: AsyncSession = Depends(get_async_db)):
+    path = await db.get(models.Path, route.path_id)
     if not path: raise HTTPException(status_code=404, detail="Path not found")
-    stops = db.query(models.Stop).filter(models.Stop.stop_id.in_([int(s) for s in path.ordered_stop_ids.split(',')])).all()
-    stop_map = {s.stop_id: s for s in stops}
-    ordered_ids = [int(s) for s in path.ordered_stop_ids.split(',')]
-    start_point = stop_map[ordered_ids[0]].name
-    end_point = stop_map[ordered_ids[-1]].name
-    new_route_model = models.Route(start_point=start_point, end_point=end_point, **route.model_dump())
+    stops = (await db.scalars(path_stops_query().where(models.PathStop.path_id == path.path_id))).all()
+    if not stops: raise HTTPException(status_code=400, detail="Path has no stops")
+    try:
+        status_enum = StatusEnum[route.status]
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Invalid status value: {route.status}.")
+    # The Route model has no capacity or waitlist columns; the display name is stored as display_name.
+    new_route_model = models.Route(
+        display_name=route.route_display_name, start_point=stops[0].name, end_point=stops[-1].name, status=status_enum,
+        **route.model_dump(exclude={"route_display_name", "capacity", "allocated_waitlist", "status"}),
+    )
     db.add(new_route_model)
-    db.commit()
-    db.refresh(new_route_model)
+    await db.commit()
+    await db.refresh(new_route_model)
     return new_route_model
 
 @app.patch("/routes/{route_id}/status", response_model=schemas.Route)
-def update_route_status_endpoint(route_id: int, status: str, db: Session = Depends(get_db)):
+async def update_route_status_endpoint(route_id: int, status: str, db: AsyncSession = Depends(get_async_db)):
     # (Logic is correct and remains unchanged)
-    route = db.query(models.Route).filter(models.Route.route_id == route_id).first()
+    route = await db.get(models.Route, route_id)
     if not route: raise HTTPException(status_code=404, detail="Route not found")
     try:
         status_enum = StatusEnum[status]
     except KeyError:
         raise HTTPException(status_code=400, detail=f"Invalid status value: {status}.")
-    route.status = status_enum
-    db.commit()
-    db.refresh(route)
+    await db.run_sync(update_status_by_id, models.Route.status, [route_id], status_enum)
+    await db.refresh(route)
     return route
 
+# Bulk status changes, chunked (see update_status_by_id in database/bulk.py).
+# The response lists only the rows that changed, with their previous status;
+# the same changes go out on /events/changes.
+
+@app.patch("/trips/live-status", response_model=schemas.StatusUpdateResult)
+async def bulk_update_trip_status(update: schemas.TripStatusUpdate, db: AsyncSession = Depends(get_async_db)):
+    changed = await db.run_sync(update_status_by_id, models.DailyTrip.live_status, update.trip_ids, update.live_status)
+    return {"status": update.live_status, "changed": [{"id": trip_id, "previous": previous} for trip_id, previous in changed]}
+
+@app.patch("/routes/status", response_model=schemas.StatusUpdateResult)
+async def bulk_update_route_status(update: schemas.RouteStatusUpdate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        status_enum = StatusEnum[update.status]
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Invalid status value: {update.status}.")
+    changed = await db.run_sync(update_status_by_id, models.Route.status, update.route_ids, status_enum)
+    return {"status": update.status, "changed": [{"id": route_id, "previous": previous and previous.value} for route_id, previous in changed]}
+
+# --- Change feed ---
+# Row changes are pushed to every open /events/changes stream as SSE "changes"
+# events once their transaction commits (see on_rows_changed in
+# database/versions.py). A client that falls CHANGE_FEED_QUEUE_SIZE batches
+# behind gets one "resync" event instead and should re-read what it shows.
+
+CHANGE_FEED_QUEUE_SIZE = 100
+change_subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+
+def _offer_changes(queue: asyncio.Queue, changes: Optional[list]):
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+        changes = None
+    queue.put_nowait(changes)
+
+def broadcast_row_changes(changes):
+    # Runs in whichever thread committed; hand over to each stream's loop.
+    payload = [
+        {"table": c.table, "id": c.id, "column": c.column,
+         "previous": getattr(c.previous, "value", c.previous), "current": getattr(c.current, "value", c.current)}
+        for c in changes
+    ]
+    for loop, queue in list(change_subscribers):
+        loop.call_soon_threadsafe(_offer_changes, queue, payload)
+
+on_rows_changed(broadcast_row_changes)
+
+async def stream_row_changes():
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE)
+    subscriber = (asyncio.get_running_loop(), queue)
+    change_subscribers.add(subscriber)
+    try:
+        while True:
+            changes = await queue.get()
+            if changes is None:
+                yield sse_event("resync", {})
+            else:
+                yield sse_event("changes", {"changes": changes})
+    finally:
+        change_subscribers.discard(subscriber)
+
+@app.get("/events/changes")
+async def get_change_feed():
+    return StreamingResponse(stream_row_changes(), media_type="text/event-stream")
+
 @app.delete("/routes/{route_id}", status_code=204)
-def delete_route(route_id: int, db: Session = Depends(get_db)):
-    route = db.query(models.Route).filter(models.Route.route_id == route_id).first()
+async def delete_route(route_id: int, db: AsyncSession = Depends(get_async_db)):
+    route = await db.get(models.Route, route_id)
     if not route: raise HTTPException(status_code=404, detail="Route not found")
-    db.delete(route)
-    db.commit()
+    # A route's trips, dated history included, are never deleted along with it.
+    if not await db.run_sync(delete_routes_by_id, [route_id]):
+        raise HTTPException(status_code=409, detail="Route still has trips; delete them first.")
     return {"ok": True}
\ No newline at end of file
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from database import get_db
 from schemas import DailyTripCreate, DailyTripResponse
 import crud.daily_trip as daily_trip_crud
+from backend.database.models import DailyTrip
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/trips", tags=["daily_trips"])
 
@@ -58,14 +61,17 @@ def get_daily_trip_by_id(
 
 @router.get("/all", response_model=List[DailyTripResponse])
 def get_all_daily_trips(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
     """
-    Get all daily trips with pagination.
+    Get all daily trips, a page at a time; the X-Next-Cursor header carries
+    the cursor for the next page.
     """
-    return daily_trip_crud.get_all_daily_trips(db, skip=skip, limit=limit)
+    trips = daily_trip_crud.get_all_daily_trips(db, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, trips, DailyTrip.trip_id, limit)
 
 
 @router.get("/{trip_id}", response_model=DailyTripResponse)
@@ -266,8 +272,12 @@ def bulk_update_live_status(
     Update live status for multiple trips at once.
     """
     try:
-        count = daily_trip_crud.bulk_update_live_status(db, trip_ids, live_status)
-        return {"updated_count": count, "live_status": live_status}
+        changed = daily_trip_crud.bulk_update_live_status(db, trip_ids, live_status)
+        return {
+            "updated_count": len(changed),
+            "live_status": live_status,
+            "changed": [{"trip_id": trip_id, "previous": previous} for trip_id, previous in changed],
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating trips: {str(e)}")
 
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 
 from database import get_db
 from schemas import DeploymentCreate, DeploymentResponse, VehicleResponse, DriverResponse
 import crud.deployment as deployment_crud
+from backend.database.models import Deployment
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/deployments", tags=["deployments"])
 
@@ -28,15 +32,18 @@ def create_deployment(deployment: DeploymentCreate, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Error creating deployment: {str(e)}")
 
 
-@router.post("/bulk", response_model=List[DeploymentResponse], status_code=201)
+@router.post("/bulk", status_code=201)
 def bulk_create_deployments(deployments: List[DeploymentCreate], db: Session = Depends(get_db)):
     """
     Create multiple deployments at once.
+    Valid rows are created; each invalid or conflicting row is reported in
+    "errors" with its index in the request instead of failing the batch.
     """
     try:
-        return deployment_crud.create_bulk_deployments(db, deployments)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        created, errors = deployment_crud.create_bulk_deployments(db, deployments)
+        return {"created": [row._asdict() for row in created], "errors": errors}
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="A trip in the batch was deployed concurrently; retry the request.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating deployments: {str(e)}")
 
@@ -59,14 +66,17 @@ def get_deployment_by_id(
 
 @router.get("/all", response_model=List[DeploymentResponse])
 def get_all_deployments(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
     """
-    Get all deployments with pagination.
+    Get all deployments, a page at a time; the X-Next-Cursor header carries
+    the cursor for the next page.
     """
-    return deployment_crud.get_all_deployments(db, skip=skip, limit=limit)
+    deployments = deployment_crud.get_all_deployments(db, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, deployments, Deployment.deployment_id, limit)
 
 
 @router.get("/{deployment_id}", response_model=DeploymentResponse)
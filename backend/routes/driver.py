@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from crud import driver
 from schemas import DriverCreate, DriverResponse
+from backend.database.models import Driver
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/drivers", tags=["drivers"])
 
@@ -16,8 +21,9 @@ def create_driver(driver_data: DriverCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[DriverResponse])
-def get_drivers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return driver.get_drivers(db, skip=skip, limit=limit)
+def get_drivers(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    drivers = driver.get_drivers(db, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, drivers, Driver.driver_id, limit)
 
 
 @router.get("/all", response_model=List[DriverResponse])
@@ -26,38 +32,65 @@ def get_all_drivers(db: Session = Depends(get_db)):
 
 
 @router.get("/available", response_model=List[DriverResponse])
-def get_available_drivers(db: Session = Depends(get_db)):
-    return driver.get_available_drivers(db)
+def get_available_drivers(
+    response: Response,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    drivers = driver.get_available_drivers(db, day=day, shift_time=shift_time, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, drivers, Driver.driver_id, limit)
+
+
+@router.get("/available/stream")
+def stream_available_drivers(
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    rows = driver.iter_available_drivers(db, day=day, shift_time=shift_time)
+    return StreamingResponse(
+        (DriverResponse.model_validate(row).model_dump_json() + "\n" for row in rows),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.get("/search", response_model=List[DriverResponse])
 def search_drivers(
     search_term: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return driver.search_drivers(db, search_term, skip, limit)
+    drivers = driver.search_drivers(db, search_term, cursor_after(cursor), limit + 1)
+    return next_page(response, drivers, Driver.driver_id, limit)
 
 
 @router.get("/search/name", response_model=List[DriverResponse])
 def search_drivers_by_name(
     name: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return driver.search_drivers_by_name(db, name, skip, limit)
+    drivers = driver.search_drivers_by_name(db, name, cursor_after(cursor), limit + 1)
+    return next_page(response, drivers, Driver.driver_id, limit)
 
 
 @router.get("/sorted", response_model=List[DriverResponse])
 def get_drivers_sorted(
+    response: Response,
     ascending: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return driver.get_drivers_sorted_by_name(db, ascending, skip, limit)
+    drivers = driver.get_drivers_sorted_by_name(db, ascending, cursor_after(cursor, 2), limit + 1)
+    return next_page(response, drivers, (Driver.name, Driver.driver_id), limit)
 
 
 @router.get("/count")
@@ -0,0 +1,19 @@
+from fastapi import HTTPException, Response
+
+from database.queries import decode_cursor, split_page
+
+
+def cursor_after(cursor, arity: int = 1):
+    """The keyset `after` value for a ?cursor= parameter; 400 if it is malformed."""
+    try:
+        return decode_cursor(cursor, arity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def next_page(response: Response, rows, key, limit: int):
+    """Trims rows fetched with `limit + 1` to the page and sets X-Next-Cursor if there is more."""
+    page, next_cursor = split_page(rows, key, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return page
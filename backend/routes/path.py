@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from crud import path, stop as stop_crud
 from schemas import PathCreate, PathResponse, StopResponse
+from backend.database.models import Path
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/paths", tags=["paths"])
 
@@ -22,8 +25,9 @@ def create_path(path_data: PathCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[PathResponse])
-def get_paths(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return path.get_paths(db, skip=skip, limit=limit)
+def get_paths(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    paths = path.get_paths(db, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, paths, Path.path_id, limit)
 
 
 @router.get("/all", response_model=List[PathResponse])
@@ -34,21 +38,25 @@ def get_all_paths(db: Session = Depends(get_db)):
 @router.get("/search", response_model=List[PathResponse])
 def search_paths(
     search_term: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return path.search_paths(db, search_term, skip, limit)
+    paths = path.search_paths(db, search_term, cursor_after(cursor), limit + 1)
+    return next_page(response, paths, Path.path_id, limit)
 
 
 @router.get("/sorted", response_model=List[PathResponse])
 def get_paths_sorted(
+    response: Response,
     ascending: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return path.get_paths_sorted_by_name(db, ascending, skip, limit)
+    paths = path.get_paths_sorted_by_name(db, ascending, cursor_after(cursor, 2), limit + 1)
+    return next_page(response, paths, (Path.name, Path.path_id), limit)
 
 
 @router.get("/by-stop/{stop_id}", response_model=List[PathResponse])
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import time
@@ -6,6 +6,9 @@ from datetime import time
 from database import get_db
 from schemas import RouteCreate, RouteResponse, RouteStatus
 import crud.route as route_crud
+from backend.database.models import Route
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/routes", tags=["routes"])
 
@@ -57,15 +60,18 @@ def get_route_by_id(route_id: int = Query(..., description="Route ID"), db: Sess
 
 @router.get("/all", response_model=List[RouteResponse])
 def get_all_routes(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     status: Optional[RouteStatus] = Query(None, description="Filter by status"),
     db: Session = Depends(get_db)
 ):
     """
-    Get all routes with optional pagination and status filtering.
+    Get all routes, a page at a time, with optional status filtering; the
+    X-Next-Cursor header carries the cursor for the next page.
     """
-    return route_crud.get_all_routes(db, skip=skip, limit=limit, status=status)
+    routes = route_crud.get_all_routes(db, after_id=cursor_after(cursor), limit=limit + 1, status=status)
+    return next_page(response, routes, Route.route_id, limit)
 
 
 @router.get("/{route_id}", response_model=RouteResponse)
@@ -242,8 +248,12 @@ def bulk_update_route_status(
 ):
     """Bulk update status for multiple routes."""
     try:
-        count = route_crud.bulk_update_route_status(db, route_ids, status)
-        return {"updated_count": count, "message": f"Updated {count} routes"}
+        changed = route_crud.bulk_update_route_status(db, route_ids, status)
+        return {
+            "updated_count": len(changed),
+            "message": f"Updated {len(changed)} routes",
+            "changed": [{"route_id": route_id, "previous": previous} for route_id, previous in changed],
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating routes: {str(e)}")
 
@@ -254,8 +264,11 @@ def bulk_update_route_status(
 
 @router.delete("/{route_id}", status_code=204)
 def delete_route(route_id: int, db: Session = Depends(get_db)):
-    """Delete a route by ID."""
-    success = route_crud.delete_route(db, route_id)
+    """Delete a route by ID. Refused while the route still has trips."""
+    try:
+        success = route_crud.delete_route(db, route_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail=f"Route with id {route_id} not found")
     return None
@@ -263,6 +276,6 @@ def delete_route(route_id: int, db: Session = Depends(get_db)):
 
 @router.delete("/path/{path_id}/all", response_model=dict)
 def delete_routes_by_path(path_id: int, db: Session = Depends(get_db)):
-    """Delete all routes associated with a specific path."""
+    """Delete all routes associated with a specific path. Routes that still have trips are kept."""
     count = route_crud.delete_routes_by_path(db, path_id)
     return {"deleted_count": count, "message": f"Deleted {count} routes for path {path_id}"}
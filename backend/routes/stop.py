@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from crud import stop
 from schemas import StopCreate, StopResponse
+from backend.database.models import Stop
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/stops", tags=["stops"])
 
@@ -14,8 +17,9 @@ def create_stop(stop_data: StopCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[StopResponse])
-def get_stops(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return stop.get_stops(db, skip=skip, limit=limit)
+def get_stops(response: Response, cursor: Optional[str] = None, limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    stops = stop.get_stops(db, after_id=cursor_after(cursor), limit=limit + 1)
+    return next_page(response, stops, Stop.stop_id, limit)
 
 
 @router.get("/all", response_model=List[StopResponse])
@@ -26,21 +30,25 @@ def get_all_stops(db: Session = Depends(get_db)):
 @router.get("/search", response_model=List[StopResponse])
 def search_stops(
     search_term: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return stop.search_stops(db, search_term, skip, limit)
+    stops = stop.search_stops(db, search_term, cursor_after(cursor), limit + 1)
+    return next_page(response, stops, Stop.stop_id, limit)
 
 
 @router.get("/sorted", response_model=List[StopResponse])
 def get_stops_sorted(
+    response: Response,
     ascending: bool = True,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return stop.get_stops_sorted_by_name(db, ascending, skip, limit)
+    stops = stop.get_stops_sorted_by_name(db, ascending, cursor_after(cursor, 2), limit + 1)
+    return next_page(response, stops, (Stop.name, Stop.stop_id), limit)
 
 
 @router.get("/location", response_model=List[StopResponse])
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from crud import vehicle
 from schemas import VehicleCreate, VehicleResponse
-from backend.database.models import VehicleType
+from backend.database.models import Vehicle, VehicleType
+from database.queries import MAX_PAGE_SIZE, PAGE_SIZE
+from routes.pagination import cursor_after, next_page
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
@@ -18,12 +22,14 @@ def create_vehicle(vehicle_data: VehicleCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[VehicleResponse])
 def get_vehicles(
-    skip: int = 0, 
-    limit: int = 100, 
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     vehicle_type: VehicleType = None,
     db: Session = Depends(get_db)
 ):
-    return vehicle.get_vehicles(db, skip=skip, limit=limit, vehicle_type=vehicle_type)
+    vehicles = vehicle.get_vehicles(db, after_id=cursor_after(cursor), limit=limit + 1, vehicle_type=vehicle_type)
+    return next_page(response, vehicles, Vehicle.vehicle_id, limit)
 
 
 @router.get("/all", response_model=List[VehicleResponse])
@@ -33,10 +39,32 @@ def get_all_vehicles(db: Session = Depends(get_db)):
 
 @router.get("/available", response_model=List[VehicleResponse])
 def get_available_vehicles(
+    response: Response,
     vehicle_type: VehicleType = None,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return vehicle.get_available_vehicles(db, vehicle_type=vehicle_type)
+    vehicles = vehicle.get_available_vehicles(
+        db, vehicle_type=vehicle_type, day=day, shift_time=shift_time, after_id=cursor_after(cursor), limit=limit + 1
+    )
+    return next_page(response, vehicles, Vehicle.vehicle_id, limit)
+
+
+@router.get("/available/stream")
+def stream_available_vehicles(
+    vehicle_type: VehicleType = None,
+    day: Optional[datetime] = None,
+    shift_time: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    rows = vehicle.iter_available_vehicles(db, vehicle_type=vehicle_type, day=day, shift_time=shift_time)
+    return StreamingResponse(
+        (VehicleResponse.model_validate(row).model_dump_json() + "\n" for row in rows),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.get("/type/{vehicle_type}", response_model=List[VehicleResponse])
@@ -47,11 +75,13 @@ def get_vehicles_by_type(vehicle_type: VehicleType, db: Session = Depends(get_db
 @router.get("/search", response_model=List[VehicleResponse])
 def search_vehicles(
     search_term: str,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
-    return vehicle.search_vehicles(db, search_term, skip, limit)
+    vehicles = vehicle.search_vehicles(db, search_term, cursor_after(cursor), limit + 1)
+    return next_page(response, vehicles, Vehicle.vehicle_id, limit)
 
 
 @router.get("/capacity", response_model=List[VehicleResponse])
@@ -1,5 +1,11 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+
+from database.models import StatusEnum
+
+# Route status values, as stored on routes.status.
+RouteStatus = StatusEnum
 
 # Using from_attributes = True (formerly orm_mode) to auto-map from SQLAlchemy models
 
@@ -56,6 +62,48 @@ class DailyTrip(BaseModel):
     class Config:
         from_attributes = True
 
+class TripSummary(BaseModel):
+    trip_id: int
+    display_name: str
+    live_status: str
+    booking_status_percentage: int
+    vehicle_license_plate: Optional[str] = None
+    vehicle_type: Optional[str] = None
+    vehicle_capacity: Optional[int] = None
+    driver_name: Optional[str] = None
+    driver_phone_number: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class FleetAvailability(BaseModel):
+    start: datetime
+    end: datetime
+    vehicles: List[Vehicle]
+    drivers: List[Driver]
+
+class TripStatusUpdate(BaseModel):
+    trip_ids: List[int]
+    live_status: str
+
+class RouteStatusUpdate(BaseModel):
+    route_ids: List[int]
+    status: str
+
+class StatusChange(BaseModel):
+    id: int
+    previous: Optional[str] = None
+
+class StatusUpdateResult(BaseModel):
+    # Only the rows whose status actually changed, with the status they had.
+    status: str
+    changed: List[StatusChange]
+
+class DeploymentCreate(BaseModel):
+    trip_id: int
+    vehicle_id: int
+    driver_id: int
+
 class RouteCreate(BaseModel):
     path_id: int
     route_display_name: str
@@ -1,9 +1,9 @@
-from database.connection import SessionLocal, engine
-from database.models import Base, Stop, Path, Route, Vehicle, Driver, DailyTrip, Deployment, StatusEnum
+from database.connection import SessionLocal, create_db_and_tables, engine
+from database.models import Base, Stop, Path, PathStop, Route, Vehicle, Driver, DailyTrip, Deployment, StatusEnum
 
 def seed_database():
     Base.metadata.drop_all(bind=engine) # Drop old tables
-    Base.metadata.create_all(bind=engine) # Create new tables with correct schema
+    create_db_and_tables() # Create new tables with correct schema and apply migrations
 
     db = SessionLocal()
 
@@ -15,8 +15,10 @@ def seed_database():
         db.add_all([stop1, stop2, stop3, stop4])
         db.commit()
 
-        path1 = Path(name="Path-1", ordered_stop_ids=f"{stop1.stop_id},{stop2.stop_id},{stop3.stop_id}") # UPDATED
-        path2 = Path(name="Tech-Loop", ordered_stop_ids=f"{stop4.stop_id},{stop1.stop_id},{stop2.stop_id}") # UPDATED
+        path1 = Path(name="Path-1", ordered_stop_ids=f"{stop1.stop_id},{stop2.stop_id},{stop3.stop_id}",
+                     path_stops=[PathStop(stop_id=s.stop_id, stop_order=i) for i, s in enumerate([stop1, stop2, stop3], start=1)]) # UPDATED
+        path2 = Path(name="Tech-Loop", ordered_stop_ids=f"{stop4.stop_id},{stop1.stop_id},{stop2.stop_id}",
+                     path_stops=[PathStop(stop_id=s.stop_id, stop_order=i) for i, s in enumerate([stop4, stop1, stop2], start=1)]) # UPDATED
         db.add_all([path1, path2])
         db.commit()
 
@@ -0,0 +1,29 @@
+"""
+Every test runs against a throwaway SQLite file, never the app database.
+MOVI_DATABASE_URL is set here, before any app module creates its engine.
+"""
+import os
+import tempfile
+
+os.environ["MOVI_DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='movi-tests-'), 'movi.db')}"
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """The demo data from seed.py, loaded once per test session."""
+    from seed import seed_database
+    seed_database()
+
+
+@pytest.fixture
+def statements(seeded_db):
+    """The SQL statements sent through the app engine while the test runs."""
+    from database.connection import engine
+    sent = []
+    listener = lambda conn, cursor, statement, *args: sent.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    yield sent
+    event.remove(engine, "before_cursor_execute", listener)
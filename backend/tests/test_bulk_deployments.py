@@ -0,0 +1,81 @@
+"""POST /deployments/bulk: set-based validation, per-row errors and concurrent conflicts."""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+import main
+from database.connection import SessionLocal, async_engine
+from database.models import DailyTrip, Deployment, Driver, Route, Vehicle
+
+
+@pytest.fixture
+def client(seeded_db):
+    # No lifespan: the endpoint only needs the database.
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def new_trips(seeded_db):
+    """Two undeployed trips, plus a vehicle and a driver that exist."""
+    with SessionLocal() as db:
+        route_id = db.scalar(select(Route.route_id))
+        trips = [DailyTrip(route_id=route_id, display_name=f"Bulk deploy {i}", trip_date=datetime(2025, 5, 1),
+                           live_status="scheduled", booking_status_percentage=0) for i in range(2)]
+        db.add_all(trips)
+        db.commit()
+        return [trip.trip_id for trip in trips], db.scalar(select(Vehicle.vehicle_id)), db.scalar(select(Driver.driver_id))
+
+
+def _deployments_for(trip_ids):
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Deployment).where(Deployment.trip_id.in_(trip_ids)))
+
+
+def test_bulk_deployments_created(client, new_trips):
+    (first, second), vehicle_id, driver_id = new_trips
+    response = client.post("/deployments/bulk", json=[
+        {"trip_id": first, "vehicle_id": vehicle_id, "driver_id": driver_id},
+        {"trip_id": second, "vehicle_id": vehicle_id, "driver_id": driver_id},
+    ])
+    assert response.status_code == 201
+    assert [row["trip_id"] for row in response.json()["created"]] == [first, second]
+    assert response.json()["errors"] == []
+    assert _deployments_for([first, second]) == 2
+
+
+def test_bulk_deployments_report_invalid_and_conflicting_rows(client, new_trips):
+    (first, second), vehicle_id, driver_id = new_trips
+    response = client.post("/deployments/bulk", json=[
+        {"trip_id": first, "vehicle_id": vehicle_id, "driver_id": driver_id},
+        {"trip_id": first, "vehicle_id": vehicle_id, "driver_id": driver_id},
+        {"trip_id": second, "vehicle_id": 99999, "driver_id": driver_id},
+    ])
+    assert response.status_code == 201
+    assert [row["trip_id"] for row in response.json()["created"]] == [first]
+    assert [(error["index"], error["error"]) for error in response.json()["errors"]] == [
+        (1, f"Trip {first} already has a deployment"),
+        (2, "Vehicle with id 99999 does not exist"),
+    ]
+    assert _deployments_for([second]) == 0
+
+
+def test_concurrent_deployment_of_the_same_trip_is_a_409(client, new_trips):
+    (first, second), vehicle_id, driver_id = new_trips
+
+    # Deploy `first` right before the batch's INSERT, after it was checked.
+    def deploy_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO deployments"):
+            cursor.execute("INSERT INTO deployments (trip_id, vehicle_id, driver_id) VALUES (?, ?, ?)", (first, vehicle_id, driver_id))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", deploy_first)
+    try:
+        response = client.post("/deployments/bulk", json=[
+            {"trip_id": first, "vehicle_id": vehicle_id, "driver_id": driver_id},
+            {"trip_id": second, "vehicle_id": vehicle_id, "driver_id": driver_id},
+        ])
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", deploy_first)
+    assert response.status_code == 409
+    assert _deployments_for([first, second]) == 0
@@ -0,0 +1,34 @@
+"""crud.route.bulk_create_routes against the seeded paths."""
+import pytest
+from sqlalchemy import func, select
+
+from crud.route import bulk_create_routes
+from database.connection import SessionLocal
+from database.models import Path, Route, StatusEnum
+from schemas import RouteCreate
+
+
+def _route(path_id: int, name: str) -> RouteCreate:
+    return RouteCreate(path_id=path_id, route_display_name=name, shift_time="07:30", direction="up",
+                       capacity=40, allocated_waitlist=0, status="active")
+
+
+def test_bulk_create_routes_fills_endpoints_from_the_path(seeded_db, statements):
+    with SessionLocal() as db:
+        path_ids = db.scalars(select(Path.path_id).order_by(Path.path_id)).all()
+        statements.clear()
+        created = bulk_create_routes(db, [_route(path_ids[0], "Bulk A - 07:30"), _route(path_ids[1], "Bulk B - 07:30")])
+    assert [(r.display_name, r.start_point, r.end_point, r.status) for r in created] == [
+        ("Bulk A - 07:30", "Gavipuram", "Peenya", StatusEnum.active),
+        ("Bulk B - 07:30", "Odeon Circle", "Temple", StatusEnum.active),
+    ]
+    # One endpoint query and one INSERT ... RETURNING, whatever the batch size.
+    assert len(statements) == 2
+
+
+def test_bulk_create_routes_inserts_nothing_if_a_path_is_missing(seeded_db):
+    with SessionLocal() as db:
+        before = db.scalar(select(func.count()).select_from(Route))
+        with pytest.raises(ValueError, match="does not exist"):
+            bulk_create_routes(db, [_route(1, "Bulk C - 07:30"), _route(9999, "Bulk D - 07:30")])
+        assert db.scalar(select(func.count()).select_from(Route)) == before
@@ -0,0 +1,41 @@
+"""POST /routes: start and end points come from the path's first and last stops."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import main
+from database.connection import SessionLocal
+from database.models import Path, PathStop, Route, Stop
+
+
+@pytest.fixture
+def client(seeded_db):
+    # No lifespan: the endpoint only needs the database.
+    return TestClient(main.app)
+
+
+def _route_body(path_id, **overrides):
+    body = {"path_id": path_id, "route_display_name": "Created route - 09:00", "shift_time": "09:00",
+            "direction": "up", "capacity": 40, "allocated_waitlist": 0, "status": "active"}
+    return {**body, **overrides}
+
+
+def test_create_route_takes_endpoints_from_path_stops(client):
+    with SessionLocal() as db:
+        path_id = db.scalar(select(Path.path_id))
+        stops = db.scalars(select(Stop.name).join(PathStop, PathStop.stop_id == Stop.stop_id)
+                           .where(PathStop.path_id == path_id).order_by(PathStop.stop_order)).all()
+    response = client.post("/routes", json=_route_body(path_id))
+    assert response.status_code == 200, response.text
+    assert response.json()["display_name"] == "Created route - 09:00"
+    with SessionLocal() as db:
+        route = db.get(Route, response.json()["route_id"])
+        assert (route.start_point, route.end_point) == (stops[0], stops[-1])
+        assert route.status.value == "active"
+
+
+def test_create_route_rejects_unknown_status_and_path(client):
+    with SessionLocal() as db:
+        path_id = db.scalar(select(Path.path_id))
+    assert client.post("/routes", json=_route_body(path_id, status="paused")).status_code == 400
+    assert client.post("/routes", json=_route_body(99999)).status_code == 404
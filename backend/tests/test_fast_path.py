@@ -0,0 +1,43 @@
+"""
+The fast path answers only lookups it fully understands; negated or
+qualified questions must fall through to the model.
+"""
+import pytest
+
+from agent.fast_path import NameIndex, match_intent
+
+
+@pytest.fixture
+def index():
+    index = NameIndex(names={}, loaded_at=0.0, versions={})
+    index.add("trip", "Bulk - 00:01")
+    index.add("path", "Path-1")
+    index.add("route", "Path-1 - 00:01")
+    return index
+
+
+@pytest.mark.parametrize("message, tool, args", [
+    ("status of Bulk - 00:01", "get_trip_status", {"trip_display_name": "Bulk - 00:01"}),
+    ("list unassigned vehicles", "get_unassigned_vehicles", {}),
+    ("which vehicles are not yet assigned?", "get_unassigned_vehicles", {}),
+    ("show all trips", "get_all_trips", {}),
+    ("What are the stops on Path-1?", "list_stops_for_path", {"path_name": "Path-1"}),
+])
+def test_simple_lookups_take_the_fast_path(index, message, tool, args):
+    assert match_intent(message, index) == {"name": tool, "args": args}
+
+
+@pytest.mark.parametrize("message", [
+    "which vehicles are not available",
+    "which vehicles are not free right now",
+    "vehicles that aren't available",
+    "list available vehicles except buses",
+    "show me trips that are not scheduled",
+    "what trips are running late",
+    "show all trips without a driver",
+    "show all scheduled trips",
+    "status of Bulk - 00:01 yesterday",
+    "stops on Path-1 but not the depot",
+])
+def test_negated_or_qualified_questions_go_to_the_model(index, message):
+    assert match_intent(message, index) is None
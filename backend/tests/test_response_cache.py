@@ -0,0 +1,35 @@
+"""ResponseCache: entries are dropped when their tables change or their TTL runs out."""
+import pytest
+
+from agent import response_cache as cache_module
+from agent.response_cache import ResponseCache
+from database.versions import bump_tables, table_versions
+
+KEY = ("list unassigned vehicles", "busDashboard")
+TABLES = {"vehicles", "deployments"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entry_served_until_its_tables_change(clock):
+    cache = ResponseCache(8, ttl_seconds=60)
+    cache.put(KEY, "Unassigned vehicles: []", TABLES, table_versions(TABLES))
+    assert cache.get(KEY) == "Unassigned vehicles: []"
+    bump_tables({"deployments"})
+    assert cache.get(KEY) is None
+
+
+def test_entry_expires_after_ttl(clock):
+    # Another process's writes never bump the versions; the TTL bounds staleness.
+    cache = ResponseCache(8, ttl_seconds=60)
+    cache.put(KEY, "Unassigned vehicles: []", TABLES, table_versions(TABLES))
+    clock[0] += 59
+    assert cache.get(KEY) == "Unassigned vehicles: []"
+    clock[0] += 1
+    assert cache.get(KEY) is None
+    assert cache.stats()["entries"] == 0
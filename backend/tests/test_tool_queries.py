@@ -0,0 +1,18 @@
+"""
+SQL statements per read-only agent tool, held to the budgets in
+benchmarks/tool_queries.py so an N+1 lookup cannot creep back in.
+"""
+import pytest
+
+from benchmarks.tool_queries import QUERY_BUDGETS
+
+
+@pytest.mark.parametrize(
+    "tool, arguments, budget", QUERY_BUDGETS,
+    ids=[f"{tool.name}-{'-'.join(map(str, arguments.values())) or 'all'}" for tool, arguments, _ in QUERY_BUDGETS],
+)
+def test_tool_stays_within_query_budget(statements, tool, arguments, budget):
+    result = tool.invoke(arguments)
+    # A lookup that found nothing would pass on fewer queries; make sure it found the row.
+    assert "not found" not in str(result).lower()
+    assert len(statements) <= budget, statements
@@ -0,0 +1,35 @@
+"""get_unassigned_vehicles: availability is scoped to a service day, like /vehicles/available."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from agent.tools import get_unassigned_vehicles
+from database.connection import SessionLocal
+from database.models import DailyTrip, Deployment, Driver, Route, Vehicle
+
+
+def test_unassigned_vehicles_ignore_other_days(seeded_db):
+    today = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+    with SessionLocal() as db:
+        route_id = db.scalar(select(Route.route_id))
+        driver_id = db.scalar(select(Driver.driver_id))
+        for plate, trip_date in [("KA-01-PAST", today - timedelta(days=1)), ("KA-01-TODAY", today)]:
+            vehicle = Vehicle(license_plate=plate, type="Bus", capacity=40)
+            trip = DailyTrip(route_id=route_id, display_name=f"Unassigned check {plate}", trip_date=trip_date,
+                             live_status="scheduled", booking_status_percentage=0)
+            db.add_all([vehicle, trip])
+            db.flush()
+            db.add(Deployment(trip_id=trip.trip_id, vehicle_id=vehicle.vehicle_id, driver_id=driver_id))
+        db.commit()
+
+    result = get_unassigned_vehicles.invoke({})
+    assert "KA-01-PAST" in result
+    assert "KA-01-TODAY" not in result
+
+    yesterday = get_unassigned_vehicles.invoke({"day": (today - timedelta(days=1)).strftime("%Y-%m-%d")})
+    assert "KA-01-PAST" not in yesterday
+    assert "KA-01-TODAY" in yesterday
+
+
+def test_unassigned_vehicles_reject_bad_date(seeded_db):
+    assert get_unassigned_vehicles.invoke({"day": "tomorrow"}).startswith("Error:")
@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from "react";
-import { invokeAgent } from "@/services/api";
+import { streamAgent } from "@/services/api";
 import { Message } from "@/types";
 
 const speak = (text: string) => {
@@ -14,30 +14,38 @@ export const useMoviAgent = (initialMessages: Message[] = [], isTtsEnabled: bool
   const [messages, setMessages] = useState<Message[]>(initialMessages);
   const [isLoading, setIsLoading] = useState<boolean>(false);
   const lastSpokenMessageId = useRef<number | null>(null);
+  // Server-side conversation thread; once known, only new messages are posted.
+  const threadId = useRef<string | null>(null);
 
   useEffect(() => {
     const lastMessage = messages[messages.length - 1];
     const lastMessageIndex = messages.length - 1;
 
-    // Do not speak the initial greeting message (index 0).
-    if (isTtsEnabled && lastMessage && lastMessage.role === 'assistant' && lastSpokenMessageId.current !== lastMessageIndex && lastMessageIndex > 0) {
+    // Do not speak the initial greeting message (index 0), or a reply that is still streaming in.
+    if (isTtsEnabled && !isLoading && lastMessage && lastMessage.role === 'assistant' && lastSpokenMessageId.current !== lastMessageIndex && lastMessageIndex > 0) {
       speak(lastMessage.content);
       lastSpokenMessageId.current = lastMessageIndex;
     }
-  }, [messages, isTtsEnabled]);
+  }, [messages, isTtsEnabled, isLoading]);
 
   const sendMessage = async (userInput: string, currentPage: string, image: string | null = null) => {
     // ... (This function is correct and remains unchanged)
     if (!userInput.trim() && !image) return;
     const userMessage: Message = { role: "user", content: userInput, image: image };
-    setMessages(prev => [...prev, userMessage]);
+    setMessages(prev => [...prev, userMessage, { role: "assistant", content: "" }]);
     setIsLoading(true);
+    // Replaces the in-progress assistant message (always the last one) as the stream advances.
+    const updateReply = (update: (content: string) => string) =>
+      setMessages(prev => [...prev.slice(0, -1), { role: "assistant", content: update(prev[prev.length - 1].content) }]);
     try {
-      const assistantResponse = await invokeAgent([...messages, userMessage], currentPage, image);
-      setMessages(prev => [...prev, assistantResponse]);
+      const outgoing = threadId.current ? [userMessage] : [...messages, userMessage];
+      const assistantResponse = await streamAgent(outgoing, currentPage, image, {
+        onToken: token => updateReply(content => content + token),
+      }, threadId.current);
+      threadId.current = assistantResponse.thread_id;
+      updateReply(() => assistantResponse.content);
     } catch (error) {
-      const errorMessage: Message = { role: "assistant", content: "Sorry, an error occurred." };
-      setMessages(prev => [...prev, errorMessage]);
+      updateReply(() => "Sorry, an error occurred.");
     } finally {
       setIsLoading(false);
     }
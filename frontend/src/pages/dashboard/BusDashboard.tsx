@@ -3,9 +3,9 @@ import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Calendar, MapPin, Loader2 } from "lucide-react";
 import { Card } from "@/components/ui/card";
-import { useState, useEffect } from "react";
+import { useState, useEffect, type UIEvent } from "react";
 import { RouteMap } from "@/components/map/RouteMap";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery, useQuery } from "@tanstack/react-query";
 import { getTrips, getTripRouteStops } from "@/services/api";
 import { DailyTrip, Stop } from "@/types";
 
@@ -14,10 +14,29 @@ export default function BusDashboard() {
   const [searchTerm, setSearchTerm] = useState("");
 
   // --- DATA FETCHING using React Query ---
-  const { data: trips, isLoading: isLoadingTrips } = useQuery<DailyTrip[]>({
+  // Trips come one page at a time; scrolling to the end of the list loads the next one.
+  const {
+    data: tripPages,
+    isLoading: isLoadingTrips,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ["trips"],
-    queryFn: getTrips,
+    queryFn: ({ pageParam }) => getTrips(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   });
+  const trips = tripPages?.pages.flatMap((page) => page.items);
+
+  const loadMoreTrips = () => {
+    if (hasNextPage && !isFetchingNextPage) fetchNextPage();
+  };
+
+  const handleTripListScroll = (e: UIEvent<HTMLDivElement>) => {
+    const { scrollTop, scrollHeight, clientHeight } = e.currentTarget;
+    if (scrollHeight - scrollTop - clientHeight < 200) loadMoreTrips();
+  };
 
   useEffect(() => {
     if (!selectedTrip && trips && trips.length > 0) {
@@ -83,7 +102,7 @@ export default function BusDashboard() {
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
         <Card className="p-4 lg:col-span-1">
           <h3 className="font-semibold text-lg mb-4">Today's Trips</h3>
-          <div className="space-y-2 max-h-[750px] overflow-y-auto scrollbar-hide">
+          <div className="space-y-2 max-h-[750px] overflow-y-auto scrollbar-hide" onScroll={handleTripListScroll}>
             {isLoadingTrips ? (
               <div className="flex justify-center py-8"><Loader2 className="w-8 h-8 animate-spin text-primary" /></div>
             ) : filteredTrips.length === 0 ? (
@@ -105,6 +124,11 @@ export default function BusDashboard() {
                 </div>
               ))
             )}
+            {hasNextPage && (
+              <Button variant="ghost" className="w-full" onClick={loadMoreTrips} disabled={isFetchingNextPage}>
+                {isFetchingNextPage ? <Loader2 className="w-4 h-4 animate-spin" /> : "Load more trips"}
+              </Button>
+            )}
           </div>
         </Card>
 
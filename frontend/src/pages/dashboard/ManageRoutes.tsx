@@ -7,6 +7,7 @@ import { CreateRouteModal } from "@/components/modals/CreateRouteModal";
 import { DeleteConfirmDialog } from "@/components/modals/DeleteConfirmDialog";
 import { useToast } from "@/components/ui/use-toast";
 import { Path, Route, RouteCreate, Stop } from "@/types";
+import { getPaths, getRoutes, getStops } from "@/services/api";
 import { DropdownMenu, DropdownMenuContent, DropdownMenuItem, DropdownMenuTrigger } from "@/components/ui/dropdown-menu";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
 
@@ -14,6 +15,8 @@ const API_URL = "http://127.0.0.1:8000";
 
 export default function ManageRoutes() {
   const [routesList, setRoutesList] = useState<Route[]>([]);
+  const [routesCursor, setRoutesCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [availablePaths, setAvailablePaths] = useState<Path[]>([]);
   const [availableStops, setAvailableStops] = useState<Stop[]>([]);
   const [loading, setLoading] = useState(true);
@@ -28,19 +31,16 @@ export default function ManageRoutes() {
     const fetchAllData = async () => {
       try {
         setLoading(true);
-        const [routesRes, pathsRes, stopsRes] = await Promise.all([
-          fetch(`${API_URL}/routes?status=${activeTab}`),
-          fetch(`${API_URL}/paths`),
-          fetch(`${API_URL}/stops`)
+        const [routes, paths, stops] = await Promise.all([
+          getRoutes(activeTab),
+          getPaths(),
+          getStops()
         ]);
 
-        if (!routesRes.ok) throw new Error("Failed to fetch routes");
-        if (!pathsRes.ok) throw new Error("Failed to fetch paths");
-        if (!stopsRes.ok) throw new Error("Failed to fetch stops");
-
-        setRoutesList(await routesRes.json());
-        setAvailablePaths(await pathsRes.json());
-        setAvailableStops(await stopsRes.json());
+        setRoutesList(routes.items);
+        setRoutesCursor(routes.nextCursor);
+        setAvailablePaths(paths);
+        setAvailableStops(stops);
       } catch (error: any) {
         toast({ title: "Error", description: error.message, variant: "destructive" });
       } finally {
@@ -63,10 +63,25 @@ export default function ManageRoutes() {
       }
       toast({ title: "Route created successfully!" });
       setCreateModalOpen(false);
-      const routesRes = await fetch(`${API_URL}/routes?status=${activeTab}`);
-      setRoutesList(await routesRes.json());
+      const routes = await getRoutes(activeTab);
+      setRoutesList(routes.items);
+      setRoutesCursor(routes.nextCursor);
+    } catch (error: any) {
+      toast({ title: "Error", description: error.message, variant: "destructive" });
+    }
+  };
+
+  const handleLoadMoreRoutes = async () => {
+    if (!routesCursor) return;
+    try {
+      setLoadingMore(true);
+      const routes = await getRoutes(activeTab, routesCursor);
+      setRoutesList((current) => [...current, ...routes.items]);
+      setRoutesCursor(routes.nextCursor);
     } catch (error: any) {
       toast({ title: "Error", description: error.message, variant: "destructive" });
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -137,6 +152,13 @@ export default function ManageRoutes() {
             </TableBody>
           </Table>
         </div>
+        {!loading && routesCursor && (
+          <div className="flex justify-center mt-4">
+            <Button variant="outline" onClick={handleLoadMoreRoutes} disabled={loadingMore}>
+              {loadingMore ? <Loader2 className="w-4 h-4 animate-spin" /> : "Load more routes"}
+            </Button>
+          </div>
+        )}
       </DashboardLayout>
 
       {/* Modals */}
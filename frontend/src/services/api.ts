@@ -1,4 +1,4 @@
-import { DailyTrip, Route, Vehicle, Driver, Stop, Message } from "@/types";
+import { DailyTrip, Route, Vehicle, Driver, Stop, Path, Message } from "@/types";
 
 const API_BASE_URL = "http://127.0.0.1:8000";
 
@@ -34,6 +34,70 @@ export const invokeAgent = async (
   }
 };
 
+export interface AgentReply extends Message {
+  thread_id: string;
+}
+
+export interface AgentStreamHandlers {
+  onToken?: (token: string) => void;
+  onToolStart?: (name: string) => void;
+  onToolEnd?: (name: string) => void;
+  onConfirmation?: (content: string) => void;
+}
+
+/**
+ * Streams the agent's reply over SSE from /invoke_agent/stream.
+ * Tokens and tool progress are reported through `handlers` as they arrive.
+ * Pass the `threadId` from an earlier reply to send only the new messages;
+ * the server keeps the rest of the conversation.
+ * @returns The assistant's final response message and its conversation thread id.
+ */
+export const streamAgent = async (
+  messages: Message[],
+  currentPage: string,
+  image: string | null = null,
+  handlers: AgentStreamHandlers = {},
+  threadId: string | null = null
+): Promise<AgentReply> => {
+  const response = await fetch(`${API_BASE_URL}/invoke_agent/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify({ messages, currentPage, image, thread_id: threadId }),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Agent stream failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let finalMessage: AgentReply | null = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const frames = buffer.split("\n\n");
+    buffer = frames.pop() ?? "";
+    for (const frame of frames) {
+      const event = frame.match(/^event: (.*)$/m)?.[1];
+      const data = frame.match(/^data: (.*)$/m)?.[1];
+      if (!event || !data) continue;
+      const payload = JSON.parse(data);
+      if (event === "token") handlers.onToken?.(payload.content);
+      else if (event === "tool_start") handlers.onToolStart?.(payload.name);
+      else if (event === "tool_end") handlers.onToolEnd?.(payload.name);
+      else if (event === "confirmation") handlers.onConfirmation?.(payload.content);
+      else if (event === "error") throw new Error(payload.detail);
+      else if (event === "done") finalMessage = { role: "assistant", content: payload.content, thread_id: payload.thread_id };
+    }
+  }
+  if (!finalMessage) {
+    throw new Error("Agent stream ended without a reply.");
+  }
+  return finalMessage;
+};
+
 const handleFetch = async <T>(url: string): Promise<T> => {
   const response = await fetch(`${API_BASE_URL}${url}`);
   if (!response.ok) {
@@ -42,8 +106,47 @@ const handleFetch = async <T>(url: string): Promise<T> => {
   return response.json();
 };
 
-export const getTrips = () => handleFetch<DailyTrip[]>("/trips");
-export const getRoutes = () => handleFetch<Route[]>("/routes");
-export const getVehicles = () => handleFetch<Vehicle[]>("/vehicles");
-export const getDrivers = () => handleFetch<Driver[]>("/drivers");
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+/**
+ * Fetches one page of a list endpoint. While there are more rows, the
+ * response's X-Next-Cursor header comes back as `nextCursor`; pass it in as
+ * `cursor` to get the next page.
+ */
+export const fetchPage = async <T>(url: string, cursor: string | null = null): Promise<Page<T>> => {
+  const separator = url.includes("?") ? "&" : "?";
+  const pageUrl = cursor ? `${url}${separator}cursor=${encodeURIComponent(cursor)}` : url;
+  const response = await fetch(`${API_BASE_URL}${pageUrl}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch data from ${url}`);
+  }
+  return { items: await response.json(), nextCursor: response.headers.get("X-Next-Cursor") };
+};
+
+// Paths and stops feed the create-route pickers, which must offer every
+// entry, so they are read in full. They are small reference tables; the cap
+// only keeps a runaway table from turning into endless round-trips.
+const MAX_REFERENCE_PAGES = 20;
+
+const fetchReferenceList = async <T>(url: string): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  for (let page = 0; page < MAX_REFERENCE_PAGES; page++) {
+    const result: Page<T> = await fetchPage<T>(url, cursor);
+    items.push(...result.items);
+    cursor = result.nextCursor;
+    if (!cursor) break;
+  }
+  return items;
+};
+
+export const getTrips = (cursor: string | null = null) => fetchPage<DailyTrip>("/trips", cursor);
+export const getRoutes = (status: string = "active", cursor: string | null = null) => fetchPage<Route>(`/routes?status=${status}`, cursor);
+export const getVehicles = (cursor: string | null = null) => fetchPage<Vehicle>("/vehicles", cursor);
+export const getDrivers = (cursor: string | null = null) => fetchPage<Driver>("/drivers", cursor);
+export const getPaths = () => fetchReferenceList<Path>("/paths?limit=1000");
+export const getStops = () => fetchReferenceList<Stop>("/stops?limit=1000");
 export const getTripRouteStops = (tripId: number) => handleFetch<Stop[]>(`/trip-details/${tripId}/route-stops`);
\ No newline at end of file